@@ -0,0 +1,75 @@
+"""
+Analytics aggregates of the structured postings, computed once per snapshot
+publish_snapshots writes data/aggregates-N.json next to each version: field
+coverage, jobs and companies per location and top companies, each as a
+top-N list plus an "other" bucket. The analytics tabs render from this small
+file instead of running value_counts over every posting on each rerun.
+"""
+
+import os
+import json
+from typing import Dict, List, Optional
+
+AGGREGATES_NAME = 'aggregates'
+TOP_N = 10
+
+# Fields whose coverage the dashboards report
+COVERAGE_COLUMNS = ['company_name', 'location', 'contact_person', 'email_addresses', 'phone_numbers', 'address']
+
+def _filled(series):
+    """Mask of values that are set (neither missing nor empty)"""
+    return series.notna() & (series.astype(str) != '')
+
+def top_buckets(counts, n: int = TOP_N) -> Dict:
+    """The n largest counts of a value_counts() series, with the rest summed into other"""
+    top = counts.head(n)
+    return {
+        'top': [[str(label), int(count)] for label, count in top.items()],
+        'other': int(counts.iloc[n:].sum()),
+        'distinct': int(len(counts)),
+    }
+
+def compute_aggregates(df, n: int = TOP_N) -> Dict:
+    """Aggregate a structured postings frame for the analytics views"""
+    filled = {column: _filled(df[column]) for column in COVERAGE_COLUMNS}
+    locations = df.loc[filled['location'], 'location'].astype(str)
+    companies = df.loc[filled['company_name'], 'company_name'].astype(str)
+    both = df[filled['company_name'] & filled['location']]
+    companies_per_location = (both['company_name'].astype(str).groupby(both['location'].astype(str)).nunique()
+                              .sort_values(ascending=False, kind='stable'))
+    return {
+        'total': int(len(df)),
+        'coverage': {column: int(mask.sum()) for column, mask in filled.items()},
+        'locations': top_buckets(locations.value_counts(), n),
+        'companies': top_buckets(companies.value_counts(), n),
+        'companies_per_location': top_buckets(companies_per_location, n),
+    }
+
+def write_aggregates(aggregates: Dict, path: str) -> str:
+    """Write aggregates as JSON through a temporary file"""
+    from snapshots import _write_atomic
+    return _write_atomic(path, lambda f: json.dump(aggregates, f, ensure_ascii=False, indent=2), 'w', encoding='utf-8')
+
+def read_aggregates(manifest: Optional[Dict] = None) -> Optional[Dict]:
+    """The aggregates published with the current snapshot version, or None if there are none"""
+    from snapshots import SNAPSHOT_DIR, read_manifest
+    manifest = manifest or read_manifest()
+    if not manifest or AGGREGATES_NAME not in manifest['files']:
+        return None
+    try:
+        with open(os.path.join(SNAPSHOT_DIR, manifest['files'][AGGREGATES_NAME]['path']), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def coverage_rows(aggregates: Dict) -> List[List]:
+    """Metric/count rows for the export summary"""
+    coverage = aggregates['coverage']
+    return [
+        ["Total Jobs", aggregates['total']],
+        ["Companies Found", coverage['company_name']],
+        ["Locations Found", coverage['location']],
+        ["Emails Found", coverage['email_addresses']],
+        ["Phones Found", coverage['phone_numbers']],
+        ["Addresses Found", coverage['address']],
+    ]
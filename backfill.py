@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Re-extract historical snapshots made by an older JobDataExtractor version
+Pairs every job_scraping_results_<ts>.csv with job_data_structured_<ts>.csv
+and regenerates the structured file in parallel when it is missing or stale.
+Postings in the job store whose structured fields are stale are re-extracted too.
+"""
+
+import os
+import re
+import csv
+import sys
+import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from data_extractor import EXTRACTOR_VERSION
+from job_store import DEFAULT_DB_PATH, JobStore, store_exists
+from snapshots import publish_snapshots, write_csv_atomic
+
+RAW_PATTERN = re.compile(r'^job_scraping_results(_\d+)?\.csv$')
+
+def structured_path_for(raw_path):
+    """Return the structured snapshot path that belongs to a raw snapshot"""
+    directory, name = os.path.split(raw_path)
+    match = RAW_PATTERN.match(name)
+    suffix = (match.group(1) or '') if match else ''
+    return os.path.join(directory, f"job_data_structured{suffix}.csv")
+
+def find_raw_snapshots(directory="."):
+    """List the raw snapshots in a directory, oldest first"""
+    paths = [path for path in glob.glob(os.path.join(directory, "job_scraping_results*.csv"))
+             if RAW_PATTERN.match(os.path.basename(path))]
+    return sorted(paths, key=os.path.getmtime)
+
+def snapshot_version(structured_path):
+    """Read the extractor version recorded in a structured snapshot, or None"""
+    if not os.path.exists(structured_path):
+        return None
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    with open(structured_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        if 'extractor_version' not in (reader.fieldnames or []):
+            return None
+        first_row = next(reader, None)
+        # An empty snapshot with the column is as current as it can be
+        return first_row['extractor_version'] if first_row else EXTRACTOR_VERSION
+
+def is_current(raw_path):
+    """Check whether the structured snapshot for a raw snapshot was made by this extractor version"""
+    return snapshot_version(structured_path_for(raw_path)) == EXTRACTOR_VERSION
+
+_indexes = None
+
+def worker_indexes():
+    """This process's copies of the company and near-duplicate indexes deploy extracts with
+
+    Snapshots are extracted in parallel, so the copies are only read and
+    added to in memory, never saved over the files deploy keeps.
+    """
+    global _indexes
+    if _indexes is None:
+        from company_index import CompanyIndex
+        from near_duplicates import NearDuplicateIndex
+        _indexes = CompanyIndex(), NearDuplicateIndex()
+    return _indexes
+
+def extract_snapshot(raw_path):
+    """Extract one raw snapshot into its structured snapshot, replacing it atomically
+
+    The snapshot gets the same company_id and duplicate_of columns and
+    company names that deploy publishes.
+    """
+    import pandas as pd
+    from data_extractor import JobDataExtractor
+
+    output_path = structured_path_for(raw_path)
+    df = pd.read_csv(raw_path)
+    company_index, dedup_index = worker_indexes()
+    structured_df = JobDataExtractor().extract_structured_data(df, company_index=company_index, dedup_index=dedup_index)
+    write_csv_atomic(structured_df, output_path)
+    return output_path, len(structured_df)
+
+def backfill(directory=".", workers=None, force=False, dry_run=False):
+    """Re-extract every stale snapshot in a directory and return the paths written"""
+    raw_paths = find_raw_snapshots(directory)
+    stale = [path for path in raw_paths if force or not is_current(path)]
+    print(f"📂 {len(raw_paths)} raw snapshots, {len(stale)} need extractor version {EXTRACTOR_VERSION}")
+
+    if dry_run or not stale:
+        for path in stale:
+            print(f"   • {path} -> {structured_path_for(path)}")
+        return []
+
+    written = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(extract_snapshot, path): path for path in stale}
+        for future in as_completed(futures):
+            try:
+                output_path, rows = future.result()
+                print(f"✅ {futures[future]} -> {output_path} ({rows} jobs)")
+                written.append(output_path)
+            except Exception as e:
+                print(f"❌ Error re-extracting {futures[future]}: {e}")
+    return written
+
+def extract_postings(postings):
+    """Extract a chunk of stored postings inside a worker process"""
+    from data_extractor import JobDataExtractor
+    extractor = JobDataExtractor()
+    return [extractor.extract_record(posting) for posting in postings]
+
+def backfill_store(db_path=DEFAULT_DB_PATH, workers=None, chunk_size=1000, dry_run=False):
+    """Re-extract stored postings without current structured fields and return how many were updated"""
+    with JobStore(db_path) as store:
+        stale = store.unextracted_or_stale(EXTRACTOR_VERSION)
+        print(f"🗄️  {store.counts()['postings']} stored postings, {len(stale)} need extractor version {EXTRACTOR_VERSION}")
+        if dry_run or not stale:
+            return 0
+
+        run_id = store.start_run('backfill', EXTRACTOR_VERSION)
+        updated = 0
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = []
+            for start in range(0, len(stale), chunk_size):
+                # Keep a bounded number of chunks in flight so memory stays flat
+                pending.append(executor.submit(extract_postings, store.get_postings(stale[start:start + chunk_size])))
+                if len(pending) >= workers * 2:
+                    updated += store.upsert_structured(pending.pop(0).result(), run_id)
+            for future in pending:
+                updated += store.upsert_structured(future.result(), run_id)
+        store.finish_run(run_id, updated)
+        publish_snapshots(store)
+    print(f"✅ Re-extracted {updated} stored postings")
+    return updated
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', nargs='?', default='.', help="Directory holding the snapshots (default: current)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument('--force', action='store_true', help="Re-extract even snapshots that are already current")
+    parser.add_argument('--dry-run', action='store_true', help="Only list the snapshots that would be re-extracted")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help=f"Job store to backfill as well (default: {DEFAULT_DB_PATH})")
+    args = parser.parse_args(argv)
+
+    written = backfill(args.directory, workers=args.workers, force=args.force, dry_run=args.dry_run)
+    print(f"🤖 Backfill complete: {len(written)} snapshots re-extracted")
+    if store_exists(args.db):
+        backfill_store(args.db, workers=args.workers, dry_run=args.dry_run)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Append-only feed of posting changes for downstream consumers
+Every pipeline run appends posting_added, field_changed and posting_expired
+events to changes.jsonl, keyed by posting_id and stamped with the scrape run.
+A consumer keeps the byte offset it has read up to as its cursor and resumes
+from there, so it only ever reads the changes since its last visit.
+"""
+
+import os
+import json
+import time
+import argparse
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from deltas import _record, diff_records, snapshot_at
+from job_store import utc_now
+from snapshots import _write_atomic
+
+CHANGES_PATH = 'changes.jsonl'
+
+# Pipeline bookkeeping rather than facts about a posting: a new extractor version
+# or a rebuilt company index must not report every posting as changed
+METADATA_FIELDS = ('extractor_version', 'company_id')
+
+def compared_fields(record: Dict) -> Dict:
+    """The posting and extracted fields of a record, without pipeline metadata"""
+    return {field: value for field, value in record.items() if field not in METADATA_FIELDS}
+
+def change_events(previous: Dict[str, Dict], current: Dict[str, Dict], run_id: Optional[int]) -> List[Dict]:
+    """Events that turn one set of postings (keyed by posting_id) into the next
+
+    Only compared_fields are diffed; an added posting's event still carries the whole record.
+    """
+    at = utc_now()
+    events = []
+    compared_previous = {key: compared_fields(record) for key, record in previous.items()}
+    compared_current = {key: compared_fields(record) for key, record in current.items()}
+    for change in diff_records(compared_previous, compared_current):
+        key = change['posting_id']
+        if change['op'] == 'added':
+            events.append({'event': 'posting_added', 'posting_id': key, 'run_id': run_id, 'at': at,
+                           'record': current[key]})
+        elif change['op'] == 'changed':
+            for field in sorted(change['fields']):
+                events.append({'event': 'field_changed', 'posting_id': key, 'run_id': run_id, 'at': at,
+                               'field': field, 'old': previous[key].get(field), 'new': change['fields'][field]})
+        else:
+            events.append({'event': 'posting_expired', 'posting_id': key, 'run_id': run_id, 'at': at,
+                           'url': previous[key].get('url')})
+    return events
+
+def append_events(events: List[Dict], path: str = CHANGES_PATH) -> int:
+    """Append events to the feed in one write and return the new end offset"""
+    data = ''.join(json.dumps(event, ensure_ascii=False, sort_keys=True) + '\n' for event in events).encode('utf-8')
+    with open(path, 'ab') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+def iter_changes(cursor: int = 0, path: str = CHANGES_PATH) -> Iterator[Tuple[Dict, int]]:
+    """Yield (event, cursor after it) from a byte offset to the current end of the feed
+
+    Seeks straight to the offset, so the cost is proportional to the new changes,
+    not to the whole feed. A line still being written is left for the next read.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if cursor > f.tell():
+            raise ValueError(f"Cursor {cursor} is past the end of {path}; was the feed truncated?")
+        f.seek(cursor)
+        for line in f:
+            if not line.endswith(b'\n'):
+                return
+            cursor += len(line)
+            yield json.loads(line), cursor
+
+def read_changes(cursor: int = 0, path: str = CHANGES_PATH, limit: Optional[int] = None) -> Tuple[List[Dict], int]:
+    """Events after a cursor (at most limit of them) and the cursor to resume from"""
+    events = []
+    for event, end in iter_changes(cursor, path):
+        if limit is not None and len(events) == limit:
+            break
+        events.append(event)
+        cursor = end
+    return events, cursor
+
+def load_cursor(cursor_path: str) -> int:
+    """A consumer's saved cursor, or 0 to start from the beginning of the feed"""
+    try:
+        with open(cursor_path, 'r', encoding='utf-8') as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+def save_cursor(cursor_path: str, cursor: int):
+    """Save a consumer's cursor atomically"""
+    _write_atomic(cursor_path, lambda f: f.write(f"{cursor}\n"), 'w', encoding='utf-8')
+
+def follow(cursor_path: str, path: str = CHANGES_PATH, interval: float = 5.0) -> Iterator[Dict]:
+    """Yield events as they are appended, saving the cursor after each one"""
+    cursor = load_cursor(cursor_path)
+    while True:
+        start = cursor
+        for event, cursor in iter_changes(start, path):
+            yield event
+            save_cursor(cursor_path, cursor)
+        if cursor == start:
+            time.sleep(interval)
+
+def record_store_changes(store, path: str = CHANGES_PATH) -> int:
+    """Append the changes between the last recorded history snapshot and the store's current postings
+
+    Run before the history stage records today's snapshot. Returns the number of events.
+    """
+    previous = snapshot_at() or {}
+    current = {}
+    for row in store.current_records():
+        record = _record(row)
+        current[record['posting_id']] = record
+    run = store.latest_run('scrape')
+    events = change_events(previous, current, run['run_id'] if run else None)
+    if events:
+        append_events(events, path)
+    counts = {name: sum(1 for event in events if event['event'] == name)
+              for name in ('posting_added', 'field_changed', 'posting_expired')}
+    print(f"📰 Change feed: {counts['posting_added']} added, {counts['field_changed']} field changes, "
+          f"{counts['posting_expired']} expired ({path})")
+    return len(events)
+
+def main(argv: Optional[List[str]] = None):
+    """Print the changes since a consumer's cursor and advance it"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--feed', default=CHANGES_PATH, help=f"Change feed file (default: {CHANGES_PATH})")
+    parser.add_argument('--cursor', default=None, help="File holding this consumer's cursor (default: read from the start)")
+    parser.add_argument('--follow', action='store_true', help="Keep printing new events as they are appended")
+    args = parser.parse_args(argv)
+
+    if args.follow:
+        if not args.cursor:
+            parser.error("--follow needs --cursor to remember its position")
+        for event in follow(args.cursor, args.feed):
+            print(json.dumps(event, ensure_ascii=False))
+        return
+
+    events, cursor = read_changes(load_cursor(args.cursor) if args.cursor else 0, args.feed)
+    for event in events:
+        print(json.dumps(event, ensure_ascii=False))
+    if args.cursor:
+        save_cursor(args.cursor, cursor)
+
+if __name__ == "__main__":
+    main()
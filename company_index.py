@@ -0,0 +1,224 @@
+import os
+import re
+import json
+import hashlib
+import tempfile
+import unicodedata
+from typing import Dict, List, Optional
+
+# Structured fields that describe the company rather than the individual posting
+COMPANY_FIELDS = [
+    'company_name', 'location', 'contact_person', 'email_addresses',
+    'phone_numbers', 'address', 'email_domain'
+]
+
+# Shared mail providers say nothing about which company posted the job
+FREE_MAIL_DOMAINS = {
+    'gmail.com', 'hotmail.com', 'hotmail.be', 'outlook.com', 'outlook.be', 'live.be',
+    'live.com', 'yahoo.com', 'yahoo.fr', 'icloud.com', 'telenet.be', 'skynet.be',
+    'proximus.be', 'msn.com'
+}
+
+# Words that vary between postings of the same business ("Restaurant X" vs "X")
+NAME_STOP_WORDS = {
+    'restaurant', 'brasserie', 'cafe', 'bar', 'hotel', 'bistro', 'eetcafe', 'grand',
+    'de', 'het', 't', 'the', 'le', 'la', 'les'
+}
+
+# Company fields a posting takes from its company record when it has none of its own.
+# Contact person, emails and phone numbers belong to the posting and are never borrowed
+SHARED_FIELDS = ['company_name', 'location', 'address', 'email_domain']
+
+# Fields used to build the company lookup keys
+KEY_FIELDS = ['company_name', 'address', 'email_domain']
+
+DEFAULT_INDEX_PATH = 'company_index.json'
+
+# Bump when the key or canonical value rules change, so indexes built by the old rules are dropped
+INDEX_FORMAT = 2
+
+# The email regex runs on text with the words glued together, so domains come
+# out as 'gmail.comof'; a free-mail provider is recognised with any letters after its TLD
+_FREE_MAIL_PATTERN = re.compile('^(?:' + '|'.join(map(re.escape, sorted(FREE_MAIL_DOMAINS))) + ')[a-z]*$')
+
+def normalize_text(text) -> str:
+    """Lowercase, strip accents and collapse everything but letters and digits to single spaces"""
+    if not text or not isinstance(text, str):
+        return ''
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+def block_key(record: Dict) -> str:
+    """Hash the bedrijf/solliciteren blocks so identical postings share a key
+
+    Only whitespace is collapsed: case and punctuation change what gets
+    extracted (emails, phone numbers), so postings differing in them must not
+    share a cached extraction.
+    """
+    bedrijf = ' '.join(str(record.get('bedrijf', '')).split())
+    solliciteren = ' '.join(str(record.get('solliciteren', '')).split())
+    return hashlib.sha1(f"{bedrijf}\x1f{solliciteren}".encode('utf-8')).hexdigest()
+
+def is_free_mail(domain: str) -> bool:
+    """Whether an extracted email domain belongs to a shared mail provider"""
+    return bool(_FREE_MAIL_PATTERN.match(domain.strip().lower()))
+
+def company_keys(values: Dict) -> List[str]:
+    """Return the lookup keys for a company, most reliable first"""
+    keys = []
+    for domain in (values.get('email_domain') or '').split('; '):
+        domain = domain.strip().lower()
+        if domain and not is_free_mail(domain):
+            keys.append(f'domain:{domain}')
+    address = normalize_text(values.get('address'))
+    if address:
+        keys.append(f'address:{address}')
+    name = ' '.join(word for word in normalize_text(values.get('company_name')).split() if word not in NAME_STOP_WORDS)
+    if len(name) >= 4:
+        keys.append(f'name:{name}')
+    return keys
+
+class CompanyIndex:
+    """Persistent index mapping repeated postings to canonical company records.
+
+    Postings are first looked up by a hash of their text blocks; an exact repeat
+    reuses the cached extraction instead of running the regexes again. New
+    postings are extracted normally and then matched to an existing company by
+    email domain, address or name. A posting keeps every value it extracted
+    itself and only fills the SHARED_FIELDS it left empty from its company
+    record, which keeps the smallest value seen for each field so it does not
+    depend on the order postings arrive in.
+    """
+    def __init__(self, path: Optional[str] = DEFAULT_INDEX_PATH):
+        self.path = path
+        self.companies = {}  # company_id -> canonical company fields
+        self.keys = {}       # lookup key -> company_id
+        self.blocks = {}     # block hash -> {'company_id': ..., 'values': {...}}
+        self.extractor_version = None
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    def load(self):
+        """Load the index from disk, ignoring one written under older index rules"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') != INDEX_FORMAT:
+            return
+        self.companies = data.get('companies', {})
+        self.keys = data.get('keys', {})
+        self.blocks = data.get('blocks', {})
+        self.extractor_version = data.get('extractor_version')
+
+    def save(self):
+        """Write the index to disk atomically"""
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.company_index_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'format': INDEX_FORMAT, 'extractor_version': self.extractor_version,
+                           'companies': self.companies, 'keys': self.keys, 'blocks': self.blocks},
+                          f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def ensure_version(self, version: str):
+        """Drop everything built from a different extractor version's output
+
+        The company records and keys hold values the old extractor produced,
+        so they are rebuilt along with the cached extractions.
+        """
+        if self.extractor_version != version:
+            self.companies = {}
+            self.keys = {}
+            self.blocks = {}
+            self.extractor_version = version
+
+    def __len__(self):
+        return len(self.companies)
+
+    def lookup(self, record: Dict, fields: List[str]) -> Optional[Dict]:
+        """Return the cached company fields and company_id of a posting whose text blocks were seen before"""
+        cached = self.blocks.get(block_key(record))
+        if not cached:
+            return None
+        wanted = [field for field in fields if field in COMPANY_FIELDS]
+        if any(field not in cached['values'] for field in wanted):
+            return None
+        return dict(cached['values'], company_id=cached['company_id'] or '')
+
+    def resolve(self, values: Dict) -> Optional[str]:
+        """Find the company_id matching a set of extracted fields"""
+        for key in company_keys(values):
+            if key in self.keys:
+                return self.keys[key]
+        return None
+
+    def add(self, record: Dict, values: Dict) -> str:
+        """Register a freshly extracted posting and return its company_id ('' if it has no keys)"""
+        company_values = {field: values[field] for field in COMPANY_FIELDS if field in values}
+        keys = company_keys(company_values)
+        company_id = self.resolve(company_values)
+
+        if company_id is None and keys:
+            company_id = 'c' + hashlib.sha1(keys[0].encode('utf-8')).hexdigest()[:12]
+            self.companies[company_id] = {}
+
+        if company_id is not None:
+            canonical = self.companies[company_id]
+            for field in SHARED_FIELDS:
+                value = company_values.get(field)
+                if value and (not canonical.get(field) or value < canonical[field]):
+                    canonical[field] = value
+            for key in keys:
+                self.keys.setdefault(key, company_id)
+
+        key = block_key(record)
+        cached = self.blocks.setdefault(key, {'company_id': company_id, 'values': {}})
+        cached['values'].update(company_values)
+        return company_id or ''
+
+    def fill_missing(self, result: Dict) -> Dict:
+        """Fill the shared company fields a result left empty from its company record"""
+        canonical = self.companies.get(result.get('company_id'), {})
+        for field in SHARED_FIELDS:
+            if field in result and not result[field] and canonical.get(field):
+                result[field] = canonical[field]
+        return result
+
+    def extract_fields(self, extractor, record: Dict, fields: List[str], fill: bool = True) -> Dict:
+        """Extract the requested fields, reusing cached company data when the posting was seen before
+
+        With fill=False the posting is only registered; fill_missing completes
+        it once every posting of the batch is in the index.
+        """
+        cached = self.lookup(record, fields)
+        if cached is not None:
+            return self.from_cache(extractor, record, cached, fields, fill)
+
+        self.misses += 1
+        # The key fields are always needed to match the posting to a company
+        lazy = extractor.lazy_record(record)
+        key_values = lazy.to_dict(KEY_FIELDS)
+        return self.merge(record, lazy.to_dict(fields), key_values, fill)
+
+    def from_cache(self, extractor, record: Dict, cached: Dict, fields: List[str], fill: bool = True) -> Dict:
+        """Build a result from cached company values, extracting only the per-posting fields"""
+        self.hits += 1
+        posting = extractor.extract_fields(record, [field for field in fields if field not in COMPANY_FIELDS])
+        posting.update({field: cached[field] for field in fields if field in COMPANY_FIELDS})
+        posting['company_id'] = cached['company_id']
+        return self.fill_missing(posting) if fill else posting
+
+    def merge(self, record: Dict, extracted: Dict, key_values: Optional[Dict] = None, fill: bool = True) -> Dict:
+        """Register an extraction result and return it with its company_id"""
+        result = dict(extracted)
+        result['company_id'] = self.add(record, dict(key_values or {}, **extracted))
+        return self.fill_missing(result) if fill else result
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark of the Streamlit dashboards on synthetic data of increasing size
+Each dashboard is run with Streamlit's AppTest (no browser or server) against
+a job store and published snapshot of N synthetic postings, timing the first
+load, a plain rerun and the reruns that follow the common interactions, and
+recording the peak memory of the process. Every app and size runs in its own
+process so caches and memory peaks do not carry over. Results are written to
+a JSON file, which a later run can be compared against to flag regressions.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+from itertools import islice
+from typing import Dict, List, Optional
+
+APPS = ['streamlit_app.py', 'enhanced_ui.py']
+SIZES = [1_000, 10_000, 100_000]
+RESULTS_PATH = 'dashboard_bench.json'
+APP_TIMEOUT = 600
+
+# Each app and size is measured this many times and the best run of each metric kept, as single runs are noisy
+REPEAT = 3
+
+# A metric regresses when it grows by more than the tolerance and by at least this much
+TOLERANCE = 0.25
+MIN_DELTA = {'ms': 50.0, 'mb': 20.0}
+
+# Metric -> (widget type, how to find the widget, how to change it), applied in this order
+INTERACTIONS = [
+    ('filter_ms', 'checkbox', lambda w: w.label == 'Has Email', lambda w: w.check()),
+    ('page_ms', 'number_input', lambda w: w.key == 'raw_page', lambda w: w.set_value(2)),
+    ('search_ms', 'text_input', lambda w: w.label.startswith('Search in Company Info'), lambda w: w.input('brasserie 42')),
+    ('details_ms', 'number_input', lambda w: w.key == 'details_page', lambda w: w.set_value(2)),
+    ('export_ms', 'button', lambda w: w.key == 'export_raw_button', lambda w: w.click()),
+]
+
+def build_dataset(n: int, directory: str) -> str:
+    """Create a job store of n synthetic postings with their extracted fields and publish a snapshot of it
+
+    An existing dataset in directory is reused, since building the larger ones takes a while.
+    """
+    from job_store import DEFAULT_DB_PATH, JobStore
+    from records import _synthetic_rows, JobPosting, posting_id
+    from snapshots import SNAPSHOT_DIR, publish_snapshots, read_manifest
+
+    snapshot_dir = os.path.join(directory, SNAPSHOT_DIR)
+    if read_manifest(snapshot_dir):
+        return directory
+    os.makedirs(snapshot_dir, exist_ok=True)
+    rows = _synthetic_rows(n)
+    with JobStore(os.path.join(directory, DEFAULT_DB_PATH)) as store:
+        # Batches keep the 1M-posting dataset from being held in memory at once
+        while True:
+            batch = list(islice(rows, 50_000))
+            if not batch:
+                break
+            store.upsert_postings(JobPosting(url, bedrijf, solliciteren) for url, bedrijf, solliciteren, _ in batch)
+            store.upsert_structured([dict(extracted, posting_id=posting_id(url), url=url)
+                                     for url, _, _, extracted in batch])
+        publish_snapshots(store, snapshot_dir)
+    return directory
+
+def _find(at, kind: str, match):
+    """The first widget of a kind that matches, or None if the app did not render one"""
+    return next((widget for widget in getattr(at, kind) if match(widget)), None)
+
+def measure_app(app: str, directory: str) -> Dict:
+    """Time one dashboard's load and interactions on the dataset in directory (run in a fresh process)"""
+    import resource
+    # Imported up front so the first load measures the dashboard, not the interpreter loading pandas
+    import pandas, pyarrow, plotly.express  # noqa: F401
+    from streamlit.testing.v1 import AppTest
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), app)
+    os.chdir(directory)
+    at = AppTest.from_file(script, default_timeout=APP_TIMEOUT)
+    results, skipped = {}, []
+
+    def timed(metric):
+        start = time.perf_counter()
+        at.run()
+        results[metric] = (time.perf_counter() - start) * 1000
+
+    timed('initial_load_ms')
+    timed('rerun_ms')
+    for metric, kind, match, change in INTERACTIONS:
+        widget = _find(at, kind, match)
+        if widget is None:
+            skipped.append(metric)
+            continue
+        change(widget)
+        timed(metric)
+
+    export = at.session_state['export_raw_export'] if 'export_raw_export' in at.session_state else None
+    if export and os.path.exists(export):
+        os.remove(export)
+    results['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results['errors'] = [str(exception.value) for exception in at.exception]
+    results['skipped'] = skipped
+    return results
+
+def _run_once(app: str, directory: str) -> Dict:
+    process = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', app, directory],
+                             capture_output=True, text=True)
+    lines = process.stdout.strip().splitlines()
+    if process.returncode < 0:
+        # SIGKILL is usually the kernel's out-of-memory killer
+        return {'errors': [f"killed by signal {-process.returncode}" + (" (out of memory?)" if process.returncode == -9 else "")]}
+    if process.returncode or not lines:
+        return {'errors': [process.stderr.strip().splitlines()[-1] if process.stderr.strip() else f"exit {process.returncode}"]}
+    return json.loads(lines[-1])
+
+def run_app(app: str, directory: str, repeat: int = REPEAT) -> Dict:
+    """Run measure_app for one app in repeat child processes and keep the lowest value of each metric"""
+    runs = [_run_once(app, directory) for _ in range(repeat)]
+    best = {metric: min(run[metric] for run in runs if metric in run)
+            for metric in dict.fromkeys(metric for run in runs for metric in run if metric[-3:] in ('_ms', '_mb'))}
+    best['errors'] = list(dict.fromkeys(error for run in runs for error in run.get('errors', [])))
+    best['skipped'] = sorted(set().union(*(run.get('skipped', []) for run in runs)))
+    return best
+
+def run_suite(apps: List[str] = APPS, sizes: List[int] = SIZES, data_dir: Optional[str] = None,
+              repeat: int = REPEAT) -> Dict:
+    """Benchmark every app at every dataset size"""
+    import tempfile
+    import streamlit
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            directory = os.path.abspath(os.path.join(data_dir or tmp, f"postings_{n}"))
+            start = time.perf_counter()
+            build_dataset(n, directory)
+            print(f"📦 {n} postings ready in {time.perf_counter() - start:.1f}s")
+            for app in apps:
+                results.setdefault(app, {})[str(n)] = measurement = run_app(app, directory, repeat)
+                print_measurement(app, n, measurement)
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'streamlit': streamlit.__version__,
+        'repeat': repeat,
+        'results': results,
+    }
+
+def print_measurement(app: str, n: int, measurement: Dict):
+    timings = ', '.join(f"{metric[:-3]} {value:.0f}" for metric, value in measurement.items() if metric.endswith('_ms'))
+    print(f"   {app} @ {n}: {timings} ms" if timings else f"   {app} @ {n}: no timings")
+    if 'peak_rss_mb' in measurement:
+        print(f"      peak memory {measurement['peak_rss_mb']:.0f} MiB")
+    if measurement.get('skipped'):
+        print(f"      ⚠️ no widget for {', '.join(measurement['skipped'])}")
+    for error in measurement.get('errors', []):
+        print(f"      ❌ {error}")
+
+def compare(current: Dict, baseline: Dict, tolerance: float = TOLERANCE) -> List[str]:
+    """Regressions of current against baseline: metrics that grew past the tolerance, and new errors
+
+    Apps, sizes and metrics that only one of the two has are reported as well,
+    since they cannot be checked.
+    """
+    regressions = []
+    for app, sizes in current['results'].items():
+        for n, measurement in sizes.items():
+            before = baseline.get('results', {}).get(app, {}).get(n)
+            if before is None:
+                regressions.append(f"{app} @ {n}: not in the baseline")
+                continue
+            if measurement.get('errors') and not before.get('errors'):
+                regressions.append(f"{app} @ {n}: {measurement['errors'][0]}")
+            for metric in sorted(set(before) - set(measurement)):
+                if metric.rsplit('_', 1)[-1] in MIN_DELTA:
+                    regressions.append(f"{app} @ {n}: {metric} no longer measured")
+            for metric, value in measurement.items():
+                old = before.get(metric)
+                unit = metric.rsplit('_', 1)[-1]
+                if unit not in MIN_DELTA:
+                    continue
+                if not isinstance(old, (int, float)):
+                    regressions.append(f"{app} @ {n}: {metric} not in the baseline")
+                    continue
+                if value > old * (1 + tolerance) and value - old >= MIN_DELTA[unit]:
+                    regressions.append(f"{app} @ {n}: {metric} {old:.0f} -> {value:.0f} (+{(value / old - 1) * 100:.0f}%)"
+                                       if old else f"{app} @ {n}: {metric} 0 -> {value:.0f}")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the dashboard benchmark suite and optionally compare it with a baseline"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)),
+                        help=f"Comma-separated dataset sizes (default: {','.join(map(str, SIZES))})")
+    parser.add_argument('--apps', default=','.join(APPS), help=f"Comma-separated dashboards (default: {','.join(APPS)})")
+    parser.add_argument('--out', default=RESULTS_PATH, help=f"JSON file for the results (default: {RESULTS_PATH})")
+    parser.add_argument('--data-dir', default=None, help="Keep the synthetic datasets here and reuse them (default: a temporary directory)")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help=f"Runs per app and size, best kept (default: {REPEAT})")
+    parser.add_argument('--compare', metavar='BASELINE', default=None, help="Results JSON to flag regressions against")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help=f"Allowed relative growth of a metric (default: {TOLERANCE})")
+    parser.add_argument('--measure', nargs=2, metavar=('APP', 'DIR'), default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        print(json.dumps(measure_app(*args.measure)))
+        return 0
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    results = run_suite(args.apps.split(','), [int(n) for n in args.sizes.split(',')], args.data_dir,
+                        args.repeat)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results written to {args.out}")
+
+    failed = any(measurement.get('errors') for sizes in results['results'].values() for measurement in sizes.values())
+    if baseline is None:
+        return 1 if failed else 0
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"❌ {regression}")
+    if not regressions:
+        print(f"✅ No regressions against {args.compare}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
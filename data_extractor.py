@@ -1,8 +1,24 @@
 import re
+import sys
+import csv
+import json
+import argparse
+import functools
+import multiprocessing
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from company_index import CompanyIndex, KEY_FIELDS
+from near_duplicates import NearDuplicateIndex, posting_id
+from records import StructuredJob, structured_to_frame
+from snapshots import write_csv_atomic
+
+# Bump whenever a change to the extraction rules alters the output, so that
+# structured snapshots made by an older version get picked up by backfill.py
+EXTRACTOR_VERSION = '2'
 
 class JobDataExtractor:
+    VERSION = EXTRACTOR_VERSION
+    
     def __init__(self):
         # Regex patterns for extracting various information
         self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
@@ -35,7 +51,7 @@ class JobDataExtractor:
         if not text:
             return []
         emails = re.findall(self.email_pattern, text.lower())
-        return list(set(emails))  # Remove duplicates
+        return list(dict.fromkeys(emails))  # Remove duplicates, keeping the order they appear in
     
     def extract_phone_numbers(self, text: str) -> List[str]:
         """Extract phone numbers from text"""
@@ -51,7 +67,8 @@ class JobDataExtractor:
             phone = re.sub(r'\s+', '', phone)
             if len(phone) >= 9:  # Minimum phone number length
                 cleaned_phones.append(phone)
-        return list(set(cleaned_phones))
+        # dict keeps the order they appear in; a set's order changes between runs
+        return list(dict.fromkeys(cleaned_phones))
     
     def extract_company_name(self, bedrijf_text: str) -> Optional[str]:
         """Extract company name from bedrijf section"""
@@ -294,45 +311,417 @@ class JobDataExtractor:
         
         return None
     
-    def extract_structured_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Extract structured data from all job listings"""
+    def lazy_record(self, record: Dict) -> 'LazyJobRecord':
+        """Wrap a job listing so each structured field is computed on first access"""
+        return LazyJobRecord(self, record)
+    
+    def extract_fields(self, record: Dict, fields: Optional[List[str]] = None) -> Dict:
+        """Extract only the requested fields (and the fields they depend on) from a job listing"""
+        return self.lazy_record(record).to_dict(STRUCTURED_FIELDS if fields is None else fields)
+    
+    def extract_record(self, record: Dict) -> Dict:
+        """Extract structured data from a single job listing"""
+        return self.extract_fields(record, STRUCTURED_FIELDS)
+    
+    def extract_job(self, posting, fields: Optional[List[str]] = None) -> StructuredJob:
+        """Extract a JobPosting (or raw row) into a compact StructuredJob record"""
+        return StructuredJob.from_dict(self.extract_fields(posting, fields))
+    
+    def extract_structured_data(self, df: pd.DataFrame, fields: Optional[List[str]] = None,
+                                company_index=None, dedup_index=None, skip_duplicates: bool = False) -> pd.DataFrame:
+        """Extract structured data from all job listings (a DataFrame or JobPosting records)
+        
+        When a CompanyIndex is given, repeated postings reuse the cached company
+        fields and every row gets a company_id column. Postings are registered
+        in posting_id order and only filled from their company once all of them
+        are in the index, so the result does not depend on the row order and a
+        rerun on the same input gives the same values. When a NearDuplicateIndex
+        is given, every row gets a duplicate_of column naming the first posting
+        of its near-duplicate cluster, and skip_duplicates drops those rows.
+        """
+        fields = fields or STRUCTURED_FIELDS
+        columns = list(fields)
+        if company_index is not None:
+            company_index.ensure_version(self.VERSION)
+            columns.append('company_id')
+        if dedup_index is not None:
+            columns.append('duplicate_of')
+        # Use compact StructuredJob records unless a field outside them was requested
+        compact = all(column in StructuredJob.__slots__ for column in columns)
         results = []
         
-        for idx, row in df.iterrows():
-            bedrijf_text = str(row.get('bedrijf', ''))
-            solliciteren_text = str(row.get('solliciteren', ''))
-            
-            # Extract from bedrijf section
-            company_name = self.extract_company_name(bedrijf_text)
-            location = self.extract_location(bedrijf_text)
-            
-            # If location not found in bedrijf, try solliciteren
-            if not location:
-                location = self.extract_location(solliciteren_text)
-            
-            # Extract from solliciteren section
-            contact_person = self.extract_contact_person(solliciteren_text)
-            emails = self.extract_emails(solliciteren_text)
-            phones = self.extract_phone_numbers(solliciteren_text)
-            address = self.extract_address(solliciteren_text)
-            
-            result = {
-                'url': row.get('url', ''),
-                'original_bedrijf': bedrijf_text,
-                'original_solliciteren': solliciteren_text,
-                'company_name': company_name,
-                'location': location,
-                'contact_person': contact_person,
-                'email_addresses': '; '.join(emails) if emails else '',
-                'phone_numbers': '; '.join(phones) if phones else '',
-                'address': address
-            }
-            results.append(result)
-        
-        return pd.DataFrame(results)
+        rows = (row for _, row in df.iterrows()) if isinstance(df, pd.DataFrame) else iter(df)
+        rows = _flag_duplicates(rows, dedup_index, skip_duplicates)
+        if company_index is not None:
+            rows = list(rows)
+            extracted = [None] * len(rows)
+            for i in sorted(range(len(rows)), key=lambda i: _posting_key(rows[i][0])):
+                extracted[i] = company_index.extract_fields(self, rows[i][0], fields, fill=False)
+            pairs = zip(rows, (company_index.fill_missing(result) for result in extracted))
+        else:
+            pairs = (((row, duplicate_of), self.extract_fields(row, fields)) for row, duplicate_of in rows)
+        for (row, duplicate_of), result in pairs:
+            result = _with_duplicate_flag(result, duplicate_of, dedup_index)
+            results.append(StructuredJob.from_dict(result) if compact else result)
+        
+        if compact:
+            return structured_to_frame(results, columns)
+        return pd.DataFrame(results, columns=columns)
+
+# Rows reference the raw posting by posting_id rather than copying its text;
+# original_bedrijf/original_solliciteren can still be requested explicitly
+STRUCTURED_FIELDS = [
+    'posting_id', 'url', 'company_name', 'location', 'contact_person',
+    'email_addresses', 'phone_numbers', 'address', 'extractor_version'
+]
+
+# Every field LazyJobRecord can compute, mapped to the fields it is derived from
+FIELD_DEPENDENCIES = {
+    'url': [],
+    'posting_id': ['url'],
+    'original_bedrijf': [],
+    'original_solliciteren': [],
+    'company_name': ['original_bedrijf'],
+    'location': ['original_bedrijf', 'original_solliciteren'],
+    'contact_person': ['original_solliciteren'],
+    'email_addresses': ['original_solliciteren'],
+    'phone_numbers': ['original_solliciteren'],
+    'address': ['original_solliciteren'],
+    'email_domain': ['email_addresses'],
+    'extractor_version': [],
+}
+
+AVAILABLE_FIELDS = list(FIELD_DEPENDENCIES)
+
+def resolve_fields(fields: Iterable[str]) -> List[str]:
+    """Return the requested fields plus everything they depend on, dependencies first"""
+    resolved = []
+    
+    def visit(field):
+        if field not in FIELD_DEPENDENCIES:
+            raise KeyError(f"Unknown field: {field}")
+        if field in resolved:
+            return
+        for dependency in FIELD_DEPENDENCIES[field]:
+            visit(dependency)
+        resolved.append(field)
+    
+    for field in fields:
+        visit(field)
+    return resolved
 
-def main():
-    """Test the extraction on existing data"""
+class LazyJobRecord:
+    """A job listing whose structured fields are extracted on first access and memoized"""
+    def __init__(self, extractor: JobDataExtractor, record: Dict):
+        self.extractor = extractor
+        self.record = record
+        self._values = {}
+    
+    def __getitem__(self, field: str):
+        if field not in self._values:
+            if field not in FIELD_DEPENDENCIES:
+                raise KeyError(field)
+            self._values[field] = getattr(self, f'_compute_{field}')()
+        return self._values[field]
+    
+    def __contains__(self, field: str) -> bool:
+        return field in FIELD_DEPENDENCIES
+    
+    def get(self, field: str, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+    
+    def computed_fields(self) -> List[str]:
+        """Fields that have been computed so far"""
+        return list(self._values)
+    
+    def to_dict(self, fields: Optional[List[str]] = None) -> Dict:
+        """Return the requested fields as a plain dict"""
+        return {field: self[field] for field in (STRUCTURED_FIELDS if fields is None else fields)}
+    
+    def _compute_url(self):
+        return self.record.get('url', '')
+    
+    def _compute_posting_id(self):
+        value = self.record.get('posting_id')
+        if isinstance(value, str) and value:
+            return value
+        return posting_id(self['url'])
+    
+    def _compute_original_bedrijf(self):
+        return str(self.record.get('bedrijf', ''))
+    
+    def _compute_original_solliciteren(self):
+        return str(self.record.get('solliciteren', ''))
+    
+    def _compute_company_name(self):
+        return self.extractor.extract_company_name(self['original_bedrijf'])
+    
+    def _compute_location(self):
+        location = self.extractor.extract_location(self['original_bedrijf'])
+        # If location not found in bedrijf, try solliciteren
+        if not location:
+            location = self.extractor.extract_location(self['original_solliciteren'])
+        return location
+    
+    def _compute_contact_person(self):
+        return self.extractor.extract_contact_person(self['original_solliciteren'])
+    
+    def _compute_email_addresses(self):
+        emails = self.extractor.extract_emails(self['original_solliciteren'])
+        return '; '.join(emails) if emails else ''
+    
+    def _compute_phone_numbers(self):
+        phones = self.extractor.extract_phone_numbers(self['original_solliciteren'])
+        return '; '.join(phones) if phones else ''
+    
+    def _compute_address(self):
+        return self.extractor.extract_address(self['original_solliciteren'])
+    
+    def _compute_extractor_version(self):
+        return self.extractor.VERSION
+    
+    def _compute_email_domain(self):
+        domains = []
+        for email in self['email_addresses'].split('; '):
+            if '@' in email:
+                domain = email.split('@', 1)[1]
+                if domain not in domains:
+                    domains.append(domain)
+        return '; '.join(domains)
+
+_worker_extractor = None
+
+def _init_worker():
+    """Create one extractor per worker process"""
+    global _worker_extractor
+    _worker_extractor = JobDataExtractor()
+
+def _extract_in_worker(record: Dict, fields: List[str]) -> Dict:
+    """Extract a single record inside a worker process"""
+    return _worker_extractor.extract_fields(record, fields)
+
+def iter_input_records(stream: TextIO, input_format: str = 'jsonl') -> Iterator[Dict]:
+    """Yield raw job records one at a time from a JSONL or CSV stream"""
+    if input_format == 'csv':
+        # Job descriptions can be longer than the csv module's default field limit
+        csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+        for row in csv.DictReader(stream):
+            yield row
+    else:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def _iter_batches(records: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    """Group a record stream into lists of at most batch_size records"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _detect_format(path: Optional[str], default: str = 'jsonl') -> str:
+    """Guess the record format from a file extension"""
+    if path and path.lower().endswith('.csv'):
+        return 'csv'
+    if path and path.lower().endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    return default
+
+class _RecordWriter:
+    """Write structured records incrementally as JSONL or CSV"""
+    def __init__(self, stream: TextIO, output_format: str, fields: List[str]):
+        self.stream = stream
+        self.output_format = output_format
+        self.fields = fields
+        self.csv_writer = None
+        if output_format == 'csv':
+            self.csv_writer = csv.DictWriter(stream, fieldnames=fields, extrasaction='ignore')
+            self.csv_writer.writeheader()
+    
+    def write(self, record: Dict):
+        projected = {field: record.get(field) for field in self.fields}
+        if self.csv_writer:
+            self.csv_writer.writerow(projected)
+        else:
+            self.stream.write(json.dumps(projected, ensure_ascii=False) + '\n')
+
+def _flag_duplicates(records: Iterable[Dict], dedup_index, skip_duplicates: bool = False) -> Iterator[Tuple[Dict, str]]:
+    """Register records in the near-duplicate index, yielding (record, duplicate_of) or dropping repeats
+
+    The marker travels next to the record rather than in it, so the caller's
+    records are left as they were passed in.
+    """
+    for record in records:
+        duplicate_of = ''
+        if dedup_index is not None:
+            duplicate_of = dedup_index.add(posting_id(record.get('url', '')), record) or ''
+            if duplicate_of and skip_duplicates:
+                continue
+        yield record, duplicate_of
+
+def _posting_key(record) -> str:
+    """The posting_id of a raw record, falling back to its URL"""
+    return record.get('posting_id') or posting_id(record.get('url', ''))
+
+def _with_duplicate_flag(result: Dict, duplicate_of: str, dedup_index) -> Dict:
+    """Set the duplicate_of marker of the input record on its result"""
+    if dedup_index is not None:
+        result['duplicate_of'] = duplicate_of
+    return result
+
+def _submit_batch(pool, batch: List[Tuple[Dict, str]], fields: List[str], company_index, chunksize: int):
+    """Resolve cached postings locally and hand the rest of a batch to the worker pool"""
+    cached = [company_index.lookup(record, fields) if company_index is not None else None for record, _ in batch]
+    misses = [record for (record, _), hit in zip(batch, cached) if hit is None]
+    worker_fields = fields
+    if company_index is not None:
+        worker_fields = list(dict.fromkeys(fields + KEY_FIELDS))
+    extract = functools.partial(_extract_in_worker, fields=worker_fields)
+    return batch, cached, pool.map_async(extract, misses, chunksize)
+
+def _collect_batch(pending, fields: List[str], company_index, dedup_index, extractor) -> Iterator[Dict]:
+    """Yield the results of a submitted batch in input order"""
+    batch, cached, async_result = pending
+    extracted = iter(async_result.get())
+    for (record, duplicate_of), hit in zip(batch, cached):
+        if hit is not None:
+            values = company_index.from_cache(extractor, record, hit, fields)
+        else:
+            values = next(extracted)
+            if company_index is not None:
+                company_index.misses += 1
+                values = company_index.merge(record, {field: values[field] for field in fields},
+                                             {field: values[field] for field in KEY_FIELDS})
+        yield _with_duplicate_flag(values, duplicate_of, dedup_index)
+
+def stream_extract(input_stream: TextIO, output_stream: TextIO, input_format: str = 'jsonl',
+                   output_format: str = 'jsonl', fields: Optional[List[str]] = None,
+                   workers: int = 1, batch_size: int = 500, company_index=None,
+                   dedup_index=None, skip_duplicates: bool = False) -> int:
+    """Extract structured data from a record stream, writing results as they are produced.
+    
+    At most two batches are held in memory at any time, so memory use does not
+    depend on the size of the input. With a company index, a record can only be
+    filled from the postings registered before it.
+    """
+    fields = fields or STRUCTURED_FIELDS
+    output_fields = list(fields)
+    if company_index is not None:
+        company_index.ensure_version(EXTRACTOR_VERSION)
+        output_fields.append('company_id')
+    if dedup_index is not None:
+        output_fields.append('duplicate_of')
+    writer = _RecordWriter(output_stream, output_format, output_fields)
+    records = _flag_duplicates(iter_input_records(input_stream, input_format), dedup_index, skip_duplicates)
+    batches = _iter_batches(records, batch_size)
+    extractor = JobDataExtractor()
+    count = 0
+    
+    if workers <= 1:
+        for batch in batches:
+            for record, duplicate_of in batch:
+                if company_index is not None:
+                    result = company_index.extract_fields(extractor, record, fields)
+                else:
+                    result = extractor.extract_fields(record, fields)
+                writer.write(_with_duplicate_flag(result, duplicate_of, dedup_index))
+            count += len(batch)
+        return count
+    
+    chunksize = max(1, batch_size // (workers * 4))
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        pending = None
+        for batch in batches:
+            # Submit the next batch before writing the previous one so workers stay busy
+            submitted = _submit_batch(pool, batch, fields, company_index, chunksize)
+            if pending is not None:
+                for result in _collect_batch(pending, fields, company_index, dedup_index, extractor):
+                    writer.write(result)
+                    count += 1
+            pending = submitted
+        if pending is not None:
+            for result in _collect_batch(pending, fields, company_index, dedup_index, extractor):
+                writer.write(result)
+                count += 1
+    return count
+
+def run_cli(args: argparse.Namespace) -> int:
+    """Run streaming extraction for the command-line arguments"""
+    fields = None
+    if args.fields:
+        fields = [field.strip() for field in args.fields.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in FIELD_DEPENDENCIES]
+        if unknown:
+            print(f"Error: unknown field(s): {', '.join(unknown)}", file=sys.stderr)
+            print(f"Available fields: {', '.join(AVAILABLE_FIELDS)}", file=sys.stderr)
+            return 2
+    
+    input_format = args.input_format or _detect_format(None if args.input == '-' else args.input)
+    output_format = args.output_format or _detect_format(args.output)
+    
+    company_index = CompanyIndex(args.company_index) if args.company_index else None
+    dedup_index = NearDuplicateIndex(args.dedup_index) if args.dedup_index else None
+    
+    input_stream = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8', newline='')
+    output_stream = sys.stdout if args.output in (None, '-') else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        count = stream_extract(input_stream, output_stream, input_format, output_format,
+                               fields=fields, workers=args.workers, batch_size=args.batch_size,
+                               company_index=company_index, dedup_index=dedup_index,
+                               skip_duplicates=args.skip_duplicates)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    
+    print(f"Successfully processed {count} job listings", file=sys.stderr)
+    if company_index is not None:
+        company_index.save()
+        print(f"Company index: {len(company_index)} companies, {company_index.hits} postings reused cached data",
+              file=sys.stderr)
+    if dedup_index is not None:
+        dedup_index.save()
+        print(f"Near-duplicate index: {len(dedup_index)} postings, {len(dedup_index.clusters())} duplicate clusters",
+              file=sys.stderr)
+    return 0
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for streaming extraction"""
+    parser = argparse.ArgumentParser(
+        description="Extract structured data from scraped job listings. "
+                    "Without arguments, processes job_scraping_results.csv into job_data_structured.csv."
+    )
+    parser.add_argument('input', nargs='?', help="Input file with JSONL or CSV records, or '-' for stdin")
+    parser.add_argument('-o', '--output', help="Output file (default: stdout)")
+    parser.add_argument('--input-format', choices=['jsonl', 'csv'], help="Input format (default: from file extension, JSONL for stdin)")
+    parser.add_argument('--output-format', choices=['jsonl', 'csv'], help="Output format (default: from file extension, JSONL for stdout)")
+    parser.add_argument('--workers', type=int, default=1, help="Number of worker processes (default: 1)")
+    parser.add_argument('--fields', help=f"Comma-separated output fields; only these are extracted "
+                                           f"(default: {','.join(STRUCTURED_FIELDS)}; also available: email_domain)")
+    parser.add_argument('--company-index', help="Company index file used to reuse extraction across repeated postings")
+    parser.add_argument('--dedup-index', help="Near-duplicate index file; adds a duplicate_of column")
+    parser.add_argument('--skip-duplicates', action='store_true', help="Drop postings that near-duplicate an indexed one (requires --dedup-index)")
+    parser.add_argument('--batch-size', type=int, default=500, help="Records per batch handed to the workers (default: 500)")
+    return parser
+
+def main(argv: Optional[List[str]] = None):
+    """Test the extraction on existing data, or stream records when given an input"""
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.skip_duplicates and not args.dedup_index:
+        parser.error("--skip-duplicates requires --dedup-index")
+    if args.input:
+        return run_cli(args)
+    
     try:
         # Load existing scraped data
         df = pd.read_csv('job_scraping_results.csv')
@@ -342,7 +731,7 @@ def main():
         structured_df = extractor.extract_structured_data(df)
         
         # Save structured data
-        structured_df.to_csv('job_data_structured.csv', index=False, encoding='utf-8')
+        write_csv_atomic(structured_df, 'job_data_structured.csv')
         
         print(f"Successfully processed {len(structured_df)} job listings")
         print("Structured data saved to 'job_data_structured.csv'")
@@ -363,4 +752,6 @@ def main():
         return None
 
 if __name__ == "__main__":
-    main()
+    result = main()
+    if isinstance(result, int):
+        sys.exit(result)
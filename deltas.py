@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Daily history of the current postings as keyed deltas
+Each run is compared with the previous snapshot by posting_id and only the
+added, changed and removed postings are written to history/, instead of
+committing full copies of the data every day. Every COMPACT_EVERY deltas a
+full base file is written instead, so any date is rebuilt from one base and
+at most that many deltas.
+"""
+
+import os
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+from typing import Dict, Iterable, List, Optional
+
+from job_store import DEFAULT_DB_PATH, JobStore, store_exists
+from snapshots import _write_atomic
+
+HISTORY_DIR = 'history'
+INDEX_NAME = 'index.json'
+COMPACT_EVERY = 30
+
+def _line(value) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':')) + '\n'
+
+def _record(row: Dict) -> Dict:
+    """A posting as stored in the history: only the fields that are set"""
+    return {key: value for key, value in row.items() if value is not None and value != ''}
+
+def read_index(directory: str = HISTORY_DIR) -> List[Dict]:
+    """The snapshots in the history, oldest first"""
+    try:
+        with open(os.path.join(directory, INDEX_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)['snapshots']
+    except FileNotFoundError:
+        return []
+
+def _write_index(snapshots: List[Dict], directory: str):
+    _write_atomic(os.path.join(directory, INDEX_NAME),
+                  lambda f: json.dump({'snapshots': snapshots}, f, indent=2), 'w', encoding='utf-8')
+
+def diff_records(previous: Dict[str, Dict], current: Dict[str, Dict]) -> List[Dict]:
+    """Keyed changes that turn one snapshot into the next
+
+    Changed postings carry only the fields that differ, with null for fields that were cleared.
+    """
+    changes = []
+    for key in sorted(current.keys() - previous.keys()):
+        changes.append({'op': 'added', 'posting_id': key, 'record': current[key]})
+    for key in sorted(current.keys() & previous.keys()):
+        old, new = previous[key], current[key]
+        if old != new:
+            fields = {field: new.get(field) for field in old.keys() | new.keys() if old.get(field) != new.get(field)}
+            changes.append({'op': 'changed', 'posting_id': key, 'fields': fields})
+    for key in sorted(previous.keys() - current.keys()):
+        changes.append({'op': 'removed', 'posting_id': key})
+    return changes
+
+def apply_changes(records: Dict[str, Dict], changes: Iterable[Dict]) -> Dict[str, Dict]:
+    """Apply delta changes to a snapshot in place and return it"""
+    for change in changes:
+        key = change['posting_id']
+        if change['op'] == 'added':
+            records[key] = change['record']
+        elif change['op'] == 'changed':
+            record = dict(records[key])
+            for field, value in change['fields'].items():
+                if value is None:
+                    record.pop(field, None)
+                else:
+                    record[field] = value
+            records[key] = record
+        else:
+            records.pop(key, None)
+    return records
+
+def _read_lines(path: str) -> Iterable[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def snapshot_at(date: Optional[str] = None, directory: str = HISTORY_DIR,
+                snapshots: Optional[List[Dict]] = None) -> Optional[Dict[str, Dict]]:
+    """Rebuild the postings as of a YYYY-MM-DD date (default: the latest), keyed by posting_id
+
+    Returns None when the history starts after that date.
+    """
+    snapshots = read_index(directory) if snapshots is None else snapshots
+    chain = [entry for entry in snapshots if date is None or entry['date'] <= date]
+    if not chain:
+        return None
+    base = chain[-1]['base']
+    records = {record['posting_id']: record
+               for record in _read_lines(os.path.join(directory, f"base-{base}.jsonl"))}
+    for entry in chain:
+        if entry['kind'] == 'delta' and entry['base'] == base:
+            apply_changes(records, _read_lines(os.path.join(directory, entry['file'])))
+    return records
+
+def frame_at(date: Optional[str] = None, directory: str = HISTORY_DIR):
+    """The postings as of a date as a DataFrame, or None before the history starts"""
+    import pandas as pd
+    records = snapshot_at(date, directory)
+    return None if records is None else pd.DataFrame(list(records.values()))
+
+def record_snapshot(rows: Iterable[Dict], date: Optional[str] = None, directory: str = HISTORY_DIR,
+                    compact: bool = False) -> Dict:
+    """Add the current postings to the history as a delta, or as a new base every COMPACT_EVERY deltas
+
+    A second run on the same date replaces that date's entry. Returns the index entry.
+    """
+    date = date or time.strftime('%Y-%m-%d', time.gmtime())
+    os.makedirs(directory, exist_ok=True)
+    snapshots = read_index(directory)
+    if snapshots and snapshots[-1]['date'] > date:
+        raise ValueError(f"History already has {snapshots[-1]['date']}, cannot add {date}")
+    if snapshots and snapshots[-1]['date'] == date:
+        replaced = snapshots.pop()
+    else:
+        replaced = None
+
+    current = {}
+    for row in rows:
+        record = _record(row)
+        current[record['posting_id']] = record
+    previous = snapshot_at(directory=directory, snapshots=snapshots)
+    deltas_since_base = sum(1 for entry in snapshots if entry['kind'] == 'delta' and entry['base'] == snapshots[-1]['base']) \
+        if snapshots else 0
+
+    if previous is None or compact or deltas_since_base >= COMPACT_EVERY:
+        file = f"base-{date}.jsonl"
+        entry = {'date': date, 'kind': 'base', 'base': date, 'file': file, 'rows': len(current)}
+        lines = (_line(current[key]) for key in sorted(current))
+    else:
+        changes = diff_records(previous, current)
+        file = f"delta-{date}.jsonl"
+        entry = {'date': date, 'kind': 'delta', 'base': snapshots[-1]['base'], 'file': file, 'rows': len(current)}
+        for op in ('added', 'changed', 'removed'):
+            entry[op] = sum(1 for change in changes if change['op'] == op)
+        lines = (_line(change) for change in changes)
+    _write_atomic(os.path.join(directory, file), lambda f: f.writelines(lines), 'w', encoding='utf-8')
+
+    # The index is swapped in last, so readers never see an entry without its file
+    _write_index(snapshots + [entry], directory)
+    if replaced and replaced['file'] != file:
+        os.remove(os.path.join(directory, replaced['file']))
+
+    if entry['kind'] == 'base':
+        print(f"🗂️  History base for {date}: {entry['rows']} postings ({directory}/{file})")
+    else:
+        print(f"🗂️  History delta for {date}: +{entry['added']} ~{entry['changed']} -{entry['removed']} "
+              f"({directory}/{file})")
+    return entry
+
+def record_store_snapshot(store: JobStore, date: Optional[str] = None, directory: str = HISTORY_DIR,
+                          compact: bool = False) -> Dict:
+    """Add the store's current postings and extracted fields to the history"""
+    return record_snapshot(store.current_records(), date, directory, compact)
+
+def benchmark(n: int = 100_000, days: int = 30, churn: float = 0.02) -> Dict[str, float]:
+    """Compare a month of daily full copies with a base plus daily deltas on synthetic postings"""
+    from records import _synthetic_rows
+
+    rows = [dict(extracted, posting_id=f"{i:07d}", url=url, bedrijf=bedrijf, solliciteren=solliciteren)
+            for i, (url, bedrijf, solliciteren, extracted) in enumerate(_synthetic_rows(n))]
+    results = {'full_mb': 0.0, 'delta_mb': 0.0}
+    with tempfile.TemporaryDirectory() as tmp:
+        next_id = n
+        for day in range(days):
+            date = f"2000-01-{day + 1:02d}"
+            results['full_mb'] += sum(len(_line(_record(row)).encode('utf-8')) for row in rows) / 2**20
+            with contextlib.redirect_stdout(None):
+                record_snapshot(rows, date, tmp)
+            # Some postings close, some new ones appear and some are edited
+            step = max(int(1 / churn), 1)
+            rows = [row for i, row in enumerate(rows) if i % step != day % step]
+            for row in rows[day % step::step]:
+                row['contact_person'] = f"Contact {day}"
+            while len(rows) < n:
+                rows.append(dict(rows[next_id % len(rows)], posting_id=f"{next_id:07d}"))
+                next_id += 1
+        results['delta_mb'] = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp)) / 2**20
+
+        start = time.perf_counter()
+        records = snapshot_at(f"2000-01-{days:02d}", tmp)
+        results['rebuild_seconds'] = time.perf_counter() - start
+        results['rows'] = len(records)
+    return results
+
+def main(argv: Optional[List[str]] = None):
+    """Record today's snapshot from the job store, or rebuild the snapshot of a past date"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help=f"Job store to record (default: {DEFAULT_DB_PATH})")
+    parser.add_argument('--compact', action='store_true', help="Write a full base instead of a delta")
+    parser.add_argument('--at', metavar='YYYY-MM-DD', default=None, help="Rebuild the postings as of this date")
+    parser.add_argument('--out', default=None, help="CSV file for the rebuilt snapshot (default: print a summary)")
+    parser.add_argument('--benchmark', type=int, metavar='N', default=None,
+                        help="Compare daily full copies with deltas for N synthetic postings")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        results = benchmark(args.benchmark)
+        print(f"📊 {args.benchmark} postings over 30 days: {results['full_mb']:.1f} MiB of full copies, "
+              f"{results['delta_mb']:.1f} MiB of base + deltas; rebuilt the last day in {results['rebuild_seconds']:.2f}s")
+        return
+
+    if args.at or args.out:
+        records = snapshot_at(args.at)
+        if records is None:
+            print(f"❌ No history on or before {args.at}")
+            return
+        print(f"📅 {args.at or 'Latest'}: {len(records)} postings")
+        if args.out:
+            import pandas as pd
+            from snapshots import write_csv_atomic
+            write_csv_atomic(pd.DataFrame(list(records.values())), args.out)
+            print(f"✅ Saved to {args.out}")
+        return
+
+    if not store_exists(args.db):
+        print(f"❌ No job store at {args.db}. Run 'python jot.py run' first")
+        return
+    with JobStore(args.db, readonly=True) as store:
+        record_store_snapshot(store, compact=args.compact)
+
+if __name__ == "__main__":
+    main()
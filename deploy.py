@@ -2,6 +2,7 @@
 """
 Deployment script for JobOnTop.be scraper
 Handles the complete workflow: scraping -> AI extraction -> UI launch
+Postings and extracted fields are kept in the SQLite job store (jobs.db)
 """
 
 import os
@@ -10,150 +11,288 @@ import time
 import subprocess
 from pathlib import Path
 
-def check_dependencies():
-    """Check if required packages are installed"""
-    required_packages = ["requests", "beautifulsoup4", "pandas", "streamlit", "plotly"]
-    missing_packages = []
+# pip package -> module it installs
+REQUIRED_PACKAGES = {
+    "requests": "requests",
+    "beautifulsoup4": "bs4",
+    "pandas": "pandas",
+    "streamlit": "streamlit",
+    "plotly": "plotly",
+}
+
+# An unchanged job list is relisted from the job store for at most this long after the
+# last full scrape; then every page is fetched again, so postings edited in place show up
+RELIST_MAX_AGE_DAYS = 7
+
+def check_dependencies(packages=None):
+    """Check that required packages are installed, without importing or installing them
     
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    Returns the list of missing pip packages.
+    """
+    import importlib.util
+    packages = packages or list(REQUIRED_PACKAGES)
+    missing_packages = [package for package in packages
+                        if importlib.util.find_spec(REQUIRED_PACKAGES.get(package, package)) is None]
     
     if missing_packages:
-        print(f"⚠️  Missing packages: {", ".join(missing_packages)}")
-        print("Installing missing packages...")
-        for package in missing_packages:
-            subprocess.run([sys.executable, "-m", "pip", "install", package])
+        print(f"⚠️  Missing packages: {', '.join(missing_packages)}")
+        print("💡 Install them with: pip install -r requirements.txt")
     else:
         print("✅ All dependencies are installed")
+    return missing_packages
 
 def run_scraper():
-    """Run the job scraper"""
+    """Run the job scraper and store the postings"""
     print("🕷️  Starting job scraper...")
     try:
         from job_scraper import JobScraper
-        scraper = JobScraper()
-        job_data = scraper.scrape_all_jobs()
-        
-        if job_data:
-            # Save to a timestamped file to avoid permission issues
-            import pandas as pd
-            df = pd.DataFrame(job_data)
-            timestamp = int(time.time())
-            filename = f"job_scraping_results_{timestamp}.csv"
-            df.to_csv(filename, index=False, encoding="utf-8")
-            print(f"✅ Scraped {len(job_data)} jobs and saved to {filename}")
-            return filename
-        else:
-            print("❌ No job data was scraped")
-            return None
+        from job_store import JobStore
+        from snapshots import publish_snapshots
+        
+        with JobStore() as store:
+            run_id = store.start_run("scrape")
+            scraper = JobScraper()
+            job_data = scraper.scrape_all_jobs()
+            
+            if job_data:
+                store.upsert_postings(job_data, run_id)
+                store.finish_run(run_id, len(job_data))
+                publish_snapshots(store)
+                print(f"✅ Scraped {len(job_data)} jobs and saved them to {store.path} (run {run_id})")
+                return job_data
+            else:
+                store.finish_run(run_id, 0, status="failed")
+                print("❌ No job data was scraped")
+                return None
     except Exception as e:
         print(f"❌ Error during scraping: {e}")
         return None
 
-def run_ai_extraction(input_file):
-    """Run AI extraction on scraped data"""
+def run_ai_extraction(input_file=None):
+    """Run AI extraction on scraped data
+    
+    Without an input file, extracts the stored postings that have no structured
+    fields yet or were extracted by an older extractor version.
+    """
     print("🤖 Starting AI data extraction...")
     try:
         import pandas as pd
         from data_extractor import JobDataExtractor
+        from company_index import CompanyIndex
+        from near_duplicates import NearDuplicateIndex
+        from job_store import JobStore
+        from snapshots import publish_snapshots
         
-        # Load data
-        df = pd.read_csv(input_file)
-        
-        # Extract structured data
         extractor = JobDataExtractor()
-        structured_df = extractor.extract_structured_data(df)
-        
-        # Save structured data
-        timestamp = int(time.time())
-        output_file = f"job_data_structured_{timestamp}.csv"
-        structured_df.to_csv(output_file, index=False, encoding="utf-8")
+        with JobStore() as store:
+            # Load data
+            if input_file:
+                df = pd.read_csv(input_file)
+                store.upsert_postings(df)
+            else:
+                df = pd.DataFrame(store.get_postings(store.unextracted_or_stale(extractor.VERSION)))
+                if df.empty:
+                    print("✅ All stored postings are already extracted with the current extractor")
+                    return store.structured_frame(current_only=True)
+            
+            # Extract structured data, reusing company data from earlier runs
+            run_id = store.start_run("extract", extractor.VERSION)
+            company_index = CompanyIndex()
+            dedup_index = NearDuplicateIndex()
+            structured_df = extractor.extract_structured_data(df, company_index=company_index, dedup_index=dedup_index)
+            company_index.save()
+            dedup_index.save()
+            print(f"🏢 Company index: {len(company_index)} companies, {company_index.hits} postings reused cached data")
+            print(f"🔁 Near-duplicates: {(structured_df['duplicate_of'] != '').sum()} reposts flagged")
+            
+            store.upsert_structured(structured_df, run_id)
+            store.finish_run(run_id, len(structured_df))
+            publish_snapshots(store)
         
-        print(f"✅ AI extraction completed and saved to {output_file}")
+        print(f"✅ AI extraction completed for {len(structured_df)} jobs and saved to {store.path}")
         
         # Display summary
         print("\n=== EXTRACTION SUMMARY ===")
-        print(f"Company names extracted: {structured_df["company_name"].notna().sum()}")
-        print(f"Locations extracted: {structured_df["location"].notna().sum()}")
-        print(f"Contact persons extracted: {structured_df["contact_person"].notna().sum()}")
-        print(f"Email addresses extracted: {(structured_df["email_addresses"] != "").sum()}")
-        print(f"Phone numbers extracted: {(structured_df["phone_numbers"] != "").sum()}")
-        print(f"Addresses extracted: {structured_df["address"].notna().sum()}")
+        print(f"Company names extracted: {structured_df['company_name'].notna().sum()}")
+        print(f"Locations extracted: {structured_df['location'].notna().sum()}")
+        print(f"Contact persons extracted: {structured_df['contact_person'].notna().sum()}")
+        print(f"Email addresses extracted: {(structured_df['email_addresses'] != '').sum()}")
+        print(f"Phone numbers extracted: {(structured_df['phone_numbers'] != '').sum()}")
+        print(f"Addresses extracted: {structured_df['address'].notna().sum()}")
         
-        return output_file
+        return structured_df
         
     except Exception as e:
         print(f"❌ Error during AI extraction: {e}")
         return None
 
-def create_simple_viewer(structured_file):
-    """Create a simple HTML viewer with the actual data"""
+def create_simple_viewer(structured_file=None, structured_df=None):
+    """Create a simple HTML viewer with the actual data
+    
+    Uses the given structured DataFrame or CSV, otherwise the current postings in the job store.
+    The rows are written as chunk files next to the static job_results.html, which loads them
+    as the user scrolls.
+    """
     print("📄 Creating HTML viewer...")
     try:
-        import pandas as pd
+        import csv
+        from job_store import JobStore
+        from html_viewer import VIEWER_HTML, VIEWER_DATA_DIR, write_viewer_data
         
-        # Load structured data
-        df = pd.read_csv(structured_file)
-        
-        # Convert to JavaScript data
-        jobs_data = []
-        for _, row in df.iterrows():
-            job = {
-                "company_name": str(row.get("company_name", "")),
-                "location": str(row.get("location", "")),
-                "contact_person": str(row.get("contact_person", "")),
-                "email_addresses": str(row.get("email_addresses", "")),
-                "phone_numbers": str(row.get("phone_numbers", "")),
-                "address": str(row.get("address", "")),
-                "url": str(row.get("url", ""))
-            }
-            jobs_data.append(job)
-        
-        # Generate JavaScript array
-        js_data = "const jobsData = [\n"
-        for job in jobs_data:
-            js_data += "    {\n"
-            for key, value in job.items():
-                # Escape quotes in values
-                escaped_value = value.replace("\"", "\\\"").replace("\n", "\\n")
-                js_data += f"        {key}: \"{escaped_value}\",\n"
-            js_data += "    },\n"
-        js_data += "];\n"
-        
-        # Read the HTML template and replace the data
-        html_file = "job_results.html"
-        if os.path.exists(html_file):
-            with open(html_file, "r", encoding="utf-8") as f:
-                html_content = f.read()
-            
-            # Replace the sample data with actual data
-            start_marker = "const jobsData = ["
-            end_marker = "];"
-            
-            start_idx = html_content.find(start_marker)
-            if start_idx != -1:
-                end_idx = html_content.find(end_marker, start_idx) + len(end_marker)
-                new_html = html_content[:start_idx] + js_data + html_content[end_idx:]
-                
-                # Save updated HTML
-                timestamp = int(time.time())
-                new_html_file = f"job_results_live_{timestamp}.html"
-                with open(new_html_file, "w", encoding="utf-8") as f:
-                    f.write(new_html)
-                
-                print(f"✅ Live HTML viewer created: {new_html_file}")
-                return new_html_file
-        
-        print("❌ Could not update HTML viewer")
-        return None
+        if not os.path.exists(VIEWER_HTML):
+            print(f"❌ Viewer page {VIEWER_HTML} not found")
+            return None
+        
+        # Stream structured data as plain rows, so regenerating the viewer does not need pandas
+        if structured_df is not None:
+            manifest = write_viewer_data(structured_df.to_dict("records"))
+        elif structured_file:
+            with open(structured_file, "r", encoding="utf-8", newline="") as f:
+                manifest = write_viewer_data(csv.DictReader(f))
+        else:
+            with JobStore(readonly=True) as store:
+                manifest = write_viewer_data(store.structured_rows(current_only=True))
+        
+        print(f"✅ HTML viewer updated: {VIEWER_HTML} ({manifest['total']} jobs in {manifest['chunks']} chunks under {VIEWER_DATA_DIR}/)")
+        return VIEWER_HTML
         
     except Exception as e:
         print(f"❌ Error creating HTML viewer: {e}")
         return None
 
+def scrape_age_days(saved):
+    """Days since the scrape stage last fetched every page, from its saved pipeline state"""
+    import calendar
+    finished_at = saved.get("finished_at")
+    if not finished_at:
+        return float("inf")
+    return (time.time() - calendar.timegm(time.strptime(finished_at, "%Y-%m-%dT%H:%M:%SZ"))) / 86400
+
+def build_pipeline(store, create_viewer=False):
+    """Declare the stages of a full run: links -> scrape -> extract -> publish -> changes -> history (-> viewer)
+    
+    Scraped postings stream straight into the extractor, and a run whose job
+    list and postings match the last one relists them from the job store
+    instead of fetching and extracting every page again. Edits to a posting
+    whose URL did not change are only seen by a fetch, so relisting stops
+    RELIST_MAX_AGE_DAYS after the last full scrape.
+    """
+    from job_scraper import JobScraper
+    from data_extractor import JobDataExtractor
+    from company_index import CompanyIndex
+    from near_duplicates import NearDuplicateIndex
+    from records import JobPosting, posting_id
+    from job_store import JobStore
+    from snapshots import publish_snapshots, read_manifest
+    from deltas import record_store_snapshot
+    from change_feed import record_store_changes
+    from pipeline import Pipeline, Stage
+    
+    scraper = JobScraper()
+    extractor = JobDataExtractor()
+    
+    def list_links():
+        return scraper.get_job_links() or None
+    
+    def scrape(links):
+        # Runs in the pipeline's producer thread, so it writes through its own connection
+        with JobStore(store.path) as scrape_store:
+            run_id = scrape_store.start_run("scrape")
+            postings = []
+            for posting in scraper.iter_job_details(links):
+                postings.append(posting)
+                yield posting
+            scrape_store.upsert_postings(postings, run_id)
+            scrape_store.finish_run(run_id, len(postings))
+        print(f"✅ Scraped {len(postings)} jobs and saved them to {store.path} (run {run_id})")
+    
+    def relist_postings(saved, links):
+        # The job list is unchanged: mark the stored postings as seen again instead of refetching them
+        if scrape_age_days(saved) >= RELIST_MAX_AGE_DAYS:
+            print(f"🔄 Last full scrape is over {RELIST_MAX_AGE_DAYS} days old, fetching every page again")
+            return None
+        rows = store.get_postings(list(dict.fromkeys(posting_id(url) for url in links)))
+        if len(rows) < len(set(links)):
+            return None
+        run_id = store.start_run("scrape")
+        store.upsert_postings(rows, run_id)
+        store.finish_run(run_id, len(rows))
+        return [JobPosting.from_dict(row) for row in rows]
+    
+    def extract(postings):
+        run_id = store.start_run("extract", extractor.VERSION)
+        company_index = CompanyIndex()
+        dedup_index = NearDuplicateIndex()
+        structured_df = extractor.extract_structured_data(postings, company_index=company_index, dedup_index=dedup_index)
+        company_index.save()
+        dedup_index.save()
+        store.upsert_structured(structured_df, run_id)
+        store.finish_run(run_id, len(structured_df))
+        print(f"✅ AI extraction completed for {len(structured_df)} jobs "
+              f"({company_index.hits} reused cached company data, {(structured_df['duplicate_of'] != '').sum()} reposts)")
+        return store.structured_frame(current_only=True)
+    
+    def stored_structured(saved, postings):
+        structured_df = store.structured_frame(current_only=True)
+        return structured_df if not structured_df.empty else None
+    
+    def publish(postings, structured_df):
+        manifest = publish_snapshots(store)
+        return manifest["version"] if manifest else None
+    
+    def current_version(saved, postings, structured_df):
+        manifest = read_manifest()
+        return manifest["version"] if manifest else None
+    
+    def changes(postings, structured_df):
+        # Diffs against the last history snapshot, so it has to run before today's is recorded
+        return record_store_changes(store)
+    
+    def no_changes(saved, postings, structured_df):
+        return 0
+    
+    def history(postings, structured_df):
+        return record_store_snapshot(store)["date"]
+    
+    def recorded_date(saved, postings, structured_df):
+        # Nothing changed since the last recorded snapshot, so that one still holds
+        return saved.get("output")
+    
+    def viewer(structured_df):
+        return create_simple_viewer(structured_df=structured_df)
+    
+    def existing_viewer(saved, structured_df):
+        return saved["output"] if saved.get("output") and os.path.exists(saved["output"]) else None
+    
+    stages = [
+        Stage("links", list_links),
+        Stage("scrape", scrape, inputs=["links"], output="postings", restore=relist_postings, streaming=True,
+              hash_fields=JobPosting.CONTENT_FIELDS),
+        Stage("extract", extract, inputs=["postings"], output="structured", restore=stored_structured,
+              version=extractor.VERSION),
+        Stage("publish", publish, inputs=["postings", "structured"], output="version", restore=current_version),
+        Stage("changes", changes, inputs=["postings", "structured"], output="change_events", restore=no_changes),
+        Stage("history", history, inputs=["postings", "structured"], output="history_date", restore=recorded_date),
+    ]
+    if create_viewer:
+        stages.append(Stage("viewer", viewer, inputs=["structured"], output="html_file", restore=existing_viewer))
+    return Pipeline(stages)
+
+def run_pipeline(create_viewer=False, force=False):
+    """Run the full workflow through the stage pipeline and return the stage outputs"""
+    print("🔗 Running pipeline...")
+    try:
+        from job_store import JobStore
+        
+        with JobStore() as store:
+            pipeline = build_pipeline(store, create_viewer)
+            values = pipeline.run(force=force)
+        pipeline.report()
+        return values
+    except Exception as e:
+        print(f"❌ Error during pipeline run: {e}")
+        return None
+
 def launch_viewer(html_file):
     """Launch the HTML viewer"""
     print(f"🚀 Launching viewer: {html_file}")
@@ -173,7 +312,8 @@ def main():
     print("=" * 50)
     
     # Check dependencies
-    check_dependencies()
+    if check_dependencies():
+        return
     
     # Check if running in a non-interactive environment (e.g., GitHub Actions)
     # or if a specific environment variable is set for automation
@@ -189,49 +329,42 @@ def main():
         choice = input("\nEnter your choice (1-3): ").strip()
     
     if choice == "1":
-        # Full workflow
+        # Full workflow; stages whose input did not change since the last run are skipped
         print("\n🚀 Starting full workflow...")
         
-        # Step 1: Scrape
-        scraped_file = run_scraper()
-        if not scraped_file:
-            print("❌ Scraping failed, aborting")
-            return
-        
-        # Step 2: AI Extract
-        structured_file = run_ai_extraction(scraped_file)
-        if not structured_file:
-            print("❌ AI extraction failed, aborting")
+        # Create the viewer only if not in GitHub Actions
+        automated = not sys.stdin.isatty() or os.environ.get("GITHUB_ACTIONS") == "true"
+        if automated:
+            print("Skipping HTML viewer creation in automated run.")
+        values = run_pipeline(create_viewer=not automated, force="--force" in sys.argv)
+        if values is None or "structured" not in values:
+            print("❌ Pipeline did not complete, aborting")
             return
         
-        # Step 3: Create viewer (only if not in GitHub Actions)
-        if not sys.stdin.isatty() or os.environ.get("GITHUB_ACTIONS") == "true":
-            print("Skipping HTML viewer creation in automated run.")
-        else:
-            html_file = create_simple_viewer(structured_file)
-            if html_file:
-                launch_viewer(html_file)
+        if values.get("html_file"):
+            launch_viewer(values["html_file"])
         
     elif choice == "2":
         # AI extraction on existing data
         print("\n🤖 Running AI extraction on existing data...")
         
-        # Look for existing scraped data
-        scraped_files = [f for f in os.listdir(".") if f.startswith("job_scraping_results") and f.endswith(".csv")]
-        if not scraped_files:
-            print("❌ No scraped data found. Run option 1 first.")
-            return
-        
-        # Use the most recent file
-        scraped_file = max(scraped_files, key=os.path.getctime)
-        print(f"Using: {scraped_file}")
+        # Use the job store, or import the most recent scraped CSV if there is none yet
+        from job_store import store_exists
+        scraped_file = None
+        if not store_exists():
+            scraped_files = [f for f in os.listdir(".") if f.startswith("job_scraping_results") and f.endswith(".csv")]
+            if not scraped_files:
+                print("❌ No scraped data found. Run option 1 first.")
+                return
+            scraped_file = max(scraped_files, key=os.path.getctime)
+            print(f"Using: {scraped_file}")
         
-        structured_file = run_ai_extraction(scraped_file)
-        if structured_file:
+        structured_df = run_ai_extraction(scraped_file)
+        if structured_df is not None:
             if not sys.stdin.isatty() or os.environ.get("GITHUB_ACTIONS") == "true":
                 print("Skipping HTML viewer creation in automated run.")
             else:
-                html_file = create_simple_viewer(structured_file)
+                html_file = create_simple_viewer()
                 if html_file:
                     launch_viewer(html_file)
     
@@ -239,12 +372,9 @@ def main():
         # Just launch existing viewer
         print("\n📄 Launching existing HTML viewer...")
         
-        # Look for HTML files
-        html_files = [f for f in os.listdir(".") if f.startswith("job_results") and f.endswith(".html")]
-        if html_files:
-            # Use the most recent
-            html_file = max(html_files, key=os.path.getctime)
-            launch_viewer(html_file)
+        from html_viewer import VIEWER_HTML, VIEWER_DATA_DIR
+        if os.path.exists(os.path.join(VIEWER_DATA_DIR, "manifest.js")):
+            launch_viewer(VIEWER_HTML)
         else:
             print("❌ No HTML viewer found. Run option 1 or 2 first.")
     
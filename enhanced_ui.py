@@ -1,12 +1,15 @@
 import streamlit as st
-import pandas as pd
 import re
-from job_scraper import JobScraper
-from data_extractor import JobDataExtractor
-import time
+from snapshots import load_frame, read_manifest, data_key, PREVIEW_COLUMNS
+from search_index import filter_postings
+from pagination import show_page
+from filters import FilterEngine
+from job_details import pick_job, posting_details, with_full_text
+from exports import show_export
+from aggregates import AGGREGATES_NAME, compute_aggregates, read_aggregates
+from scrape_worker import get_worker, show_progress
 import plotly.express as px
 import plotly.graph_objects as go
-from collections import Counter
 
 st.set_page_config(
     page_title="JobOnTop AI Scraper",
@@ -15,58 +18,46 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-@st.cache_data
-def load_raw_data():
-    """Load the scraped job data from CSV"""
-    try:
-        return pd.read_csv('job_scraping_results.csv')
-    except FileNotFoundError:
-        return None
+# Columns the dashboard uses; everything else stays on disk
+# Only the previews: the full text is looked up for the table page or posting on screen
+RAW_VIEW_COLUMNS = ['posting_id', 'url'] + [f"{column}_preview" for column in PREVIEW_COLUMNS]
+STRUCTURED_VIEW_COLUMNS = ['url', 'company_name', 'location', 'contact_person', 'email_addresses', 'phone_numbers', 'address']
 
-@st.cache_data
-def load_structured_data():
-    """Load the AI-extracted structured data from CSV"""
-    try:
-        return pd.read_csv('job_data_structured.csv')
-    except FileNotFoundError:
-        return None
+# Keyed by data_key(), so a publish only reloads the files whose checksum changed;
+# the previous entry is kept for sessions still showing the old version
+@st.cache_data(max_entries=2)
+def load_raw_data(key, _manifest=None):
+    """Load the scraped job data from the published snapshot, the store or the sample CSV"""
+    return load_frame('raw', RAW_VIEW_COLUMNS, manifest=_manifest)
+
+@st.cache_data(max_entries=2)
+def load_structured_data(key, _manifest=None):
+    """Load the AI-extracted structured data from the published snapshot, the store or the sample CSV"""
+    return load_frame('structured', STRUCTURED_VIEW_COLUMNS, manifest=_manifest)
+
+@st.cache_data(max_entries=2)
+def load_aggregates(key, _manifest=None):
+    """Analytics aggregates published with the snapshot, or computed once from the structured data"""
+    aggregates = read_aggregates(_manifest)
+    if aggregates is None:
+        structured = load_structured_data(data_key('structured', _manifest), _manifest)
+        aggregates = compute_aggregates(structured) if structured is not None else None
+    return aggregates
+
+@st.cache_resource(max_entries=2)
+def filter_engine(key, _structured):
+    """Filter engine of a structured data version, shared by every session"""
+    return FilterEngine(_structured)
 
 def run_scraper():
-    """Run the web scraper and return the data"""
-    with st.spinner('🕷️ Scraping job listings... This may take a while...'):
-        scraper = JobScraper()
-        job_data = scraper.scrape_all_jobs()
-        
-        if job_data:
-            # Save raw data
-            df = pd.DataFrame(job_data)
-            df.to_csv('job_scraping_results.csv', index=False, encoding='utf-8')
-            
-            # Extract structured data using AI
-            with st.spinner('🤖 Extracting structured data with AI...'):
-                extractor = JobDataExtractor()
-                structured_df = extractor.extract_structured_data(df)
-                structured_df.to_csv('job_data_structured.csv', index=False, encoding='utf-8')
-            
-            st.success(f"Successfully scraped and processed {len(job_data)} job listings!")
-            st.cache_data.clear()  # Clear cache to reload new data
-            return df, structured_df
-        else:
-            st.error("No job data was scraped.")
-            return None, None
+    """Start a full scrape and AI extraction on the background worker"""
+    job = get_worker().submit('scrape', extract=True)
+    st.toast(f"🕷️ Scrape job {job.job_id} is running in the background")
 
 def run_ai_extraction():
-    """Run AI extraction on existing raw data"""
-    raw_data = load_raw_data()
-    if raw_data is not None:
-        with st.spinner('🤖 Extracting structured data with AI...'):
-            extractor = JobDataExtractor()
-            structured_df = extractor.extract_structured_data(raw_data)
-            structured_df.to_csv('job_data_structured.csv', index=False, encoding='utf-8')
-            st.success("AI extraction completed!")
-            st.cache_data.clear()  # Clear cache to reload new data
-            return structured_df
-    return None
+    """Start AI extraction of the existing raw data on the background worker"""
+    job = get_worker().submit('extract')
+    st.toast(f"🤖 Extraction job {job.job_id} is running in the background")
 
 # Main UI
 st.title("🤖 JobOnTop.be AI-Powered Job Scraper")
@@ -79,17 +70,17 @@ st.sidebar.header("🎛️ Controls")
 col1, col2 = st.sidebar.columns(2)
 with col1:
     if st.button("🚀 Full Scrape", type="primary"):
-        raw_data, structured_data = run_scraper()
+        run_scraper()
 with col2:
     if st.button("🤖 AI Extract"):
-        structured_data = run_ai_extraction()
-        raw_data = load_raw_data()
+        run_ai_extraction()
+
+show_progress(get_worker())
 
-# Load data
-if 'raw_data' not in locals():
-    raw_data = load_raw_data()
-if 'structured_data' not in locals():
-    structured_data = load_structured_data()
+# Load data; one manifest read per rerun so both frames come from the same version
+manifest = read_manifest()
+raw_data = load_raw_data(data_key('raw', manifest), manifest)
+structured_data = load_structured_data(data_key('structured', manifest), manifest)
 
 # Check if we have data
 if raw_data is not None and not raw_data.empty:
@@ -112,59 +103,55 @@ if raw_data is not None and not raw_data.empty:
     solliciteren_search = st.sidebar.text_input("Search in Application Info")
     url_filter = st.sidebar.text_input("Filter by URL keyword")
     
-    # Apply filters to raw data
-    filtered_raw_data = raw_data.copy()
-    if bedrijf_search:
-        filtered_raw_data = filtered_raw_data[filtered_raw_data['bedrijf'].str.contains(bedrijf_search, case=False, na=False)]
-    if solliciteren_search:
-        filtered_raw_data = filtered_raw_data[filtered_raw_data['solliciteren'].str.contains(solliciteren_search, case=False, na=False)]
-    if url_filter:
-        filtered_raw_data = filtered_raw_data[filtered_raw_data['url'].str.contains(url_filter, case=False, na=False)]
+    # Apply filters to raw data through the full-text index
+    filtered_raw_data = filter_postings(raw_data, manifest, bedrijf=bedrijf_search, solliciteren=solliciteren_search, url=url_filter)
     
     # Analytics Dashboard Tab
     if structured_data is not None and not structured_data.empty:
         with tab1:
             st.header("📊 Job Market Analytics")
             
-            # Summary metrics
+            # Summary metrics, from the aggregates published with the snapshot
+            aggregates = load_aggregates(data_key(AGGREGATES_NAME, manifest), manifest)
+            coverage = aggregates['coverage']
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Total Jobs", len(structured_data))
+                st.metric("Total Jobs", aggregates['total'])
             with col2:
-                companies_found = structured_data['company_name'].notna().sum()
-                st.metric("Companies Identified", companies_found)
+                st.metric("Companies Identified", coverage['company_name'])
             with col3:
-                locations_found = structured_data['location'].notna().sum()
-                st.metric("Locations Found", locations_found)
+                st.metric("Locations Found", coverage['location'])
             with col4:
-                contacts_found = structured_data['contact_person'].notna().sum()
-                st.metric("Contact Persons", contacts_found)
+                st.metric("Contact Persons", coverage['contact_person'])
             
             # Charts
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("📍 Jobs by Location")
-                location_counts = structured_data['location'].value_counts().head(10)
-                if not location_counts.empty:
+                if aggregates['locations']['top']:
+                    locations, counts = zip(*aggregates['locations']['top'])
                     fig = px.bar(
-                        x=location_counts.values,
-                        y=location_counts.index,
+                        x=counts,
+                        y=locations,
                         orientation='h',
                         title="Top 10 Job Locations"
                     )
                     fig.update_layout(height=400)
                     st.plotly_chart(fig, use_container_width=True)
+                    if aggregates['locations']['other']:
+                        st.caption(f"+ {aggregates['locations']['other']} jobs in "
+                                   f"{aggregates['locations']['distinct'] - len(aggregates['locations']['top'])} other locations")
                 else:
                     st.info("No location data available for visualization")
             
             with col2:
                 st.subheader("📧 Contact Information Availability")
                 contact_data = {
-                    'Email': (structured_data['email_addresses'] != '').sum(),
-                    'Phone': (structured_data['phone_numbers'] != '').sum(),
-                    'Address': structured_data['address'].notna().sum(),
-                    'Contact Person': structured_data['contact_person'].notna().sum()
+                    'Email': coverage['email_addresses'],
+                    'Phone': coverage['phone_numbers'],
+                    'Address': coverage['address'],
+                    'Contact Person': coverage['contact_person']
                 }
                 
                 fig = px.bar(
@@ -174,6 +161,13 @@ if raw_data is not None and not raw_data.empty:
                 )
                 fig.update_layout(height=400)
                 st.plotly_chart(fig, use_container_width=True)
+            
+            if aggregates['companies_per_location']['top']:
+                st.subheader("🏢 Companies per Location")
+                locations, companies = zip(*aggregates['companies_per_location']['top'])
+                fig = px.bar(x=locations, y=companies, labels={'x': 'Location', 'y': 'Distinct companies'})
+                fig.update_layout(height=350)
+                st.plotly_chart(fig, use_container_width=True)
         
         # Structured Data Tab
         with tab2:
@@ -183,12 +177,10 @@ if raw_data is not None and not raw_data.empty:
             st.subheader("🔍 Advanced Filters")
             col1, col2, col3 = st.columns(3)
             
+            engine = filter_engine(data_key('structured', manifest), structured_data)
             with col1:
                 company_filter = st.text_input("Company Name")
-                location_filter = st.selectbox(
-                    "Location", 
-                    ["All"] + sorted(structured_data['location'].dropna().unique())
-                )
+                location_filter = st.selectbox("Location", ["All"] + engine.locations)
             
             with col2:
                 has_email = st.checkbox("Has Email")
@@ -198,38 +190,10 @@ if raw_data is not None and not raw_data.empty:
                 has_contact = st.checkbox("Has Contact Person")
                 has_address = st.checkbox("Has Address")
             
-            # Apply structured data filters
-            filtered_structured = structured_data.copy()
-            
-            if company_filter:
-                filtered_structured = filtered_structured[
-                    filtered_structured['company_name'].str.contains(company_filter, case=False, na=False)
-                ]
-            
-            if location_filter != "All":
-                filtered_structured = filtered_structured[
-                    filtered_structured['location'] == location_filter
-                ]
-            
-            if has_email:
-                filtered_structured = filtered_structured[
-                    filtered_structured['email_addresses'] != ''
-                ]
-            
-            if has_phone:
-                filtered_structured = filtered_structured[
-                    filtered_structured['phone_numbers'] != ''
-                ]
-            
-            if has_contact:
-                filtered_structured = filtered_structured[
-                    filtered_structured['contact_person'].notna()
-                ]
-            
-            if has_address:
-                filtered_structured = filtered_structured[
-                    filtered_structured['address'].notna()
-                ]
+            # Apply structured data filters as one precomputed mask
+            flags = [flag for flag, checked in (('email', has_email), ('phone', has_phone),
+                                                ('contact', has_contact), ('address', has_address)) if checked]
+            filtered_structured = engine.filter(company_filter, [] if location_filter == "All" else [location_filter], flags)
             
             st.info(f"Showing {len(filtered_structured)} of {len(structured_data)} jobs")
             
@@ -239,9 +203,8 @@ if raw_data is not None and not raw_data.empty:
                 'email_addresses', 'phone_numbers', 'address'
             ]
             
-            st.dataframe(
-                filtered_structured[display_columns],
-                use_container_width=True,
+            show_page(
+                filtered_structured, "structured", display_columns,
                 column_config={
                     "company_name": "Company",
                     "location": "Location",
@@ -265,25 +228,24 @@ if raw_data is not None and not raw_data.empty:
         with col1:
             st.metric("Total Jobs", len(raw_data))
         with col2:
-            bedrijf_filled = raw_data['bedrijf'].str.len() > 0
+            bedrijf_filled = raw_data['bedrijf_preview'].str.len() > 0
             st.metric("Jobs with Company Info", bedrijf_filled.sum())
         with col3:
-            solliciteren_filled = raw_data['solliciteren'].str.len() > 0
+            solliciteren_filled = raw_data['solliciteren_preview'].str.len() > 0
             st.metric("Jobs with Application Info", solliciteren_filled.sum())
         
         if len(filtered_raw_data) != len(raw_data):
             st.info(f"Showing {len(filtered_raw_data)} of {len(raw_data)} jobs (filtered)")
         
-        # Display options
-        show_full_text = st.checkbox("Show full text (may be slow for large datasets)")
+        # Display options; either way only the current page is sent to the browser
+        show_full_text = st.checkbox("Show full text")
         
         if not show_full_text:
-            display_data = filtered_raw_data.copy()
-            display_data['bedrijf'] = display_data['bedrijf'].str[:200] + "..."
-            display_data['solliciteren'] = display_data['solliciteren'].str[:200] + "..."
-            st.dataframe(display_data, use_container_width=True)
+            show_page(filtered_raw_data, "raw", ['posting_id', 'url', 'bedrijf_preview', 'solliciteren_preview'],
+                      column_config={"bedrijf_preview": "bedrijf", "solliciteren_preview": "solliciteren"})
         else:
-            st.dataframe(filtered_raw_data, use_container_width=True)
+            show_page(filtered_raw_data, "raw", ['posting_id', 'url', 'bedrijf', 'solliciteren'],
+                      prepare=lambda rows: with_full_text(rows, manifest))
     
     # Job Details Tab
     if structured_data is not None and not structured_data.empty:
@@ -295,40 +257,32 @@ if raw_data is not None and not raw_data.empty:
         st.header("🔍 Detailed Job View")
         
         if len(filtered_raw_data) > 0:
-            # Job selector
-            job_urls = filtered_raw_data['url'].tolist()
-            selected_job_idx = st.selectbox(
-                "Select a job to view details:",
-                range(len(job_urls)),
-                format_func=lambda x: f"Job {x+1}: {job_urls[x].split('/')[-1]}"
-            )
+            # Job selector, one page of the filtered jobs at a time
+            selected_row = pick_job(filtered_raw_data, "details")
             
-            if selected_job_idx is not None:
-                selected_job = filtered_raw_data.iloc[selected_job_idx]
+            if selected_row is not None:
+                # Full text and extracted fields of this posting only, looked up by posting_id
+                selected_job, structured_job = posting_details(selected_row, manifest, structured_data)
                 
                 st.markdown(f"### Job Details")
                 st.markdown(f"**URL:** [{selected_job['url']}]({selected_job['url']})")
                 
                 # Show structured data if available
-                if structured_data is not None:
-                    structured_job = structured_data[structured_data['url'] == selected_job['url']]
-                    if not structured_job.empty:
-                        structured_job = structured_job.iloc[0]
-                        
-                        st.markdown("#### 🤖 AI-Extracted Information")
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.write(f"**Company:** {structured_job.get('company_name', 'N/A')}")
-                            st.write(f"**Location:** {structured_job.get('location', 'N/A')}")
-                            st.write(f"**Contact Person:** {structured_job.get('contact_person', 'N/A')}")
-                        
-                        with col2:
-                            st.write(f"**Email:** {structured_job.get('email_addresses', 'N/A')}")
-                            st.write(f"**Phone:** {structured_job.get('phone_numbers', 'N/A')}")
-                            st.write(f"**Address:** {structured_job.get('address', 'N/A')}")
-                        
-                        st.markdown("---")
+                if structured_job is not None:
+                    st.markdown("#### 🤖 AI-Extracted Information")
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        st.write(f"**Company:** {structured_job.get('company_name', 'N/A')}")
+                        st.write(f"**Location:** {structured_job.get('location', 'N/A')}")
+                        st.write(f"**Contact Person:** {structured_job.get('contact_person', 'N/A')}")
+                    
+                    with col2:
+                        st.write(f"**Email:** {structured_job.get('email_addresses', 'N/A')}")
+                        st.write(f"**Phone:** {structured_job.get('phone_numbers', 'N/A')}")
+                        st.write(f"**Address:** {structured_job.get('address', 'N/A')}")
+                    
+                    st.markdown("---")
                 
                 # Show original text
                 col1, col2 = st.columns(2)
@@ -362,27 +316,17 @@ if raw_data is not None and not raw_data.empty:
         
         with col1:
             st.subheader("Raw Data Export")
-            if st.button("📥 Download Raw Data as CSV"):
-                csv = filtered_raw_data.to_csv(index=False)
-                st.download_button(
-                    label="💾 Download Raw CSV",
-                    data=csv,
-                    file_name=f"jobontop_raw_data_{time.strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+            # Written chunk by chunk to a file that Streamlit serves from disk
+            show_export('raw', "export_raw", ['posting_id', 'url', 'bedrijf', 'solliciteren'],
+                        None if len(filtered_raw_data) == len(raw_data) else {'url': filtered_raw_data['url']},
+                        label="📥 Export Raw Data", manifest=manifest)
             st.write(f"- Total jobs: {len(filtered_raw_data)}")
         
         with col2:
             if structured_data is not None:
                 st.subheader("Structured Data Export")
-                if st.button("📥 Download Structured Data as CSV"):
-                    csv = structured_data.to_csv(index=False)
-                    st.download_button(
-                        label="💾 Download Structured CSV",
-                        data=csv,
-                        file_name=f"jobontop_structured_data_{time.strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv"
-                    )
+                show_export('structured', "export_structured", ['posting_id'] + STRUCTURED_VIEW_COLUMNS,
+                            label="📥 Export Structured Data", manifest=manifest)
                 st.write(f"- Total jobs: {len(structured_data)}")
             else:
                 st.info("Run AI extraction first to enable structured data export")
@@ -391,7 +335,7 @@ else:
     st.warning("No job data available. Click 'Full Scrape' to start scraping job listings.")
     
     if st.button("🚀 Start Scraping", type="primary"):
-        raw_data, structured_data = run_scraper()
+        run_scraper()
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Chunked exports of the postings as CSV, JSONL, Parquet or XLSX files
+Rows are read a chunk at a time from the published snapshot, the job store
+or the sample CSV, with only the requested columns and rows, and appended
+to the export file, so exporting a few hundred thousand postings holds one
+chunk in memory instead of the whole table and its text rendering. The
+dashboards write exports to static/exports/ and link to the file, which
+Streamlit serves from disk (server.enableStaticServing in .streamlit/config.toml).
+That directory is public, so every export gets a random, unguessable name.
+"""
+
+import os
+import json
+import time
+import uuid
+import argparse
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from job_store import DEFAULT_DB_PATH, POSTING_COLUMNS, STRUCTURED_COLUMNS, JobStore, store_exists
+from snapshots import (RAW_CSV_PATH, STRUCTURED_CSV_PATH, _write_atomic, parquet_available, read_manifest,
+                       snapshot_path)
+
+# Streamlit serves static/ next to the app scripts, whatever the working directory
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'exports')
+CHUNK_ROWS = 20_000
+
+# A session's previous export is removed when it writes a new one; exports other
+# sessions may still link to are only removed once they are this old
+EXPORT_TTL_SECONDS = 24 * 3600
+
+# Format -> (file extension, MIME type, module it needs)
+FORMATS = {
+    'csv': ('.csv', 'text/csv', None),
+    'jsonl': ('.jsonl', 'application/x-ndjson', None),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet', 'pyarrow'),
+    'xlsx': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'openpyxl'),
+}
+
+def available_formats() -> List[str]:
+    """Export formats whose writer library is installed (XLSX needs openpyxl, Parquet pyarrow)"""
+    import importlib.util
+    return [name for name, (_, _, module) in FORMATS.items() if module is None or importlib.util.find_spec(module)]
+
+def iter_chunks(kind: str = 'raw', columns: Optional[List[str]] = None, filters: Optional[Dict[str, Iterable]] = None,
+                chunk_rows: int = CHUNK_ROWS, db_path: str = DEFAULT_DB_PATH, manifest: Optional[Dict] = None,
+                csv_path: Optional[str] = None) -> Iterator:
+    """Yield frames of at most chunk_rows rows from the same source load_frame reads
+
+    Only the given columns are read. filters maps a column to the values to keep,
+    e.g. {'url': urls} for the rows a dashboard filter left. csv_path overrides
+    the CSV file read when there is neither a snapshot nor a store.
+    """
+    import pandas as pd
+    filters = {column: set(map(str, values)) for column, values in (filters or {}).items()}
+    manifest = manifest or read_manifest()
+    if manifest and parquet_available():
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(snapshot_path(manifest, kind))
+        names = parquet.schema_arrow.names
+        read = [column for column in (columns or names) + list(filters) if column in names]
+        chunks = (batch.to_pandas() for batch in parquet.iter_batches(batch_size=chunk_rows, columns=list(dict.fromkeys(read))))
+    elif store_exists(db_path):
+        known = POSTING_COLUMNS if kind == 'raw' else STRUCTURED_COLUMNS
+        read = [column for column in (columns or known) + list(filters) if column in known]
+        chunks = _store_chunks(kind, list(dict.fromkeys(read)), chunk_rows, db_path)
+    else:
+        csv_path = csv_path or (RAW_CSV_PATH if kind == 'raw' else STRUCTURED_CSV_PATH)
+        if not os.path.exists(csv_path):
+            return
+        wanted = set(columns or []) | set(filters)
+        chunks = pd.read_csv(csv_path, chunksize=chunk_rows, usecols=(lambda column: column in wanted) if columns else None)
+
+    for chunk in chunks:
+        for column, values in filters.items():
+            if column in chunk.columns:
+                chunk = chunk[chunk[column].astype(str).isin(values)]
+        if columns:
+            chunk = chunk[[column for column in columns if column in chunk.columns]]
+        if len(chunk):
+            yield chunk
+
+def _store_chunks(kind: str, columns: List[str], chunk_rows: int, db_path: str) -> Iterator:
+    """Current postings or structured rows from the store, chunk by chunk over one read-only connection"""
+    with JobStore(db_path, readonly=True) as store:
+        load = store.postings_frame if kind == 'raw' else store.structured_frame
+        yield from load(columns, current_only=True, chunksize=chunk_rows)
+
+def _write_csv(f, chunks, columns):
+    first = True
+    for chunk in chunks:
+        chunk.to_csv(f, index=False, header=first)
+        first = False
+    if first and columns:
+        # No rows: still write the header
+        f.write(','.join(columns) + '\n')
+
+def _write_jsonl(f, chunks, columns):
+    for chunk in chunks:
+        for record in chunk.astype(object).where(chunk.notna(), None).to_dict('records'):
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+def _write_parquet(f, chunks, columns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                # A column that is all-null in the first chunk is text in later ones
+                schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                    for field in table.schema]).remove_metadata()
+                writer = pq.ParquetWriter(f, schema, compression='zstd')
+            writer.write_table(table.cast(writer.schema))
+        if writer is None:
+            writer = pq.ParquetWriter(f, pa.schema([(column, pa.string()) for column in columns or []]))
+    finally:
+        if writer is not None:
+            writer.close()
+
+def _write_xlsx(f, chunks, columns):
+    from openpyxl import Workbook
+    # Write-only mode streams rows to the file instead of keeping every cell object
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('jobs')
+    header = None
+    for chunk in chunks:
+        if header is None:
+            header = list(chunk.columns)
+            sheet.append(header)
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            sheet.append(list(row))
+    if header is None and columns:
+        sheet.append(list(columns))
+    workbook.save(f)
+
+WRITERS = {'csv': _write_csv, 'jsonl': _write_jsonl, 'parquet': _write_parquet, 'xlsx': _write_xlsx}
+
+def write_export(path: str, fmt: str, chunks: Iterable, columns: Optional[List[str]] = None) -> str:
+    """Write chunks to an export file atomically"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; choose from {', '.join(FORMATS)}")
+    if fmt in ('csv', 'jsonl'):
+        return _write_atomic(path, lambda f: WRITERS[fmt](f, chunks, columns), 'w', encoding='utf-8', newline='')
+    return _write_atomic(path, lambda f: WRITERS[fmt](f, chunks, columns), 'wb')
+
+def remove_old_exports(directory: str = EXPORT_DIR, max_age: float = EXPORT_TTL_SECONDS) -> int:
+    """Delete exports older than max_age seconds and return how many were removed"""
+    if not os.path.isdir(directory):
+        return 0
+    removed = 0
+    cutoff = time.time() - max_age
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if not name.startswith('.') and os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+            os.remove(path)
+            removed += 1
+    return removed
+
+def export_file(kind: str = 'raw', fmt: str = 'csv', columns: Optional[List[str]] = None,
+                filters: Optional[Dict[str, Iterable]] = None, name: Optional[str] = None,
+                directory: str = EXPORT_DIR, **source) -> str:
+    """Export raw or structured postings to a new file in directory and return its path"""
+    os.makedirs(directory, exist_ok=True)
+    remove_old_exports(directory)
+    name = name or f"jobontop_{kind}_data"
+    # The random part keeps the public URL unguessable and same-second exports apart
+    path = os.path.join(directory, f"{name}_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex}{FORMATS[fmt][0]}")
+    return write_export(path, fmt, iter_chunks(kind, columns, filters, **source), columns)
+
+def download_name(path: str) -> str:
+    """The file name offered to the browser: the export's name without its random part"""
+    stem, extension = os.path.splitext(os.path.basename(path))
+    return f"{stem.rsplit('_', 1)[0]}{extension}"
+
+def show_export(kind: str, key: str, columns: Optional[List[str]] = None, filters: Optional[Dict[str, Iterable]] = None,
+                label: str = "Export", name: Optional[str] = None, **source):
+    """Streamlit format picker and button that writes an export file and links to it
+
+    The file is served by Streamlit's static file handler, so it is never held in
+    the session's memory. key keeps the widgets and last export of each panel apart;
+    source (manifest, db_path, csv_path) is passed on to iter_chunks.
+    """
+    import streamlit as st
+
+    fmt = st.selectbox("Format", available_formats(), key=f"{key}_format",
+                       format_func=lambda name: name.upper())
+    if st.button(label, key=f"{key}_button"):
+        previous = st.session_state.get(f"{key}_export")
+        with st.spinner(f"Writing {fmt.upper()} export..."):
+            st.session_state[f"{key}_export"] = export_file(kind, fmt, columns, filters, name, **source)
+        # Only this session links to its previous export
+        if previous and os.path.exists(previous):
+            os.remove(previous)
+    path = st.session_state.get(f"{key}_export")
+    if path and os.path.exists(path):
+        file_name = download_name(path)
+        st.markdown(f'<a href="app/static/exports/{os.path.basename(path)}" download="{file_name}">💾 {file_name}</a> '
+                    f'({os.path.getsize(path) / 2**20:.1f} MiB)', unsafe_allow_html=True)
+
+def benchmark(n: int = 200_000) -> Dict[str, float]:
+    """Compare the peak memory of df.to_csv() into a string with a chunked CSV export from the store"""
+    import tempfile
+    import tracemalloc
+    from records import _synthetic_rows, JobPosting
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jobs.db')
+        with JobStore(db_path) as store:
+            store.upsert_postings(JobPosting(url, bedrijf, solliciteren) for url, bedrijf, solliciteren, _ in _synthetic_rows(n))
+
+        with JobStore(db_path, readonly=True) as store:
+            df = store.postings_frame(['posting_id', 'url', 'bedrijf', 'solliciteren'])
+        tracemalloc.start()
+        csv = df.to_csv(index=False)
+        results['string_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        del csv, df
+
+        tracemalloc.start()
+        chunks = _store_chunks('raw', ['posting_id', 'url', 'bedrijf', 'solliciteren'], CHUNK_ROWS, db_path)
+        path = write_export(os.path.join(tmp, 'export.csv'), 'csv', chunks)
+        results['chunked_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        results['file_mb'] = os.path.getsize(path) / 2**20
+    return results
+
+def main(argv: Optional[List[str]] = None):
+    """Export the current postings to a file, or benchmark exporting"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('kind', nargs='?', default='raw', choices=['raw', 'structured'], help="Data to export (default: raw)")
+    parser.add_argument('--format', default='csv', choices=list(FORMATS), help="File format (default: csv)")
+    parser.add_argument('--columns', default=None, help="Comma-separated columns to export (default: all)")
+    parser.add_argument('--out-dir', default=EXPORT_DIR, help="Directory for the export (default: static/exports next to this script)")
+    parser.add_argument('--benchmark', type=int, metavar='N', default=None,
+                        help="Compare in-memory and chunked CSV exports of N synthetic postings")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        results = benchmark(args.benchmark)
+        print(f"📤 {args.benchmark} postings ({results['file_mb']:.0f} MiB of CSV):")
+        print(f"   to_csv string of the loaded frame: peak {results['string_peak_mb']:.0f} MiB")
+        print(f"   chunked file from the store:      peak {results['chunked_peak_mb']:.0f} MiB")
+        return
+    if args.format not in available_formats():
+        parser.error(f"{args.format} export needs {FORMATS[args.format][2]} installed")
+    columns = args.columns.split(',') if args.columns else None
+    start = time.perf_counter()
+    path = export_file(args.kind, args.format, columns, directory=args.out_dir)
+    print(f"📤 Exported {args.kind} data to {path} ({os.path.getsize(path) / 2**20:.1f} MiB) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Data files for the static HTML viewer (job_results.html)
+The structured postings are streamed out as compact JSON chunks wrapped in
+small script files under job_results_data/, so the page works from disk
+(file:// URLs cannot fetch() JSON) and loads only the chunks it shows.
+A prefix search index over the same rows is sharded by the first two
+letters of each token, so a query loads only the shards it starts with.
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+VIEWER_HTML = 'job_results.html'
+VIEWER_DATA_DIR = 'job_results_data'
+VIEWER_COLUMNS = ['company_name', 'location', 'contact_person', 'email_addresses', 'phone_numbers', 'address', 'url']
+CHUNK_SIZE = 2000
+
+# Fields the search box matches, and the token prefix that picks an index shard
+SEARCH_COLUMNS = ['company_name', 'location', 'contact_person', 'email_addresses', 'address']
+SHARD_PREFIX_LENGTH = 2
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+def _cell(value):
+    """Viewer value for a field: missing values (None, NaN, '') become null"""
+    if value is None or value == '' or (isinstance(value, float) and value != value):
+        return None
+    return str(value)
+
+def _script(callback: str, *args) -> str:
+    """A script file that hands JSON arguments to a viewer callback"""
+    payload = ','.join(json.dumps(arg, ensure_ascii=False, separators=(',', ':')) for arg in args)
+    # U+2028/2029 are valid in JSON but end a line in older JavaScript engines
+    payload = payload.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+    return f"jotViewer.{callback}({payload});\n"
+
+def search_tokens(text: Optional[str]) -> List[str]:
+    """Lowercase, accent-free words of a text that are long enough to pick an index shard"""
+    if not text:
+        return []
+    folded = ''.join(char for char in unicodedata.normalize('NFKD', text.lower()) if not unicodedata.combining(char))
+    return [token for token in _TOKEN_PATTERN.findall(folded) if len(token) >= SHARD_PREFIX_LENGTH]
+
+def _write_index(directory: str, index: Dict[str, List[int]]) -> List[str]:
+    """Write the inverted index as one script per token prefix and return the shard keys
+
+    Row numbers are stored as gaps from the previous one, which keeps long lists short.
+    """
+    shards = defaultdict(dict)
+    for token, rows in index.items():
+        shards[token[:SHARD_PREFIX_LENGTH]][token] = [row - previous for previous, row in zip([0] + rows, rows)]
+    for key, tokens in shards.items():
+        with open(os.path.join(directory, f"index-{key}.js"), 'w', encoding='utf-8') as f:
+            f.write(_script('index', key, tokens))
+    return sorted(shards)
+
+def write_viewer_data(rows: Iterable[Dict], directory: str = VIEWER_DATA_DIR, chunk_size: int = CHUNK_SIZE) -> Dict:
+    """Stream rows into chunk files, search index shards and a manifest, replacing the old data directory in one swap
+
+    Returns the manifest.
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=f'.{os.path.basename(directory)}_')
+    stats = {'companies': 0, 'locations': 0, 'emails': 0}
+    total, chunks, chunk = 0, 0, []
+    index = defaultdict(list)
+    search_positions = [VIEWER_COLUMNS.index(column) for column in SEARCH_COLUMNS]
+    token_cache = {}  # locations and company names repeat a lot
+
+    def flush():
+        nonlocal chunks
+        with open(os.path.join(tmp_dir, f"chunk-{chunks:05d}.js"), 'w', encoding='utf-8') as f:
+            f.write(_script('chunk', chunks, chunk))
+        chunks += 1
+
+    try:
+        for row in rows:
+            values = [_cell(row.get(column)) for column in VIEWER_COLUMNS]
+            stats['companies'] += values[0] is not None
+            stats['locations'] += values[1] is not None
+            stats['emails'] += values[3] is not None
+            chunk.append(values)
+            tokens = set()
+            for position in search_positions:
+                value = values[position]
+                if value not in token_cache:
+                    token_cache[value] = search_tokens(value)
+                tokens.update(token_cache[value])
+            for token in tokens:
+                index[token].append(total)
+            total += 1
+            if len(chunk) == chunk_size:
+                flush()
+                chunk = []
+        if chunk:
+            flush()
+        shards = _write_index(tmp_dir, index)
+
+        manifest = {
+            'generated_at': time.strftime('%Y-%m-%d %H:%M'),
+            'columns': VIEWER_COLUMNS,
+            'total': total,
+            'chunk_size': chunk_size,
+            'chunks': chunks,
+            'stats': stats,
+            'index': {'columns': SEARCH_COLUMNS, 'prefix_length': SHARD_PREFIX_LENGTH, 'shards': shards},
+        }
+        with open(os.path.join(tmp_dir, 'manifest.js'), 'w', encoding='utf-8') as f:
+            f.write(_script('manifest', manifest))
+
+        # Swap the directories so the page never loads a mix of old and new chunks
+        old_dir = None
+        if os.path.exists(directory):
+            old_dir = tempfile.mkdtemp(dir=parent, prefix=f'.{os.path.basename(directory)}_old_')
+            os.rmdir(old_dir)
+            os.replace(directory, old_dir)
+        os.replace(tmp_dir, directory)
+        if old_dir:
+            shutil.rmtree(old_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return manifest
+
+def benchmark(n: int = 100_000, chunk_size: int = CHUNK_SIZE) -> Dict[str, float]:
+    """Time writing the viewer data for n synthetic postings and size the search shards a query loads"""
+    from records import _synthetic_rows
+
+    rows = [dict(extracted, url=url) for url, _, _, extracted in _synthetic_rows(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, VIEWER_DATA_DIR)
+        start = time.perf_counter()
+        manifest = write_viewer_data(rows, directory, chunk_size)
+        seconds = time.perf_counter() - start
+        sizes = {name: os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)}
+    index_sizes = [size for name, size in sizes.items() if name.startswith('index-')]
+    return {'seconds': seconds, 'chunks': manifest['chunks'], 'mb': sum(sizes.values()) / 2**20,
+            'shards': len(index_sizes), 'index_mb': sum(index_sizes) / 2**20,
+            'largest_shard_kb': max(index_sizes, default=0) / 2**10}
+
+def main(argv: Optional[List[str]] = None):
+    """Time the viewer data build on synthetic postings"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--benchmark', type=int, metavar='N', default=100_000,
+                        help="Number of synthetic postings (default: 100000)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help=f"Rows per chunk file (default: {CHUNK_SIZE})")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.benchmark, args.chunk_size)
+    print(f"📄 {args.benchmark} postings -> {results['chunks']} chunk files, "
+          f"{results['mb']:.1f} MiB in {results['seconds']:.2f}s")
+    print(f"🔍 Search index: {results['shards']} shards, {results['index_mb']:.1f} MiB, "
+          f"largest shard {results['largest_shard_kb']:.0f} KiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+On-demand posting lookups for the Job Details views
+The job picker pages through the posting_ids and URLs of the (searched)
+postings and only builds options for one page of them. The full text and
+extracted fields of the picked posting are then read by posting_id from the
+job store's primary key, or from the published snapshot, so neither depends
+on how many postings there are. The raw tables load the same way: their
+frames hold only previews, and the full text of the page on screen is
+looked up when it is asked for.
+"""
+
+import time
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+from job_store import DEFAULT_DB_PATH, POSTING_COLUMNS, PREVIEW_COLUMNS, STRUCTURED_COLUMNS, JobStore, store_exists
+from pagination import page_bounds
+from snapshots import SNAPSHOT_DIR, read_manifest, parquet_available, snapshot_path
+
+PICKER_PAGE_SIZE = 20
+
+def job_title(url) -> str:
+    """Short label for a posting: the last part of its URL"""
+    return str(url).rstrip('/').split('/')[-1]
+
+def _split(record: Dict) -> Tuple[Dict, Optional[Dict]]:
+    """Split a joined store row into the posting and its extracted fields (None if not extracted)"""
+    posting = {column: record.get(column) for column in POSTING_COLUMNS}
+    if not record.get('extracted'):
+        return posting, None
+    return posting, {column: record.get(column) for column in STRUCTURED_COLUMNS}
+
+def _snapshot_row(path: str, posting_id: str) -> Optional[Dict]:
+    """One row of a Parquet snapshot, reading only the row groups that can hold the posting_id"""
+    import pyarrow.parquet as pq
+    rows = pq.read_table(path, filters=[('posting_id', '==', posting_id)]).to_pylist()
+    return rows[0] if rows else None
+
+def load_posting(posting_id: str, manifest: Optional[Dict] = None, db_path: str = DEFAULT_DB_PATH,
+                 directory: str = SNAPSHOT_DIR) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """The full posting and its extracted fields by posting_id, from the store or else the published snapshot
+
+    Returns (None, None) when neither has it, e.g. for the sample CSVs, which have no posting_ids.
+    """
+    posting_id = str(posting_id)
+    if store_exists(db_path):
+        with JobStore(db_path, readonly=True) as store:
+            record = store.get_posting(posting_id)
+        if record:
+            return _split(record)
+    manifest = manifest or read_manifest(directory)
+    if manifest and parquet_available():
+        posting = _snapshot_row(snapshot_path(manifest, 'raw', directory), posting_id)
+        if posting:
+            return posting, _snapshot_row(snapshot_path(manifest, 'structured', directory), posting_id)
+    return None, None
+
+def load_texts(posting_ids, manifest: Optional[Dict] = None, db_path: str = DEFAULT_DB_PATH,
+               directory: str = SNAPSHOT_DIR) -> Dict[str, Dict]:
+    """The full bedrijf and solliciteren text of a few postings (e.g. one table page) by posting_id"""
+    posting_ids = [str(posting_id) for posting_id in posting_ids]
+    if not posting_ids:
+        return {}
+    if store_exists(db_path):
+        with JobStore(db_path, readonly=True) as store:
+            rows = store.get_postings(posting_ids)
+    else:
+        manifest = manifest or read_manifest(directory)
+        if not manifest or not parquet_available():
+            return {}
+        import pyarrow.parquet as pq
+        rows = pq.read_table(snapshot_path(manifest, 'raw', directory), columns=['posting_id'] + PREVIEW_COLUMNS,
+                             filters=[('posting_id', 'in', posting_ids)]).to_pylist()
+    return {str(row['posting_id']): row for row in rows}
+
+def with_full_text(rows, manifest: Optional[Dict] = None):
+    """A page of a raw frame that holds only previews, with the full text of its postings added"""
+    missing = [column for column in PREVIEW_COLUMNS if column not in rows.columns]
+    if not missing or 'posting_id' not in rows.columns:
+        return rows
+    texts = load_texts(rows['posting_id'], manifest)
+    rows = rows.copy()
+    for column in missing:
+        rows[column] = [texts.get(str(posting_id), {}).get(column) for posting_id in rows['posting_id']]
+    return rows
+
+def posting_details(row, manifest: Optional[Dict] = None, structured=None) -> Tuple[Dict, Optional[Dict]]:
+    """The posting and extracted fields for a picked row of a raw frame
+
+    Looked up by posting_id; rows without one (the sample CSVs) are shown from
+    the loaded frames instead, matching the structured row by URL.
+    """
+    posting, fields = (load_posting(row['posting_id'], manifest)
+                       if 'posting_id' in row and row['posting_id'] else (None, None))
+    if posting is not None:
+        return posting, fields
+    posting = {column: row.get(column) for column in ('url', 'bedrijf', 'solliciteren')}
+    if structured is not None and not structured.empty:
+        matches = structured[structured['url'] == row['url']]
+        if not matches.empty:
+            fields = matches.iloc[0].to_dict()
+    return posting, fields
+
+def pick_job(df, key: str, label: str = "Select a job to view details:"):
+    """Page-by-page job picker over a raw frame; returns the picked row or None
+
+    Only the options of the current page are built and sent to the browser.
+    """
+    import math
+    import streamlit as st
+
+    total = len(df)
+    if not total:
+        return None
+    pages = max(math.ceil(total / PICKER_PAGE_SIZE), 1)
+    # A narrower search can leave the remembered page past the end
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    start, end = page_bounds(total, page, PICKER_PAGE_SIZE)
+    urls = df['url'].iloc[start:end].tolist()
+    with col2:
+        selected = st.selectbox(label, range(len(urls)), key=f"{key}_job",
+                                format_func=lambda i: f"Job {start + i + 1}: {job_title(urls[i])}")
+    return df.iloc[start + selected] if selected is not None else None
+
+def benchmark(n: int = 100_000) -> Dict[str, float]:
+    """Time a single-posting lookup in the store and the snapshot against the whole-frame selectbox options"""
+    import os
+    import tempfile
+    import pandas as pd
+    from records import _synthetic_rows, JobPosting
+    from snapshots import publish_snapshots
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jobs.db')
+        directory = os.path.join(tmp, 'data')
+        os.makedirs(directory)
+        postings = [JobPosting(url, bedrijf, solliciteren) for url, bedrijf, solliciteren, _ in _synthetic_rows(n)]
+        with JobStore(db_path) as store:
+            store.upsert_postings(postings)
+            manifest = publish_snapshots(store, directory)
+        df = pd.DataFrame({'posting_id': [p.posting_id for p in postings], 'url': [p.url for p in postings]})
+        del postings
+        target = df['posting_id'].iloc[n // 2]
+
+        start = time.perf_counter()
+        options = [f"Job {i + 1}: {job_title(url)}" for i, url in enumerate(df['url'].tolist())]
+        results['all_options_ms'] = (time.perf_counter() - start) * 1000
+        results['options'] = len(options)
+
+        start = time.perf_counter()
+        load_posting(target, manifest, db_path)
+        results['store_ms'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        posting, _ = load_posting(target, manifest, os.path.join(tmp, 'missing.db'), directory)
+        results['snapshot_ms'] = (time.perf_counter() - start) * 1000
+        results['found'] = posting is not None
+    return results
+
+def main(argv: Optional[List[str]] = None):
+    """Show one posting by posting_id, or benchmark the lookups"""
+    import json
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('posting_id', nargs='?', default=None, help="Posting to show")
+    parser.add_argument('--benchmark', type=int, metavar='N', default=None,
+                        help="Time the lookups on N synthetic postings")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        results = benchmark(args.benchmark)
+        print(f"🔍 {args.benchmark} postings: building every selectbox option {results['all_options_ms']:.0f} ms")
+        print(f"   store lookup {results['store_ms']:.1f} ms, snapshot lookup {results['snapshot_ms']:.1f} ms")
+        return
+    if not args.posting_id:
+        parser.error("give a posting_id or --benchmark")
+    posting, fields = load_posting(args.posting_id)
+    if posting is None:
+        print(f"❌ Posting {args.posting_id} not found")
+        return
+    print(json.dumps({'posting': posting, 'structured': fields}, ensure_ascii=False, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+jotViewer.chunk(0,[["Ciconia","Schoten",null,"info@brasserie-ciconia.beof",null,"CiconiaHorstebaan 12900 SchotenM","https://www.jobontop.be/vacatures/vacature-flexi-medewerker-bar-zaal-4935944-13.html"],["Eetcafe de Bibliotheek","Wijnegem",null,"lindsy.vl@live.beof",null,"De BibliotheekTurnhoutsebaan 5W","https://www.jobontop.be/vacatures/vacature-dienster-kelner-zaalhulp-32-of-38-u-week-4935933-13.html"],["Eetcafé","Antwerpen",null,null,null,"t KlokskeGroenplaats 242000 AntwerpenOf via de bu","https://www.jobontop.be/vacatures/vacature-keukenhulp-vast-of-flexi-4935831-13.html"],["Botanic Sanctuary Antwerp",null,null,"jobs@botanicantwerp.comof",null,null,"https://www.jobontop.be/vacatures/vacature-phone-operator-student-extra-flexi-4935745-13.html"],["La Tannerie","Durbuy","Tom Van Cauwenberghe","tom@latanneriededurbuy.beof","0476415652","Rue Du Canal 12Bomal-Sur-Ourthe","https://www.jobontop.be/vacatures/vacature-flexi-uitbater-b-b-4935743-13.html"],["Verso Café","Antwerpen",null,null,null,"Lange Gasthuisstraat 92000 Antwerpen","https://www.jobontop.be/vacatures/vacature-barmedewerker-verso-cafe-vast-–-flexi-–-student-4934414-13.html"],["Clash Lunch & Dine te Brussegem staat","Brussegem",null,"info@restoclash.bet","0475/21.83","Resto ClashDrappier FrederiqueNieuwelaan 1281785 BrussegemM","https://www.jobontop.be/vacatures/vacature-zaalmedewerker-m-v-vast-flexi-student-4935150-13.html"],["Clash Lunch & Dine te Brussegem staat","Brussegem",null,"info@restoclash.bet","0475/21.83","Resto ClashFrederique DrappierNieuwelaan 1281785 BrussegemM","https://www.jobontop.be/vacatures/vacature-hulp-kok-vast-flexi-student-4935149-13.html"],[null,"Antwerpen",null,"viajobs@omengroup.beof",null,"Jan Van Rijswijcklaan 1552018 Antwerpen","https://www.jobontop.be/vacatures/vacature-poets-afwashulp-vast-of-flexi-4935060-13.html"],["Bistro VolDaan","Lier",null,"info@bistrovoldaan.beof","0477/73.85","2500 Liertel","https://www.jobontop.be/vacatures/vacature-zaalmedewerker-verantwoordelijke-vast-flexi-student-4934451-13.html"],[null,"Antwerpen",null,"viajobs@omengroup.beof",null,"Jan Van Rijswijcklaan 1552018 Antwerpen","https://www.jobontop.be/vacatures/vacature-barverantwoordelijke-vast-of-flexi-4934430-13.html"],["Gelegen","Ekeren","Maes Gunther","1969guan@gmail.comof","0474/91.24","Veltwijcklaan 482180 EkerenContactpersoon","https://www.jobontop.be/vacatures/vacature-flexi-zaalmedewerker-4934358-13.html"],["Park West","Antwerpen",null,"naarhr@parkwest.bet",null,"Park WestRooiplein 62600 Berchem","https://www.jobontop.be/vacatures/vacature-park-west-zoekt-ervaren-flexi-of-student-zaal-4934364-13.html"],["Net","Leuven",null,"info@bistromariette.beof","0474/48.35","Karin MerciWeggevoerdenstraat 1523012 LeuvenTel","https://www.jobontop.be/vacatures/vacature-keukenmedewerker-vast-flexi-student-4934255-13.html"],["Net","Leuven",null,"info@bistromariette.beof","0474/48.35","Karin MerciWeggevoerdenstraat 1523012 LeuvenTel","https://www.jobontop.be/vacatures/vacature-zaalmedewerker-vast-flexi-student-4934254-13.html"],["Brughu","Mechelen",null,"hassouniinfo@hetbrughuis.euof",null,"Het BrughuisPastoor De Heuckstraat 132811 LeestContactpersoon","https://www.jobontop.be/vacatures/vacature-gemotiveerde-collega-hulpkok-vast-of-flexi-4934094-13.html"],["Ferrier30","Antwerpen",null,null,null,"Leopold De Waelplaats 302000 AntwerpenKlaar om ach","https://www.jobontop.be/vacatures/vacature-barmedewerker-ferrier-30-vast-–-flexi-–-student-4933980-13.html"],["Frajo's","Wijnegem","Elien van Ghelder","info@frajosgrandcafe.beof",null,"Turnhoutsebaan 52110 Wijnegem","https://www.jobontop.be/vacatures/vacature-student-flexi-voor-zaal-4933865-13.html"],["Bij Brasserie-RestaurantCarlton","Mechelen","MECHELENHeer Van der Waals Patrick","015-201880jobs@brasserie-carlton.beof","015-201880","Grote Markt 342800 MECHELENHeer Van der","https://www.jobontop.be/vacatures/vacature-flexi-keukenmedewerker-koude-kant-4933710-13.html"],["Cèsi","Hasselt",null,"info@cesicuisine.beof","0493/19.47","Aldestraat 20, 3500 Hasselt","https://www.jobontop.be/vacatures/vacature-sous-chef-keukenhulp-vast-of-flexi-4933009-13.html"],["Caro’s","Geel",null,"info@caross.beof","0489637625; 0471409109",null,"https://www.jobontop.be/vacatures/vacature-bar-zaalmedewerker-m-v-vast-flexi-4932818-13.html"],["U Eat & Sleepbiedt","Antwerpen",null,"hans@u-eatsleep.beof","032019070","Sleeptav Hans OttenNassaustraat 422000 AntwerpenT","https://www.jobontop.be/vacatures/vacature-barman-barvrouw-deeltijds-flexi-4932660-13.html"],["Eten bij deBomma","Antwerpen",null,"jobs@restaurantdebomma.beof",null,"Willem Ogierplaats 3 2000 Antwerpen","https://www.jobontop.be/vacatures/vacature-zaal-barmedewerker-vast-flexi-student-4932527-13.html"],["Tamo","Antwerpen",null,"tamo.antwerp@gmail.comof",null,"ChewitVolkstraat 442000 ANTWERPENT","https://www.jobontop.be/vacatures/vacature-barman-barvrouw-deeltijds-4932493-13.html"],["Antwerpen","Antwerpen","Johan Van Dessel","johan@cella.beof","03/5350569","Kattendijkdok-Oostkaai 21b2000 Antwerpen","https://www.jobontop.be/vacatures/vacature-rangkelner-m-v-flexi-4932471-13.html"],["Sams'deli","Antwerpen","Leni","samsfood1@gmail.comof","0475.60.27","Hoveniersstraat 512018 AntwerpenSolliciteren","https://www.jobontop.be/vacatures/vacature-afwasser-flexi-4932468-13.html"],["Sams'deli","Antwerpen","Leni","samsfood1@gmail.comof","0475.60.27","Hoveniersstraat 512018 AntwerpenSolliciteren","https://www.jobontop.be/vacatures/vacature-kok-chineese-keuken-daguren-flexi-4932467-13.html"],["Raketis een funky foodbar","Antwerpen",null,"antwerpensasha.barraket@gmail.comof",null,"SashaBresstraat 102000 Antwerpensasha","https://www.jobontop.be/vacatures/vacature-flexi-parttime-keuken-4932126-13.html"],["InPAMPAS te Antwerpen","Antwerpen","Gaethan Suffys","gaethan@pampas.beof","0478041739; 05-1112600","2600 AntwerpenContactperso","https://www.jobontop.be/vacatures/vacature-flexijobber-zaal-bar-4932125-13.html"],["Restaurant Euryanthein","Schilde",null,"383.30.30info@euryanthe.beof","03/383.30.30","theIngrid en Stefan VanhoveTurnhoutsebaan 1772970 Schildetel","https://www.jobontop.be/vacatures/vacature-extra-flexi-student-met-ervaring-dinsdag-donderdagavond-4932038-13.html"],["Vermaat","Antwerpen",null,"naarrestaurant-aster@vermaatgroep.nlo",null,null,"https://www.jobontop.be/vacatures/vacature-horecamedewerker-flexi-4932019-13.html"],[null,"Turnhout",null,"info@loteling-schilde.beof",null,"2970 Schildem","https://www.jobontop.be/vacatures/vacature-kelner-dienster-vast-of-flexi-4932018-13.html"],["Engel","Hove",null,"info@deengel.beof","03/484.56.86","De Engeltav Dhr Van Den BroeckLangestraat 122240 Zandhovent","https://www.jobontop.be/vacatures/vacature-hulp-kok-m-v-4932016-13.html"],["Engel","Hove","Van Den Broeck","info@deengel.beof","03/484.56.86","Langestraat 122240 Zandhoven","https://www.jobontop.be/vacatures/vacature-afwasser-m-v-4932015-13.html"],["The Country Clubmaakt","Gent",null,"naarinfo@thecountryclub.beof",null,"ry Clubtav Walter van BostraetenMiksebaan 2482930 Brasschaat","https://www.jobontop.be/vacatures/vacature-zaalmedewerker-voltijds-of-flexi-4931890-13.html"],["Danieli Il Divino","Gent",null,"viahr@shrimptempura.be.adres",null,"Beukenlaan 122020 WilrijkOf  solliciteer via de button onderaan deze pagina","https://www.jobontop.be/vacatures/vacature-hulpkelner-4931856-13.html"],[null,"Antwerpen",null,"naarhr@shrimptempura.bewe",null,"restaurant MavenLuikstraat 42000 Antwerpen","https://www.jobontop.be/vacatures/vacature-hulpkelner-4931850-13.html"],["Restaurant Decan","Berchem",null,"info@restaurantdecan.beof","0473/89.76","ant Decantav Jan DecanPrins Boudewijnlaan 202600 Berchemt","https://www.jobontop.be/vacatures/vacature-afwasser-4930074-13.html"],["Private Chefzorgt",null,"Steven Yseboot","info@privatechef-agency.betel","0486/44.86",null,"https://www.jobontop.be/vacatures/vacature-chef-4904621-13.html"]]);
@@ -0,0 +1 @@
+jotViewer.index("01",{"015":[18]});
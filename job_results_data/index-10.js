@@ -0,0 +1 @@
+jotViewer.index("10",{"102000":[27]});
@@ -0,0 +1 @@
+jotViewer.index("12",{"12900":[0],"12bomal":[4],"1281785":[6,1],"122240":[32,1],"122020":[35]});
@@ -0,0 +1 @@
+jotViewer.index("13",{"132811":[15]});
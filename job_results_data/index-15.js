@@ -0,0 +1 @@
+jotViewer.index("15",{"1552018":[8,2],"1523012":[13,1]});
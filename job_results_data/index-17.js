@@ -0,0 +1 @@
+jotViewer.index("17",{"1772970":[29]});
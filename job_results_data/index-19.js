@@ -0,0 +1 @@
+jotViewer.index("19",{"1969guan":[11]});
@@ -0,0 +1 @@
+jotViewer.index("20",{"201880jobs":[18],"20":[19],"2000":[22],"202600":[37]});
@@ -0,0 +1 @@
+jotViewer.index("21",{"21b2000":[24]});
@@ -0,0 +1 @@
+jotViewer.index("24",{"242000":[2],"2482930":[34]});
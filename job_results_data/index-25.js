@@ -0,0 +1 @@
+jotViewer.index("25",{"2500":[9]});
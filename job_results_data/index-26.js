@@ -0,0 +1 @@
+jotViewer.index("26",{"2600":[28]});
@@ -0,0 +1 @@
+jotViewer.index("29",{"2970":[31]});
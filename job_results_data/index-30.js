@@ -0,0 +1 @@
+jotViewer.index("30",{"302000":[16],"30info":[29],"30":[29]});
@@ -0,0 +1 @@
+jotViewer.index("34",{"342800":[18]});
@@ -0,0 +1 @@
+jotViewer.index("35",{"3500":[19]});
@@ -0,0 +1 @@
+jotViewer.index("38",{"383":[29]});
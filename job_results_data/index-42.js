@@ -0,0 +1 @@
+jotViewer.index("42",{"422000":[21],"42000":[36]});
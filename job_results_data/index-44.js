@@ -0,0 +1 @@
+jotViewer.index("44",{"442000":[23]});
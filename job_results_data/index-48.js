@@ -0,0 +1 @@
+jotViewer.index("48",{"482180":[11]});
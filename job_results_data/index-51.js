@@ -0,0 +1 @@
+jotViewer.index("51",{"512018":[25,1]});
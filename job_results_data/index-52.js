@@ -0,0 +1 @@
+jotViewer.index("52",{"52110":[17]});
@@ -0,0 +1 @@
+jotViewer.index("5w",{"5w":[1]});
@@ -0,0 +1 @@
+jotViewer.index("62",{"62600":[12]});
@@ -0,0 +1 @@
+jotViewer.index("92",{"92000":[5]});
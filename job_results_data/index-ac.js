@@ -0,0 +1 @@
+jotViewer.index("ac",{"ach":[16]});
@@ -0,0 +1 @@
+jotViewer.index("ad",{"adres":[35]});
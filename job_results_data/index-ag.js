@@ -0,0 +1 @@
+jotViewer.index("ag",{"agency":[38]});
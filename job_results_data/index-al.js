@@ -0,0 +1 @@
+jotViewer.index("al",{"aldestraat":[19]});
@@ -0,0 +1 @@
+jotViewer.index("an",{"antwerpenof":[2],"antwerpen":[2,3,3,2,2,4,5,1,1,1,1,1,1,1,2,6],"antwerp":[3,20],"antwerpenklaar":[16],"antwerpent":[21,2],"antwerpensolliciteren":[25,1],"antwerpensasha":[27],"antwerpencontactperso":[28],"ant":[37]});
@@ -0,0 +1 @@
+jotViewer.index("as",{"aster":[30]});
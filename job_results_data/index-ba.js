@@ -0,0 +1 @@
+jotViewer.index("ba",{"barraket":[27]});
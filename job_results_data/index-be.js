@@ -0,0 +1 @@
+jotViewer.index("be",{"beof":[0,1,3,4,1,1,3,1,3,1,1,1,1,1,2,4,1,2,1,1,1,3],"bet":[6,1,5],"berchem":[12,25],"beukenlaan":[35],"be":[35],"bewe":[36],"berchemt":[37],"betel":[38]});
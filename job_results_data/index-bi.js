@@ -0,0 +1 @@
+jotViewer.index("bi",{"bibliotheekturnhoutsebaan":[1],"bibliotheek":[1],"bistro":[9],"bistrovoldaan":[9],"bistromariette":[13,1],"bij":[18,4]});
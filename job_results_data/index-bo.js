@@ -0,0 +1 @@
+jotViewer.index("bo",{"botanic":[3],"botanicantwerp":[3],"bostraetenmiksebaan":[34],"boudewijnlaan":[37]});
@@ -0,0 +1 @@
+jotViewer.index("br",{"brasserie":[0,18],"brussegem":[6,1],"brussegemm":[6,1],"brughuispastoor":[15],"brughu":[15],"broecklangestraat":[32],"broeck":[33],"brasschaat":[34]});
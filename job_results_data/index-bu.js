@@ -0,0 +1 @@
+jotViewer.index("bu",{"bu":[2],"button":[35]});
@@ -0,0 +1 @@
+jotViewer.index("ca",{"canal":[4],"cauwenberghe":[4],"cafe":[5],"carlton":[18],"caross":[20],"caro":[20]});
@@ -0,0 +1 @@
+jotViewer.index("ce",{"cesicuisine":[19],"cesi":[19],"cella":[24]});
@@ -0,0 +1 @@
+jotViewer.index("ch",{"chewitvolkstraat":[23],"chefzorgt":[38]});
@@ -0,0 +1 @@
+jotViewer.index("ci",{"ciconiahorstebaan":[0],"ciconia":[0]});
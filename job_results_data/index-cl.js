@@ -0,0 +1 @@
+jotViewer.index("cl",{"clash":[6,1],"clashdrappier":[6],"clashfrederique":[7],"clubtav":[34],"clubmaakt":[34]});
@@ -0,0 +1 @@
+jotViewer.index("co",{"comof":[3,8,12,2,1,1],"country":[34]});
@@ -0,0 +1 @@
+jotViewer.index("da",{"danieli":[35]});
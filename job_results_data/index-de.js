@@ -0,0 +1 @@
+jotViewer.index("de",{"de":[1,1,13,1,16,3],"der":[18],"debomma":[22],"dessel":[24],"deli":[25,1],"den":[32,1],"deengel":[32,1],"deze":[35],"decantav":[37],"decan":[37],"decanprins":[37]});
@@ -0,0 +1 @@
+jotViewer.index("dh",{"dhr":[32]});
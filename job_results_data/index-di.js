@@ -0,0 +1 @@
+jotViewer.index("di",{"dine":[6,1],"divino":[35]});
@@ -0,0 +1 @@
+jotViewer.index("dr",{"drappiernieuwelaan":[7]});
@@ -0,0 +1 @@
+jotViewer.index("du",{"durbuy":[4],"du":[4]});
@@ -0,0 +1 @@
+jotViewer.index("ea",{"eat":[21],"eatsleep":[21]});
@@ -0,0 +1 @@
+jotViewer.index("ee",{"eetcafe":[1,1],"een":[27]});
@@ -0,0 +1 @@
+jotViewer.index("ek",{"ekerencontactpersoon":[11],"ekeren":[11]});
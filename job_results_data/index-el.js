@@ -0,0 +1 @@
+jotViewer.index("el",{"elien":[17]});
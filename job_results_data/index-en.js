@@ -0,0 +1 @@
+jotViewer.index("en",{"en":[29],"engel":[32,1],"engeltav":[32]});
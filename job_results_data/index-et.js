@@ -0,0 +1 @@
+jotViewer.index("et",{"eten":[22]});
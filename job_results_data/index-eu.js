@@ -0,0 +1 @@
+jotViewer.index("eu",{"euof":[15],"euryanthein":[29],"euryanthe":[29]});
@@ -0,0 +1 @@
+jotViewer.index("fe",{"ferrier30":[16]});
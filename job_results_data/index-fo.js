@@ -0,0 +1 @@
+jotViewer.index("fo",{"foodbar":[27]});
@@ -0,0 +1 @@
+jotViewer.index("fr",{"frederiquenieuwelaan":[6],"frajo":[17],"frajosgrandcafe":[17]});
@@ -0,0 +1 @@
+jotViewer.index("fu",{"funky":[27]});
@@ -0,0 +1 @@
+jotViewer.index("ga",{"gasthuisstraat":[5],"gaethan":[28]});
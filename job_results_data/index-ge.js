@@ -0,0 +1 @@
+jotViewer.index("ge",{"gelegen":[11],"geel":[20],"gent":[34,1]});
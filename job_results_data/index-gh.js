@@ -0,0 +1 @@
+jotViewer.index("gh",{"ghelder":[17]});
@@ -0,0 +1 @@
+jotViewer.index("gm",{"gmail":[11,12,2,1,1]});
@@ -0,0 +1 @@
+jotViewer.index("gr",{"grote":[18]});
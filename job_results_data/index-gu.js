@@ -0,0 +1 @@
+jotViewer.index("gu",{"gunther":[11]});
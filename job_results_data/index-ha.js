@@ -0,0 +1 @@
+jotViewer.index("ha",{"hassouniinfo":[15],"hasselt":[19],"hans":[21]});
@@ -0,0 +1 @@
+jotViewer.index("he",{"het":[15],"heuckstraat":[15],"hetbrughuis":[15]});
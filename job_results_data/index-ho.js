@@ -0,0 +1 @@
+jotViewer.index("ho",{"hoveniersstraat":[25,1],"hove":[32,1]});
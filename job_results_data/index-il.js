@@ -0,0 +1 @@
+jotViewer.index("il",{"il":[35]});
@@ -0,0 +1 @@
+jotViewer.index("in",{"info":[0,6,1,2,4,1,3,2,1,11,1,1,4,1],"inpampas":[28]});
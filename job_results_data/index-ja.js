@@ -0,0 +1 @@
+jotViewer.index("ja",{"jan":[8,2,27]});
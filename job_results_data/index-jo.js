@@ -0,0 +1 @@
+jotViewer.index("jo",{"jobs":[3,19],"johan":[24]});
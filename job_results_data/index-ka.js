@@ -0,0 +1 @@
+jotViewer.index("ka",{"karin":[13,1],"kattendijkdok":[24]});
@@ -0,0 +1 @@
+jotViewer.index("kl",{"klokskegroenplaats":[2]});
@@ -0,0 +1 @@
+jotViewer.index("la",{"la":[4],"latanneriededurbuy":[4],"lange":[5],"langestraat":[33]});
@@ -0,0 +1 @@
+jotViewer.index("le",{"leuven":[13,1],"leuventel":[13,1],"leestcontactpersoon":[15],"leopold":[16],"leni":[25,1]});
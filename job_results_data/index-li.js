@@ -0,0 +1 @@
+jotViewer.index("li",{"lindsy":[1],"live":[1],"lier":[9],"liertel":[9]});
@@ -0,0 +1 @@
+jotViewer.index("lo",{"loteling":[31]});
@@ -0,0 +1 @@
+jotViewer.index("lu",{"lunch":[6,1]});
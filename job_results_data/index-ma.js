@@ -0,0 +1 @@
+jotViewer.index("ma",{"maes":[11],"markt":[18],"mavenluikstraat":[36]});
@@ -0,0 +1 @@
+jotViewer.index("me",{"merciweggevoerdenstraat":[13,1],"mechelen":[15,3],"mechelenheer":[18]});
@@ -0,0 +1 @@
+jotViewer.index("na",{"naarhr":[12,24],"naarrestaurant":[30],"naarinfo":[34]});
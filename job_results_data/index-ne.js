@@ -0,0 +1 @@
+jotViewer.index("ne",{"net":[13,1]});
@@ -0,0 +1 @@
+jotViewer.index("nl",{"nlo":[30]});
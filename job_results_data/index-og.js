@@ -0,0 +1 @@
+jotViewer.index("og",{"ogierplaats":[22]});
@@ -0,0 +1 @@
+jotViewer.index("om",{"omengroup":[8,2],"om":[16]});
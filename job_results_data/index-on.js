@@ -0,0 +1 @@
+jotViewer.index("on",{"onderaan":[35]});
@@ -0,0 +1 @@
+jotViewer.index("oo",{"oostkaai":[24]});
@@ -0,0 +1 @@
+jotViewer.index("ot",{"ottennassaustraat":[21]});
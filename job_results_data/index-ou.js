@@ -0,0 +1 @@
+jotViewer.index("ou",{"ourthe":[4]});
@@ -0,0 +1 @@
+jotViewer.index("pa",{"parkwest":[12],"park":[12],"patrick":[18],"pampas":[28],"pagina":[35]});
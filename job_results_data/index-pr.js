@@ -0,0 +1 @@
+jotViewer.index("pr",{"privatechef":[38],"private":[38]});
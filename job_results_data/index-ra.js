@@ -0,0 +1 @@
+jotViewer.index("ra",{"raketis":[27]});
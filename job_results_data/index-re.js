@@ -0,0 +1 @@
+jotViewer.index("re",{"resto":[6,1],"restoclash":[6,1],"restaurantcarlton":[18],"restaurantdebomma":[22],"restaurant":[29,7,1],"restaurantdecan":[37]});
@@ -0,0 +1 @@
+jotViewer.index("ri",{"rijswijcklaan":[8,2]});
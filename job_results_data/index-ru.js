@@ -0,0 +1 @@
+jotViewer.index("ru",{"rue":[4]});
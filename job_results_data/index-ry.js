@@ -0,0 +1 @@
+jotViewer.index("ry",{"ry":[34]});
@@ -0,0 +1 @@
+jotViewer.index("sa",{"sanctuary":[3],"sams":[25,1],"samsfood1":[25,1],"sashabresstraat":[27]});
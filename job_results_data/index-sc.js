@@ -0,0 +1 @@
+jotViewer.index("sc",{"schotenm":[0],"schoten":[0],"schildetel":[29],"schilde":[29,2],"schildem":[31]});
@@ -0,0 +1 @@
+jotViewer.index("sh",{"shrimptempura":[35,1]});
@@ -0,0 +1 @@
+jotViewer.index("sl",{"sleepbiedt":[21],"sleeptav":[21]});
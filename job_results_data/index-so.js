@@ -0,0 +1 @@
+jotViewer.index("so",{"solliciteer":[35]});
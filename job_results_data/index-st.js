@@ -0,0 +1 @@
+jotViewer.index("st",{"staat":[6,1],"stefan":[29],"steven":[38]});
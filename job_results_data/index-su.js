@@ -0,0 +1 @@
+jotViewer.index("su",{"sur":[4],"suffys":[28]});
@@ -0,0 +1 @@
+jotViewer.index("ta",{"tannerie":[4],"tamo":[23]});
@@ -0,0 +1 @@
+jotViewer.index("te",{"te":[6,1,21]});
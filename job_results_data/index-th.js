@@ -0,0 +1 @@
+jotViewer.index("th",{"theingrid":[29],"the":[34],"thecountryclub":[34]});
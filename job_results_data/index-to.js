@@ -0,0 +1 @@
+jotViewer.index("to",{"tom":[4]});
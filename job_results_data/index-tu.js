@@ -0,0 +1 @@
+jotViewer.index("tu",{"turnhoutsebaan":[17],"turnhout":[31]});
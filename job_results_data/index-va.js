@@ -0,0 +1 @@
+jotViewer.index("va",{"van":[4,4,2,7,1,6,8,1,1],"vanhoveturnhoutsebaan":[29]});
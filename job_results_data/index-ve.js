@@ -0,0 +1 @@
+jotViewer.index("ve",{"verso":[5],"veltwijcklaan":[11],"vermaatgroep":[30],"vermaat":[30]});
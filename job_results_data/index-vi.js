@@ -0,0 +1 @@
+jotViewer.index("vi",{"via":[2,33],"viajobs":[8,2],"viahr":[35]});
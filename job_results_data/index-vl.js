@@ -0,0 +1 @@
+jotViewer.index("vl",{"vl":[1]});
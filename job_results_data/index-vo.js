@@ -0,0 +1 @@
+jotViewer.index("vo",{"voldaan":[9]});
@@ -0,0 +1 @@
+jotViewer.index("wa",{"waelplaats":[16],"waals":[18],"walter":[34]});
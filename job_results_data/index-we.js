@@ -0,0 +1 @@
+jotViewer.index("we",{"westrooiplein":[12],"west":[12]});
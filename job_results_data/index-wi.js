@@ -0,0 +1 @@
+jotViewer.index("wi",{"wijnegem":[1,16],"willem":[22],"wilrijkof":[35]});
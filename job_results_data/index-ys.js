@@ -0,0 +1 @@
+jotViewer.index("ys",{"yseboot":[38]});
@@ -0,0 +1 @@
+jotViewer.index("za",{"zandhovent":[32],"zandhoven":[33]});
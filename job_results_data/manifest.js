@@ -0,0 +1 @@
+jotViewer.manifest({"generated_at":"2026-10-19 10:58","columns":["company_name","location","contact_person","email_addresses","phone_numbers","address","url"],"total":39,"chunk_size":2000,"chunks":1,"stats":{"companies":35,"locations":37,"emails":36},"index":{"columns":["company_name","location","contact_person","email_addresses","address"],"prefix_length":2,"shards":["01","10","12","13","15","17","19","20","21","24","25","26","29","30","34","35","38","42","44","48","51","52","5w","62","92","ac","ad","ag","al","an","as","ba","be","bi","bo","br","bu","ca","ce","ch","ci","cl","co","da","de","dh","di","dr","du","ea","ee","ek","el","en","et","eu","fe","fo","fr","fu","ga","ge","gh","gm","gr","gu","ha","he","ho","il","in","ja","jo","ka","kl","la","le","li","lo","lu","ma","me","na","ne","nl","og","om","on","oo","ot","ou","pa","pr","ra","re","ri","ru","ry","sa","sc","sh","sl","so","st","su","ta","te","th","to","tu","va","ve","vi","vl","vo","wa","we","wi","ys","za"]}});
@@ -1,9 +1,10 @@
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import re
 from urllib.parse import urljoin, urlparse
 import time
+from records import JobPosting, posting_id, postings_to_frame
+from snapshots import write_csv_atomic
 
 class JobScraper:
     def __init__(self):
@@ -101,33 +102,58 @@ class JobScraper:
             # Extract Solliciteren section (ends at next h2 with class 'subHeader jbdSh jbdShReg')
             solliciteren_text = self.extract_text_between_tags(soup, 'Solliciteren', '', end_tag_class='jbdShReg')
             
-            return {
-                'url': job_url,
-                'bedrijf': bedrijf_text,
-                'solliciteren': solliciteren_text
-            }
+            return JobPosting(job_url, bedrijf_text, solliciteren_text)
             
         except requests.RequestException as e:
             print(f"Error scraping job {job_url}: {e}")
-            return {
-                'url': job_url,
-                'bedrijf': f"Error: {e}",
-                'solliciteren': f"Error: {e}"
-            }
+            return JobPosting(job_url, f"Error: {e}", f"Error: {e}")
     
-    def scrape_all_jobs(self):
-        """Main method to scrape all jobs and return data"""
+    def iter_job_details(self, job_links):
+        """Scrape job pages one at a time, yielding each JobPosting as soon as it is fetched"""
+        for i, job_url in enumerate(job_links, 1):
+            print(f"Processing job {i}/{len(job_links)}")
+            yield self.scrape_job_details(job_url)
+            
+            # Add a small delay to be respectful to the server
+            if i < len(job_links):
+                time.sleep(1)
+    
+    def scrape_all_jobs(self, dedup_index=None, skip_duplicates=False):
+        """Main method to scrape all jobs and return data
+        
+        Returns a list of JobPosting records, one per listed job. With a
+        NearDuplicateIndex, each job gets a duplicate_of value naming the
+        posting it reposts. With skip_duplicates, postings already in the index
+        are not fetched again: they are returned without text (None), so the
+        job store keeps the text it has and only marks them as still listed.
+        """
         job_links = self.get_job_links()
         
         if not job_links:
             print("No job links found!")
             return []
         
+        known = set()
+        if dedup_index is not None and skip_duplicates:
+            known = {url for url in job_links if posting_id(url) in dedup_index}
+            print(f"Not fetching {len(known)} already indexed jobs again")
+        
         job_data = []
         
         for i, job_url in enumerate(job_links, 1):
+            if job_url in known:
+                job_data.append(JobPosting(job_url, None, None,
+                                           duplicate_of=dedup_index.duplicate_of(posting_id(job_url)) or ''))
+                continue
             print(f"Processing job {i}/{len(job_links)}")
             job_details = self.scrape_job_details(job_url)
+            
+            if dedup_index is not None:
+                duplicate_of = dedup_index.add(job_details.posting_id, job_details)
+                if duplicate_of:
+                    print(f"Job {job_details.posting_id} is a repost of {duplicate_of}")
+                job_details.duplicate_of = duplicate_of or ''
+            
             job_data.append(job_details)
             
             # Add a small delay to be respectful to the server
@@ -142,9 +168,10 @@ class JobScraper:
             return
         
         # Create DataFrame
-        df = pd.DataFrame(job_data)
+        df = postings_to_frame(job_data)
         
         # Set display options for better table viewing
+        import pandas as pd
         pd.set_option('display.max_columns', None)
         pd.set_option('display.max_colwidth', 100)
         pd.set_option('display.width', None)
@@ -156,17 +183,20 @@ class JobScraper:
         print("="*150)
         
         for i, row in df.iterrows():
+            # Already indexed postings that were not fetched again have no text
+            bedrijf = row['bedrijf'] if isinstance(row['bedrijf'], str) else "(not fetched again)"
+            solliciteren = row['solliciteren'] if isinstance(row['solliciteren'], str) else "(not fetched again)"
             print(f"\nJOB {i+1}:")
             print("-" * 80)
             print(f"URL: {row['url']}")
             print(f"\nBEDRIJF:")
-            print(row['bedrijf'][:500] + "..." if len(row['bedrijf']) > 500 else row['bedrijf'])
+            print(bedrijf[:500] + "..." if len(bedrijf) > 500 else bedrijf)
             print(f"\nSOLLICITEREN:")
-            print(row['solliciteren'][:500] + "..." if len(row['solliciteren']) > 500 else row['solliciteren'])
+            print(solliciteren[:500] + "..." if len(solliciteren) > 500 else solliciteren)
             print("-" * 80)
         
         # Save to CSV for further analysis
-        df.to_csv('job_scraping_results.csv', index=False, encoding='utf-8')
+        write_csv_atomic(df, 'job_scraping_results.csv')
         print(f"\nResults saved to 'job_scraping_results.csv'")
 
 def main():
@@ -0,0 +1,319 @@
+"""
+SQLite store for scraped postings, extracted fields and pipeline runs
+Replaces the timestamped job_scraping_results_<ts>.csv / job_data_structured_<ts>.csv
+files: the scraper and extractor upsert into one database (WAL mode, so the
+dashboards can read while a run is writing) and the UIs query it directly.
+"""
+
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+from records import posting_id
+
+DEFAULT_DB_PATH = 'jobs.db'
+
+POSTING_COLUMNS = ['posting_id', 'url', 'bedrijf', 'solliciteren', 'duplicate_of']
+
+# Text columns the dashboards show cut to PREVIEW_LENGTH characters as <column>_preview
+PREVIEW_COLUMNS = ['bedrijf', 'solliciteren']
+PREVIEW_LENGTH = 200
+STRUCTURED_COLUMNS = [
+    'posting_id', 'url', 'company_name', 'location', 'contact_person', 'email_addresses',
+    'phone_numbers', 'address', 'email_domain', 'company_id', 'duplicate_of', 'extractor_version'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL DEFAULT 'running',
+    postings INTEGER,
+    extractor_version TEXT
+);
+
+CREATE TABLE IF NOT EXISTS postings (
+    posting_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    bedrijf TEXT,
+    solliciteren TEXT,
+    duplicate_of TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    first_run INTEGER REFERENCES runs(run_id),
+    last_run INTEGER REFERENCES runs(run_id)
+);
+CREATE INDEX IF NOT EXISTS idx_postings_first_seen ON postings(first_seen);
+CREATE INDEX IF NOT EXISTS idx_postings_last_seen ON postings(last_seen);
+CREATE INDEX IF NOT EXISTS idx_postings_last_run ON postings(last_run);
+
+CREATE TABLE IF NOT EXISTS structured (
+    posting_id TEXT PRIMARY KEY REFERENCES postings(posting_id),
+    url TEXT,
+    company_name TEXT,
+    location TEXT,
+    contact_person TEXT,
+    email_addresses TEXT,
+    phone_numbers TEXT,
+    address TEXT,
+    email_domain TEXT,
+    company_id TEXT,
+    duplicate_of TEXT,
+    extractor_version TEXT,
+    extracted_at TEXT NOT NULL,
+    run_id INTEGER REFERENCES runs(run_id)
+);
+CREATE INDEX IF NOT EXISTS idx_structured_location ON structured(location);
+CREATE INDEX IF NOT EXISTS idx_structured_company ON structured(company_name);
+CREATE INDEX IF NOT EXISTS idx_structured_company_id ON structured(company_id);
+CREATE INDEX IF NOT EXISTS idx_structured_version ON structured(extractor_version);
+"""
+
+def utc_now() -> str:
+    """Current UTC time as a sortable ISO-8601 string"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+def _clean(value):
+    """Convert pandas/numpy missing values and scalars to plain Python for sqlite"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:
+        return None
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+def _rows(records, columns: List[str]) -> Iterable[Dict]:
+    """Yield dict rows from a DataFrame, slotted records or dicts"""
+    if hasattr(records, 'to_dict') and hasattr(records, 'columns'):
+        records = records.to_dict('records')
+    for record in records:
+        yield {column: _clean(record.get(column)) for column in columns}
+
+def _posting_select(column: str) -> str:
+    """SELECT expression of a postings column; <column>_preview previews are cut from the text in SQLite"""
+    if column.endswith('_preview') and column[:-len('_preview')] in PREVIEW_COLUMNS:
+        text = f"COALESCE(p.{column[:-len('_preview')]}, '')"
+        return (f"CASE WHEN length({text}) > {PREVIEW_LENGTH} THEN substr({text}, 1, {PREVIEW_LENGTH}) || '...' "
+                f"ELSE {text} END AS {column}")
+    return f"p.{column}"
+
+class JobStore:
+    """Postings, structured fields and runs in a single SQLite database"""
+    def __init__(self, path: str = DEFAULT_DB_PATH, readonly: bool = False):
+        self.path = path
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.row_factory = sqlite3.Row
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Runs
+
+    def start_run(self, kind: str, extractor_version: Optional[str] = None) -> int:
+        """Record the start of a scrape or extract run and return its run_id"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (kind, started_at, extractor_version) VALUES (?, ?, ?)",
+                (kind, utc_now(), extractor_version)
+            )
+        return cursor.lastrowid
+
+    def finish_run(self, run_id: int, postings: int, status: str = 'ok'):
+        """Mark a run as finished"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET finished_at = ?, status = ?, postings = ? WHERE run_id = ?",
+                (utc_now(), status, postings, run_id)
+            )
+
+    def latest_run(self, kind: str = 'scrape') -> Optional[sqlite3.Row]:
+        """Return the most recent successful run of a kind"""
+        return self.conn.execute(
+            "SELECT * FROM runs WHERE kind = ? AND status = 'ok' ORDER BY run_id DESC LIMIT 1", (kind,)
+        ).fetchone()
+
+    # Writes
+
+    def upsert_postings(self, postings, run_id: Optional[int] = None, seen_at: Optional[str] = None) -> int:
+        """Insert new postings and refresh the text and last_seen of known ones
+
+        A posting without text (None) keeps its stored text: the scraper lists
+        already indexed postings without fetching them again.
+        """
+        seen_at = seen_at or utc_now()
+        rows = [dict(row, seen_at=seen_at, run_id=run_id) for row in _rows(postings, POSTING_COLUMNS)]
+        for row in rows:
+            # Older CSV snapshots have no posting_id column
+            if not row['posting_id']:
+                row['posting_id'] = posting_id(row['url'])
+            row['posting_id'] = str(row['posting_id'])
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO postings (posting_id, url, bedrijf, solliciteren, duplicate_of,
+                                      first_seen, last_seen, first_run, last_run)
+                VALUES (:posting_id, :url, :bedrijf, :solliciteren, :duplicate_of,
+                        :seen_at, :seen_at, :run_id, :run_id)
+                ON CONFLICT(posting_id) DO UPDATE SET
+                    url = excluded.url,
+                    bedrijf = COALESCE(excluded.bedrijf, postings.bedrijf),
+                    solliciteren = COALESCE(excluded.solliciteren, postings.solliciteren),
+                    duplicate_of = COALESCE(excluded.duplicate_of, postings.duplicate_of),
+                    last_seen = excluded.last_seen,
+                    last_run = COALESCE(excluded.last_run, postings.last_run)
+            """, rows)
+        return len(rows)
+
+    def upsert_structured(self, structured, run_id: Optional[int] = None) -> int:
+        """Insert or replace the extracted fields of postings"""
+        extracted_at = utc_now()
+        rows = [dict(row, extracted_at=extracted_at, run_id=run_id) for row in _rows(structured, STRUCTURED_COLUMNS)]
+        columns = STRUCTURED_COLUMNS + ['extracted_at', 'run_id']
+        # Keep company/duplicate links when a re-extraction runs without the indexes
+        updates = ', '.join(
+            f"{column} = COALESCE(excluded.{column}, structured.{column})" if column in ('company_id', 'duplicate_of')
+            else f"{column} = excluded.{column}"
+            for column in columns if column != 'posting_id'
+        )
+        with self.conn:
+            self.conn.executemany(f"""
+                INSERT INTO structured ({', '.join(columns)})
+                VALUES ({', '.join(':' + column for column in columns)})
+                ON CONFLICT(posting_id) DO UPDATE SET {updates}
+            """, rows)
+        return len(rows)
+
+    # Reads
+
+    def _current_filter(self, current_only: bool) -> str:
+        if not current_only:
+            return ''
+        # Postings still listed in the latest successful scrape
+        # (all postings when nothing has been scraped into the store, e.g. after a CSV import)
+        return """WHERE p.last_run IS (SELECT MAX(run_id) FROM runs WHERE kind = 'scrape' AND status = 'ok')"""
+
+    def postings_frame(self, columns: Optional[List[str]] = None, current_only: bool = False,
+                       chunksize: Optional[int] = None):
+        """Load postings as a DataFrame (or an iterator of chunksize-row frames), optionally only the listed columns"""
+        import pandas as pd
+        columns = columns or POSTING_COLUMNS
+        select = ', '.join(_posting_select(column) for column in columns)
+        query = f"SELECT {select} FROM postings p {self._current_filter(current_only)} ORDER BY p.first_seen DESC, p.posting_id DESC"
+        return pd.read_sql_query(query, self.conn, chunksize=chunksize)
+
+    def structured_frame(self, columns: Optional[List[str]] = None, current_only: bool = False,
+                         chunksize: Optional[int] = None):
+        """Load extracted fields as a DataFrame (or an iterator of chunksize-row frames), optionally only the listed columns"""
+        import pandas as pd
+        columns = columns or STRUCTURED_COLUMNS
+        select = ', '.join(f"s.{column}" for column in columns)
+        query = (f"SELECT {select} FROM structured s JOIN postings p ON p.posting_id = s.posting_id "
+                 f"{self._current_filter(current_only)} ORDER BY p.first_seen DESC, p.posting_id DESC")
+        return pd.read_sql_query(query, self.conn, chunksize=chunksize)
+
+    def structured_rows(self, columns: Optional[List[str]] = None, current_only: bool = False) -> List[Dict]:
+        """Load extracted fields as a list of dicts, for callers that do not need pandas"""
+        columns = columns or STRUCTURED_COLUMNS
+        select = ', '.join(f"s.{column}" for column in columns)
+        query = (f"SELECT {select} FROM structured s JOIN postings p ON p.posting_id = s.posting_id "
+                 f"{self._current_filter(current_only)} ORDER BY p.first_seen DESC, p.posting_id DESC")
+        return [dict(row) for row in self.conn.execute(query)]
+
+    def current_records(self) -> List[Dict]:
+        """Current postings merged with their extracted fields, one plain dict per posting_id"""
+        structured = [column for column in STRUCTURED_COLUMNS if column not in POSTING_COLUMNS]
+        select = ', '.join([f"p.{column}" for column in POSTING_COLUMNS] + [f"s.{column}" for column in structured])
+        query = (f"SELECT {select} FROM postings p LEFT JOIN structured s ON s.posting_id = p.posting_id "
+                 f"{self._current_filter(True)} ORDER BY p.posting_id")
+        return [dict(row) for row in self.conn.execute(query)]
+
+    def new_postings(self, since: str, location: Optional[str] = None, company: Optional[str] = None):
+        """Postings first seen at or after an ISO timestamp, optionally in one location or company"""
+        import pandas as pd
+        conditions = ["p.first_seen >= ?"]
+        params = [since]
+        if location:
+            conditions.append("s.location = ?")
+            params.append(location)
+        if company:
+            conditions.append("s.company_name = ?")
+            params.append(company)
+        query = f"""
+            SELECT p.posting_id, p.url, p.first_seen, p.last_seen, s.company_name, s.location,
+                   s.contact_person, s.email_addresses, s.phone_numbers, s.address
+            FROM postings p LEFT JOIN structured s ON s.posting_id = p.posting_id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY p.first_seen DESC
+        """
+        return pd.read_sql_query(query, self.conn, params=params)
+
+    def unextracted_or_stale(self, extractor_version: str) -> List[str]:
+        """posting_ids without structured fields from the given extractor version"""
+        return [row[0] for row in self.conn.execute("""
+            SELECT p.posting_id FROM postings p LEFT JOIN structured s ON s.posting_id = p.posting_id
+            WHERE s.posting_id IS NULL OR s.extractor_version IS NOT ?
+        """, (extractor_version,))]
+
+    def get_postings(self, posting_ids: List[str]) -> List[Dict]:
+        """Fetch raw postings by posting_id"""
+        rows = []
+        for start in range(0, len(posting_ids), 500):
+            chunk = posting_ids[start:start + 500]
+            placeholders = ', '.join('?' for _ in chunk)
+            rows.extend(dict(row) for row in self.conn.execute(
+                f"SELECT {', '.join(POSTING_COLUMNS)} FROM postings WHERE posting_id IN ({placeholders})", chunk
+            ))
+        return rows
+
+    def get_posting(self, posting_id: str) -> Optional[Dict]:
+        """One posting with its extracted fields by primary key; extracted is 0 (and the fields None) if it has none"""
+        structured = [column for column in STRUCTURED_COLUMNS if column not in POSTING_COLUMNS]
+        select = ', '.join([f"p.{column}" for column in POSTING_COLUMNS] + [f"s.{column}" for column in structured]
+                           + ['s.posting_id IS NOT NULL AS extracted'])
+        row = self.conn.execute(f"SELECT {select} FROM postings p LEFT JOIN structured s ON s.posting_id = p.posting_id "
+                                f"WHERE p.posting_id = ?", (posting_id,)).fetchone()
+        return dict(row) if row else None
+
+    def counts(self) -> Dict[str, int]:
+        """Number of postings and structured rows in the store"""
+        return {
+            'postings': self.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0],
+            'structured': self.conn.execute("SELECT COUNT(*) FROM structured").fetchone()[0],
+        }
+
+def store_exists(path: str = DEFAULT_DB_PATH) -> bool:
+    """Whether a job store has been created yet"""
+    return os.path.exists(path)
+
+def load_postings(path: str = DEFAULT_DB_PATH, columns: Optional[List[str]] = None, current_only: bool = True):
+    """Read the current postings from the store without taking a write connection
+
+    <column>_preview columns are cut from the text without loading it; other
+    columns the store does not have are skipped.
+    """
+    previews = [f"{column}_preview" for column in PREVIEW_COLUMNS]
+    columns = [column for column in columns if column in POSTING_COLUMNS + previews] if columns else None
+    with JobStore(path, readonly=True) as store:
+        return store.postings_frame(columns, current_only=current_only)
+
+def load_structured(path: str = DEFAULT_DB_PATH, columns: Optional[List[str]] = None, current_only: bool = True):
+    """Read the structured fields of the current postings from the store, skipping columns it does not have"""
+    columns = [column for column in columns if column in STRUCTURED_COLUMNS] if columns else None
+    with JobStore(path, readonly=True) as store:
+        return store.structured_frame(columns, current_only=current_only)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Command-line entry point for the JobOnTop.be scraper
+Subcommands import pandas, bs4, plotly and friends only when they need them,
+so --help, dependency checks and viewer regeneration start instantly.
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from typing import List, Optional, Tuple
+
+# Standard library only, so it is cheap to import for the bench-ui defaults
+import dashboard_bench
+
+# Modules too slow to import on every start; only the subcommands that use them may load them
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'plotly', 'bs4', 'requests', 'streamlit')
+
+# Cold start budget for `jot.py --help`: milliseconds of imports on top of a bare interpreter
+IMPORT_BUDGET_MS = 25
+
+def cmd_run(args):
+    """Run the full scrape -> extract -> publish pipeline"""
+    from deploy import run_pipeline
+    values = run_pipeline(create_viewer=args.viewer, force=args.force)
+    return 0 if values and 'structured' in values else 1
+
+def cmd_scrape(args):
+    """Scrape the job listings into the job store"""
+    from deploy import run_scraper
+    return 0 if run_scraper() else 1
+
+def cmd_extract(args):
+    """Extract structured fields for new or stale postings, or for a scraped CSV"""
+    from deploy import run_ai_extraction
+    return 0 if run_ai_extraction(args.input) is not None else 1
+
+def cmd_publish(args):
+    """Publish a new Parquet snapshot version from the job store"""
+    from job_store import JobStore, store_exists
+    from snapshots import publish_snapshots
+    if not store_exists(args.db):
+        print(f"❌ No job store at {args.db}. Run 'python jot.py run' first")
+        return 1
+    with JobStore(args.db, readonly=True) as store:
+        return 0 if publish_snapshots(store) else 1
+
+def cmd_history(args):
+    """Record today's delta from the job store, or rebuild the postings of a past date"""
+    from deltas import main as history_main
+    argv = ['--db', args.db] + (['--compact'] if args.compact else [])
+    argv += (['--at', args.at] if args.at else []) + (['--out', args.out] if args.out else [])
+    history_main(argv)
+    return 0
+
+def cmd_changes(args):
+    """Print the change feed since a consumer's cursor and advance it"""
+    from change_feed import main as changes_main
+    changes_main((['--cursor', args.cursor] if args.cursor else []) + (['--follow'] if args.follow else []))
+    return 0
+
+def cmd_view(args):
+    """Regenerate the HTML viewer and optionally open it"""
+    from deploy import create_simple_viewer, launch_viewer
+    html_file = create_simple_viewer(args.csv)
+    if html_file and args.open:
+        launch_viewer(html_file)
+    return 0 if html_file else 1
+
+def cmd_ui(args):
+    """Launch the Streamlit dashboard"""
+    from launch_ui import launch_streamlit
+    launch_streamlit()
+    return 0
+
+def cmd_check(args):
+    """Report missing dependencies without installing anything"""
+    from deploy import check_dependencies
+    return 1 if check_dependencies() else 0
+
+def _import_times(argv: List[str], repeat: int) -> Tuple[float, List[str]]:
+    """Best-of-N total import time in ms of a Python command, and the heavy modules it imported"""
+    best, heavy = None, set()
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', *argv], capture_output=True, text=True)
+        total_us = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, _, name = line[len('import time:'):].split('|')
+            total_us += int(self_us)
+            if name.strip().split('.')[0] in HEAVY_MODULES:
+                heavy.add(name.strip().split('.')[0])
+        best = total_us if best is None else min(best, total_us)
+    return best / 1000, sorted(heavy)
+
+def measure_startup(argv: Tuple[str, ...] = ('--help',), repeat: int = 5) -> Tuple[float, List[str]]:
+    """Import time in ms that a cold `jot.py <argv>` adds on top of a bare interpreter, and the heavy modules it loaded"""
+    # Interpreter startup (site, .pth files) is not ours to budget
+    baseline, _ = _import_times(['-c', 'pass'], repeat)
+    milliseconds, heavy = _import_times([os.path.abspath(__file__), *argv], repeat)
+    return max(milliseconds - baseline, 0.0), heavy
+
+def cmd_bench(args):
+    """Hold the CLI's cold start to its import budget"""
+    milliseconds, heavy = measure_startup(tuple(args.argv or ['--help']))
+    print(f"⏱️  jot.py {' '.join(args.argv or ['--help'])}: {milliseconds:.1f} ms of imports (budget {args.budget_ms} ms)")
+    ok = milliseconds <= args.budget_ms and not heavy
+    if heavy:
+        print(f"❌ Heavy modules imported at startup: {', '.join(heavy)}")
+    elif not ok:
+        print("❌ Over the import budget; run with -X importtime to see which modules are slow")
+    else:
+        print("✅ Within budget")
+    return 0 if ok else 1
+
+def cmd_bench_ui(args):
+    """Benchmark the dashboards headlessly on synthetic data of increasing size"""
+    from dashboard_bench import main as bench_ui_main
+    argv = ['--sizes', args.sizes, '--apps', args.apps, '--out', args.out,
+            '--repeat', str(args.repeat), '--tolerance', str(args.tolerance)]
+    argv += (['--data-dir', args.data_dir] if args.data_dir else []) + (['--compare', args.compare] if args.compare else [])
+    return bench_ui_main(argv)
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for every subcommand"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help=cmd_run.__doc__)
+    run.add_argument('--force', action='store_true', help="Rerun every stage even if its input did not change")
+    run.add_argument('--viewer', action='store_true', help="Also regenerate the HTML viewer")
+    run.set_defaults(func=cmd_run)
+
+    subparsers.add_parser('scrape', help=cmd_scrape.__doc__).set_defaults(func=cmd_scrape)
+
+    extract = subparsers.add_parser('extract', help=cmd_extract.__doc__)
+    extract.add_argument('input', nargs='?', default=None, help="Scraped CSV to import (default: the job store)")
+    extract.set_defaults(func=cmd_extract)
+
+    publish = subparsers.add_parser('publish', help=cmd_publish.__doc__)
+    publish.add_argument('--db', default='jobs.db', help="Job store to publish (default: jobs.db)")
+    publish.set_defaults(func=cmd_publish)
+
+    history = subparsers.add_parser('history', help=cmd_history.__doc__)
+    history.add_argument('--db', default='jobs.db', help="Job store to record (default: jobs.db)")
+    history.add_argument('--compact', action='store_true', help="Write a full base instead of a delta")
+    history.add_argument('--at', metavar='YYYY-MM-DD', default=None, help="Rebuild the postings as of this date")
+    history.add_argument('--out', default=None, help="CSV file for the rebuilt postings")
+    history.set_defaults(func=cmd_history)
+
+    changes = subparsers.add_parser('changes', help=cmd_changes.__doc__)
+    changes.add_argument('--cursor', default=None, help="File holding this consumer's cursor (default: read from the start)")
+    changes.add_argument('--follow', action='store_true', help="Keep printing new events as they are appended")
+    changes.set_defaults(func=cmd_changes)
+
+    view = subparsers.add_parser('view', help=cmd_view.__doc__)
+    view.add_argument('--csv', default=None, help="Structured CSV to show (default: the job store)")
+    view.add_argument('--open', action='store_true', help="Open the viewer in the browser")
+    view.set_defaults(func=cmd_view)
+
+    subparsers.add_parser('ui', help=cmd_ui.__doc__).set_defaults(func=cmd_ui)
+    subparsers.add_parser('check', help=cmd_check.__doc__).set_defaults(func=cmd_check)
+
+    bench = subparsers.add_parser('bench', help=cmd_bench.__doc__)
+    bench.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS,
+                       help=f"Maximum import time in ms (default: {IMPORT_BUDGET_MS})")
+    bench.add_argument('argv', nargs='*', help="Arguments to start jot.py with (default: --help)")
+    bench.set_defaults(func=cmd_bench)
+
+    bench_ui = subparsers.add_parser('bench-ui', help=cmd_bench_ui.__doc__)
+    sizes, apps = ','.join(map(str, dashboard_bench.SIZES)), ','.join(dashboard_bench.APPS)
+    bench_ui.add_argument('--sizes', default=sizes, help=f"Comma-separated dataset sizes (default: {sizes})")
+    bench_ui.add_argument('--apps', default=apps, help=f"Comma-separated dashboards (default: {apps})")
+    bench_ui.add_argument('--out', default=dashboard_bench.RESULTS_PATH,
+                          help=f"JSON file for the results (default: {dashboard_bench.RESULTS_PATH})")
+    bench_ui.add_argument('--data-dir', default=None, help="Keep the synthetic datasets here and reuse them")
+    bench_ui.add_argument('--repeat', type=int, default=dashboard_bench.REPEAT,
+                          help=f"Runs per app and size, best kept (default: {dashboard_bench.REPEAT})")
+    bench_ui.add_argument('--compare', metavar='BASELINE', default=None, help="Results JSON to flag regressions against")
+    bench_ui.add_argument('--tolerance', type=float, default=dashboard_bench.TOLERANCE,
+                          help=f"Allowed relative growth of a metric (default: {dashboard_bench.TOLERANCE})")
+    bench_ui.set_defaults(func=cmd_bench_ui)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    args = build_arg_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,35 +8,118 @@ import sys
 import os
 import webbrowser
 import time
+import urllib.request
+from typing import Optional
 
-def launch_streamlit():
-    """Launch the Streamlit app"""
+APP_SCRIPT = "streamlit_app.py"
+PORT = 8502
+
+# Seconds to wait for the server to answer its health check and for the warm-up run
+READY_TIMEOUT = 60
+
+def prebuild_caches(db_path: Optional[str] = None):
+    """Publish the snapshot, search index and aggregates if they do not match the store, before serving"""
+    from job_store import DEFAULT_DB_PATH, JobStore
+    from snapshots import publish_snapshots, snapshot_stale
+
+    start = time.perf_counter()
+    db_path = db_path or DEFAULT_DB_PATH
+    reason = snapshot_stale(db_path)
+    if reason:
+        print(f"🗜️  Publishing a fresh snapshot: {reason}")
+        with JobStore(db_path, readonly=True) as store:
+            publish_snapshots(store)
+    print(f"✅ Snapshot, search index and aggregates ready ({time.perf_counter() - start:.1f}s)")
+
+def wait_until_ready(port: int, process: subprocess.Popen, timeout: float = READY_TIMEOUT) -> float:
+    """Poll the server's health endpoint until it answers ok; returns the seconds it took"""
+    start = time.perf_counter()
+    url = f"http://localhost:{port}/_stcore/health"
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"Streamlit exited with code {process.returncode} before it was ready")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"Streamlit did not answer {url} within {timeout:.0f}s")
+
+def warm_app(port: int, timeout: float = READY_TIMEOUT) -> float:
+    """Run the app once through a headless session, so the first visitor finds its caches filled
+
+    Opens the same websocket a browser does and asks for a script run; the
+    cached loads, filter engines and aggregates are then already in the server.
+    Returns the seconds the run took.
+    """
+    import asyncio
+    from tornado.websocket import websocket_connect
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    async def run():
+        connection = await websocket_connect(f"ws://localhost:{port}/_stcore/stream")
+        try:
+            message = BackMsg()
+            message.rerun_script.query_string = ''
+            message.rerun_script.page_script_hash = ''
+            await connection.write_message(message.SerializeToString(), binary=True)
+            while True:
+                data = await connection.read_message()
+                if data is None:
+                    raise RuntimeError("Streamlit closed the warm-up session")
+                if ForwardMsg.FromString(data).WhichOneof('type') == 'script_finished':
+                    return
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    asyncio.run(asyncio.wait_for(run(), timeout))
+    return time.perf_counter() - start
+
+def launch_streamlit(app: str = APP_SCRIPT, port: int = PORT, open_browser: bool = True, warm: bool = True):
+    """Launch the Streamlit app once its data is published, open the browser when it is ready"""
     print("🚀 Launching JobOnTop.be AI Scraper UI...")
-    print("📱 Opening Streamlit interface...")
+    process = None
     
     try:
+        if warm:
+            try:
+                prebuild_caches()
+            except Exception as e:
+                print(f"⚠️  Could not publish a fresh snapshot ({e}); serving the data as it is")
+        
         # Start Streamlit in a subprocess
         process = subprocess.Popen([
-            sys.executable, "-m", "streamlit", "run", "streamlit_app.py",
-            "--server.port", "8502",
+            sys.executable, "-m", "streamlit", "run", app,
+            "--server.port", str(port),
             "--server.headless", "true",
             "--browser.gatherUsageStats", "false"
         ])
         
-        # Wait a moment for the server to start
-        time.sleep(3)
+        # Wait for the server to answer, then fill its caches with one headless run
+        print(f"⏳ Server ready in {wait_until_ready(port, process):.1f}s")
+        if warm:
+            try:
+                print(f"🔥 Warm-up run of {app} took {warm_app(port):.1f}s")
+            except Exception as e:
+                print(f"⚠️  Warm-up run failed ({e}); the first visitor will load the data")
         
         # Open browser
-        webbrowser.open("http://localhost:8502")
+        if open_browser:
+            print("📱 Opening Streamlit interface...")
+            webbrowser.open(f"http://localhost:{port}")
         
         print("✅ Streamlit app launched!")
-        print("🌐 Access your scraper at: http://localhost:8502")
+        print(f"🌐 Access your scraper at: http://localhost:{port}")
         print("📊 Features available:")
         print("   • Analytics Dashboard with charts")
         print("   • Structured Data View with filters")
         print("   • Raw Data Explorer")
         print("   • Detailed Job Viewer")
-        print("   • CSV Export functionality")
+        print("   • CSV, JSONL, Parquet and XLSX exports")
         print("\n💡 Press Ctrl+C to stop the server")
         
         # Wait for the process
@@ -44,9 +127,12 @@ def launch_streamlit():
         
     except KeyboardInterrupt:
         print("\n🛑 Stopping Streamlit server...")
-        process.terminate()
+        if process is not None:
+            process.terminate()
         print("✅ Server stopped successfully!")
     except Exception as e:
+        if process is not None and process.poll() is None:
+            process.terminate()
         print(f"❌ Error launching Streamlit: {e}")
         print("💡 Try running manually: streamlit run streamlit_app.py")
 
@@ -55,23 +141,36 @@ def main():
     print("🤖 JobOnTop.be AI Scraper - Streamlit Launcher")
     print("=" * 50)
     
-    # Check if data files exist
+    # Check if data exists
     import glob
-    raw_files = glob.glob("job_scraping_results_*.csv")
-    structured_files = glob.glob("job_data_structured_*.csv")
-    
-    if not raw_files and not structured_files:
-        print("❌ No scraped data found!")
-        print("💡 Run 'python deploy.py' first to scrape data")
-        return
-    
-    if raw_files:
-        latest_raw = max(raw_files, key=os.path.getctime)
-        print(f"✅ Found raw data: {latest_raw}")
+    from job_store import DEFAULT_DB_PATH, store_exists, JobStore
+    from snapshots import read_manifest
     
-    if structured_files:
-        latest_structured = max(structured_files, key=os.path.getctime)
-        print(f"✅ Found structured data: {latest_structured}")
+    manifest = read_manifest()
+    if manifest:
+        files = manifest['files']
+        print(f"✅ Found snapshot version {manifest['version']} from {manifest['published_at']} "
+              f"({files['raw']['rows']} postings, {files['structured']['rows']} extracted)")
+    elif store_exists():
+        with JobStore(DEFAULT_DB_PATH, readonly=True) as store:
+            counts = store.counts()
+        print(f"✅ Found job store: {DEFAULT_DB_PATH} ({counts['postings']} postings, {counts['structured']} extracted)")
+    else:
+        raw_files = glob.glob("job_scraping_results_*.csv")
+        structured_files = glob.glob("job_data_structured_*.csv")
+        
+        if not raw_files and not structured_files:
+            print("❌ No scraped data found!")
+            print("💡 Run 'python deploy.py' first to scrape data")
+            return
+        
+        if raw_files:
+            latest_raw = max(raw_files, key=os.path.getctime)
+            print(f"✅ Found raw data: {latest_raw}")
+        
+        if structured_files:
+            latest_structured = max(structured_files, key=os.path.getctime)
+            print(f"✅ Found structured data: {latest_structured}")
     
     print("\n🚀 Starting Streamlit UI...")
     launch_streamlit()
@@ -0,0 +1,180 @@
+import os
+import zlib
+import tempfile
+import numpy as np
+from typing import Dict, List, Optional
+
+from company_index import normalize_text
+# Re-exported for callers that import it from here
+from records import posting_id  # noqa: F401
+
+DEFAULT_DEDUP_PATH = 'near_duplicates.npz'
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """Split normalized text into overlapping word n-grams"""
+    words = normalize_text(text).split()
+    if len(words) <= size:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+def is_failed_fetch(record: Dict) -> bool:
+    """Whether a posting is the scraper's placeholder for a page it could not fetch"""
+    bedrijf = record.get('bedrijf', record.get('original_bedrijf', ''))
+    return isinstance(bedrijf, str) and bedrijf.startswith('Error:')
+
+class NearDuplicateIndex:
+    """MinHash/LSH index that finds postings with near-identical bedrijf + solliciteren text.
+
+    Each posting is reduced to a MinHash signature over word shingles. The
+    signature is split into bands and every band is hashed into a bucket, so
+    a lookup only compares against postings sharing at least one bucket
+    instead of the whole collection. Candidates are confirmed by their
+    estimated Jaccard similarity before a posting is flagged as a duplicate.
+    """
+    def __init__(self, path: Optional[str] = DEFAULT_DEDUP_PATH, num_perm: int = 128, bands: int = 16,
+                 threshold: float = 0.8, shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        # Multiply-shift hash family: h(x) = (a * x + b) >> 32 over uint64
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+        self.ids = []            # position -> posting_id
+        self.positions = {}      # posting_id -> position
+        self.signatures = []     # position -> signature bytes
+        self.representative = {} # posting_id -> posting_id of the cluster's first posting
+        self.buckets = {}        # (band, band hash) -> positions
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, pid: str) -> bool:
+        return pid in self.positions
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Compute the MinHash signature of a text, or None if it has no words"""
+        grams = shingles(text, self.shingle_size)
+        if not grams:
+            return None
+        hashes = np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams))
+        with np.errstate(over='ignore'):
+            permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) >> np.uint64(32)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[tuple]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    @staticmethod
+    def record_text(record: Dict) -> str:
+        """The text a posting is compared on"""
+        bedrijf = record.get('bedrijf', record.get('original_bedrijf', ''))
+        solliciteren = record.get('solliciteren', record.get('original_solliciteren', ''))
+        return f"{bedrijf if isinstance(bedrijf, str) else ''} {solliciteren if isinstance(solliciteren, str) else ''}"
+
+    def query(self, record: Dict) -> List[tuple]:
+        """Return (posting_id, estimated similarity) for indexed postings similar to a record"""
+        signature = self.signature(self.record_text(record))
+        if signature is None:
+            return []
+        return self._query_signature(signature)
+
+    def _query_signature(self, signature: np.ndarray) -> List[tuple]:
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self.buckets.get(key, ()))
+        matches = []
+        for position in candidates:
+            other = np.frombuffer(self.signatures[position], dtype=np.uint32)
+            similarity = float(np.mean(other == signature))
+            if similarity >= self.threshold:
+                matches.append((self.ids[position], similarity))
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+    def add(self, pid: str, record: Dict) -> Optional[str]:
+        """Index a posting and return the posting_id it duplicates, if any
+
+        Pages the scraper could not fetch ('Error: ...' text) are not indexed,
+        so they are fetched again next time and never match each other.
+        """
+        if pid in self.positions:
+            rep = self.representative.get(pid, pid)
+            return rep if rep != pid else None
+        if is_failed_fetch(record):
+            return None
+
+        signature = self.signature(self.record_text(record))
+        if signature is None:
+            return None
+
+        matches = self._query_signature(signature)
+        rep = self.representative.get(matches[0][0], matches[0][0]) if matches else pid
+
+        position = len(self.ids)
+        self.ids.append(pid)
+        self.positions[pid] = position
+        self.signatures.append(signature.tobytes())
+        self.representative[pid] = rep
+        for key in self._band_keys(signature):
+            self.buckets.setdefault(key, []).append(position)
+        return rep if rep != pid else None
+
+    def duplicate_of(self, pid: str) -> Optional[str]:
+        """Return the representative posting of a known duplicate"""
+        rep = self.representative.get(pid)
+        return rep if rep and rep != pid else None
+
+    def clusters(self) -> Dict[str, List[str]]:
+        """Group every indexed posting with its near-duplicates, keyed by representative"""
+        groups = {}
+        for pid in self.ids:
+            groups.setdefault(self.representative.get(pid, pid), []).append(pid)
+        return {rep: members for rep, members in groups.items() if len(members) > 1}
+
+    def load(self):
+        """Load the index from disk and rebuild the LSH buckets"""
+        with np.load(self.path, allow_pickle=False) as data:
+            ids = data['ids'].tolist()
+            representatives = data['representatives'].tolist()
+            signatures = data['signatures']
+        if signatures.shape[1:] != (self.num_perm,):
+            raise ValueError(f"{self.path} was built with {signatures.shape[1]} permutations, expected {self.num_perm}")
+        self.ids, self.positions, self.signatures, self.representative, self.buckets = [], {}, [], {}, {}
+        for position, (pid, rep, signature) in enumerate(zip(ids, representatives, signatures)):
+            self.ids.append(pid)
+            self.positions[pid] = position
+            self.signatures.append(signature.tobytes())
+            self.representative[pid] = rep
+            for key in self._band_keys(signature):
+                self.buckets.setdefault(key, []).append(position)
+
+    def save(self):
+        """Write the index to disk atomically"""
+        if not self.path:
+            return
+        signatures = np.frombuffer(b''.join(self.signatures), dtype=np.uint32).reshape(-1, self.num_perm)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.near_duplicates_', suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    ids=np.array(self.ids, dtype=str),
+                    representatives=np.array([self.representative[pid] for pid in self.ids], dtype=str),
+                    signatures=signatures
+                )
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,51 @@
+"""
+Page-by-page tables for the Streamlit dashboards
+Only the rows of the current page are sliced out of the filtered frame and
+sent to the browser, so a rerun and its payload cost the same for a hundred
+or a hundred thousand postings.
+"""
+
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+PAGE_SIZES = [25, 50, 100, 250]
+DEFAULT_PAGE_SIZE = 50
+
+def page_bounds(total: int, page: int, page_size: int) -> Tuple[int, int]:
+    """Start and end row positions of a 1-based page, clamped to the rows that exist"""
+    page = min(max(page, 1), max(math.ceil(total / page_size), 1))
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total)
+
+def show_page(df, key: str, columns: Optional[List[str]] = None, column_config: Optional[Dict] = None,
+              prepare: Optional[Callable] = None):
+    """Show one page of a frame with page controls and return the rows shown
+
+    key keeps the page size and page number of each table apart in the session state.
+    prepare, if given, is applied to the page's rows before they are shown, e.g. to
+    look up columns the frame does not hold for just those rows.
+    """
+    import streamlit as st
+
+    total = len(df)
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                                 key=f"{key}_page_size")
+    pages = max(math.ceil(total / page_size), 1)
+    # A narrower filter can leave the remembered page past the end
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    with col2:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    start, end = page_bounds(total, page, page_size)
+    with col3:
+        st.caption(f"Rows {start + 1 if total else 0}–{end} of {total}")
+
+    rows = df.iloc[start:end]
+    if prepare is not None:
+        rows = prepare(rows)
+    if columns:
+        rows = rows[[column for column in columns if column in rows.columns]]
+    st.dataframe(rows, use_container_width=True, column_config=column_config)
+    return rows
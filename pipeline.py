@@ -0,0 +1,223 @@
+"""
+Stage-graph runner for the scrape -> extract -> publish pipeline
+Each stage names the values it reads and the value it produces. Values are
+handed between stages in memory, a stage whose input content hash matches
+its last successful run is skipped and restores its output from the job
+store instead, and streaming stages run in a background thread so the next
+stage works on their items while they are still being produced.
+"""
+
+import os
+import json
+import time
+import queue
+import hashlib
+import tempfile
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+PIPELINE_STATE_PATH = 'pipeline_state.json'
+
+def _record_digest(record, fields: Optional[Sequence[str]] = None) -> bytes:
+    """Digest of one record (only the given fields, if any), ignoring fields that are not set"""
+    if fields is not None:
+        record = {field: record.get(field) for field in fields}
+    elif hasattr(record, 'to_dict'):
+        record = record.to_dict()
+    if isinstance(record, dict):
+        # None, '' and NaN (a missing CSV cell) all mean the field is not set
+        record = {key: value for key, value in record.items() if value is not None and value != '' and value == value}
+    return hashlib.sha256(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).digest()
+
+def content_hash(value, fields: Optional[Sequence[str]] = None) -> str:
+    """Order-independent SHA-256 of a DataFrame, a list of records or any JSON-able value
+
+    With fields, only those fields of each record (or columns of the frame) are hashed.
+    """
+    digest = hashlib.sha256()
+    if hasattr(value, 'columns') and hasattr(value, 'iloc'):
+        import numpy as np
+        import pandas as pd
+        if fields is not None:
+            value = value[[field for field in fields if field in value.columns]]
+        digest.update(json.dumps(sorted(value.columns)).encode('utf-8'))
+        row_hashes = pd.util.hash_pandas_object(value[sorted(value.columns)].astype(str), index=False).to_numpy()
+        digest.update(np.sort(row_hashes).tobytes())
+    elif isinstance(value, (list, tuple)):
+        for item_digest in sorted(_record_digest(item, fields) for item in value):
+            digest.update(item_digest)
+    else:
+        digest.update(_record_digest(value, fields))
+    return digest.hexdigest()
+
+class Stage:
+    """One step of the pipeline: a function from named input values to a named output value
+
+    restore(saved_state, *inputs) rebuilds the output when the stage is skipped
+    and returns None if it cannot. A streaming stage returns an iterator, which is
+    drained in a background thread. version is mixed into the input hash so a
+    code change can force a rerun. hash_fields limits the output's content hash
+    to those fields of each record, so a restored output hashes the same as a
+    freshly produced one even when later stages set other fields on it.
+    """
+    def __init__(self, name: str, run: Callable, inputs: Sequence[str] = (), output: Optional[str] = None,
+                 restore: Optional[Callable] = None, streaming: bool = False, version: str = '',
+                 hash_fields: Optional[Sequence[str]] = None):
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.output = output or name
+        self.restore = restore
+        self.streaming = streaming
+        self.version = version
+        self.hash_fields = list(hash_fields) if hash_fields is not None else None
+
+class _Stream:
+    """Iterator over a streaming stage's items, produced in a background thread
+
+    Collects the digests of the items as they pass so the consumer's input
+    hash is known once the stream is drained, and the time spent producing.
+    """
+    _DONE = object()
+
+    def __init__(self, iterator: Iterator, maxsize: int = 64, fields: Optional[Sequence[str]] = None):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.fields = fields
+        self.digests = []
+        self.seconds = 0.0
+        self.thread = threading.Thread(target=self._produce, args=(iterator,), daemon=True)
+        self.thread.start()
+
+    def _produce(self, iterator):
+        start = time.perf_counter()
+        try:
+            for item in iterator:
+                self.queue.put(item)
+        except BaseException as e:
+            self.queue.put(e)
+        finally:
+            self.seconds = time.perf_counter() - start
+            self.queue.put(self._DONE)
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is self._DONE:
+                self.thread.join()
+                return
+            if isinstance(item, BaseException):
+                raise item
+            self.digests.append(_record_digest(item, self.fields))
+            yield item
+
+    def content_hash(self) -> str:
+        digest = hashlib.sha256()
+        for item_digest in sorted(self.digests):
+            digest.update(item_digest)
+        return digest.hexdigest()
+
+class Pipeline:
+    """Run stages in declaration order, skipping the ones whose inputs did not change"""
+    def __init__(self, stages: List[Stage], state_path: Optional[str] = PIPELINE_STATE_PATH):
+        self.stages = stages
+        self.state_path = state_path
+        self.state = {}
+        self.timings = []
+        produced = set()
+        for stage in stages:
+            missing = [name for name in stage.inputs if name not in produced]
+            if missing:
+                raise ValueError(f"Stage {stage.name} reads {', '.join(missing)} before it is produced")
+            produced.add(stage.output)
+        if state_path and os.path.exists(state_path):
+            with open(state_path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def _input_hash(self, stage: Stage, hashes: Dict[str, Optional[str]]) -> Optional[str]:
+        """Hash of a stage's inputs, or None if an input is still streaming or the stage has none"""
+        if not stage.inputs or any(hashes[name] is None for name in stage.inputs):
+            return None
+        key = json.dumps([stage.version] + [hashes[name] for name in stage.inputs])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def run(self, force: bool = False) -> Dict[str, object]:
+        """Run the pipeline and return every stage's output by name"""
+        values, hashes, streams = {}, {}, {}
+        self.timings = []
+        for stage in self.stages:
+            start = time.perf_counter()
+            input_hash = self._input_hash(stage, hashes)
+            saved = self.state.get(stage.name, {})
+            result, status = None, 'ran'
+
+            inputs = [values[name] for name in stage.inputs]
+            if not force and input_hash and saved.get('input_hash') == input_hash and stage.restore:
+                result = stage.restore(saved, *inputs)
+                status = 'skipped' if result is not None else 'ran'
+            if status == 'ran':
+                result = stage.run(*inputs)
+            if result is None:
+                print(f"❌ Stage {stage.name} produced no {stage.output}, stopping the pipeline")
+                self.timings.append([stage.name, 'failed', time.perf_counter() - start])
+                break
+
+            if stage.streaming and status == 'ran':
+                result = _Stream(iter(result), fields=stage.hash_fields)
+                streams[stage.output] = result
+                hashes[stage.output] = None
+            else:
+                hashes[stage.output] = content_hash(result, stage.hash_fields)
+            values[stage.output] = result
+
+            # Inputs that were streaming are known only now that this stage drained them
+            for name in stage.inputs:
+                if name in streams:
+                    self._finish_stream(name, streams.pop(name), hashes)
+            input_hash = input_hash or self._input_hash(stage, hashes)
+
+            seconds = time.perf_counter() - start
+            self.timings.append([stage.name, 'streamed' if stage.output in streams else status, seconds])
+            if status == 'ran' and input_hash:
+                self.state[stage.name] = {
+                    'input_hash': input_hash,
+                    'output': result if isinstance(result, (str, int, float, bool)) else None,
+                    'finished_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                    'seconds': round(seconds, 3),
+                }
+        # Drain streams nothing consumed so their producers finish
+        for name, stream in list(streams.items()):
+            for _ in stream:
+                pass
+            self._finish_stream(name, stream, hashes)
+        self.save()
+        return values
+
+    def _finish_stream(self, name: str, stream: _Stream, hashes: Dict[str, Optional[str]]):
+        """Record the content hash and production time of a drained stream"""
+        hashes[name] = stream.content_hash()
+        producer = next(stage.name for stage in self.stages if stage.output == name)
+        for timing in self.timings:
+            if timing[0] == producer:
+                timing[2] = stream.seconds
+
+    def save(self):
+        """Write the per-stage input hashes to disk atomically"""
+        if not self.state_path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.pipeline_state_', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def report(self):
+        """Print how long each stage took and whether it was skipped"""
+        print("\n=== PIPELINE TIMINGS ===")
+        for name, status, seconds in self.timings:
+            print(f"{'⏭️ ' if status == 'skipped' else '✅'} {name:<10} {status:<8} {seconds:8.2f}s")
+        print(f"   {'total':<19} {sum(seconds for _, _, seconds in self.timings):8.2f}s")
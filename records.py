@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Compact record types for the scrape -> extract pipeline
+JobPosting holds the raw scraped text; StructuredJob holds the extracted
+fields and points back to its posting by posting_id instead of copying the
+text. Both use __slots__ and intern the values that repeat across postings.
+"""
+
+import re
+import sys
+import reprlib
+import argparse
+import tracemalloc
+from typing import Dict, Iterable, List, Optional
+
+def posting_id(url) -> str:
+    """Return the JobOnTop posting ID from a vacancy URL (e.g. '...-4935944-13.html' -> '4935944')"""
+    if not url or not isinstance(url, str):
+        return ''
+    match = re.search(r'-(\d+)-\d+\.html?$', url)
+    if match:
+        return match.group(1)
+    return url
+
+# JobPosting takes a posting_id argument, which shadows the function inside __init__
+posting_id_from_url = posting_id
+
+def _intern(value):
+    """Intern short repeated strings; leave everything else untouched"""
+    if isinstance(value, str) and len(value) <= 200:
+        return sys.intern(value)
+    return value
+
+class _SlottedRecord:
+    """Dict-style access for slotted records, so they can go where rows used to"""
+    __slots__ = ()
+
+    def get(self, key, default=None):
+        if key in self.__slots__:
+            value = getattr(self, key)
+            return default if value is None and default is not None else value
+        return default
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f"{s}={reprlib.repr(getattr(self, s))}" for s in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class JobPosting(_SlottedRecord):
+    """A scraped job page: its URL plus the raw Bedrijf and Solliciteren text"""
+    __slots__ = ('posting_id', 'url', 'bedrijf', 'solliciteren', 'duplicate_of')
+    # What was scraped, as opposed to what later stages derive from it (duplicate_of)
+    CONTENT_FIELDS = ('posting_id', 'url', 'bedrijf', 'solliciteren')
+
+    def __init__(self, url: str, bedrijf: str = '', solliciteren: str = '',
+                 posting_id: Optional[str] = None, duplicate_of: Optional[str] = None):
+        self.url = url
+        self.posting_id = _intern(posting_id or posting_id_from_url(url))
+        self.bedrijf = bedrijf
+        self.solliciteren = solliciteren
+        self.duplicate_of = _intern(duplicate_of)
+
+    @classmethod
+    def from_dict(cls, row: Dict) -> 'JobPosting':
+        return cls(row.get('url', ''), row.get('bedrijf', ''), row.get('solliciteren', ''),
+                   row.get('posting_id'), row.get('duplicate_of'))
+
+    def to_dict(self) -> Dict:
+        row = {'posting_id': self.posting_id, 'url': self.url,
+               'bedrijf': self.bedrijf, 'solliciteren': self.solliciteren}
+        if self.duplicate_of is not None:
+            row['duplicate_of'] = self.duplicate_of
+        return row
+
+class StructuredJob(_SlottedRecord):
+    """Fields extracted from one JobPosting, which it references by posting_id"""
+    __slots__ = (
+        'posting_id', 'url', 'company_name', 'location', 'contact_person', 'email_addresses',
+        'phone_numbers', 'address', 'email_domain', 'extractor_version', 'company_id', 'duplicate_of'
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            value = values.get(name)
+            setattr(self, name, value if name == 'url' else _intern(value))
+
+    @classmethod
+    def from_dict(cls, values: Dict) -> 'StructuredJob':
+        return cls(**{name: values[name] for name in cls.__slots__ if name in values})
+
+    def to_dict(self, fields: Optional[List[str]] = None) -> Dict:
+        return {name: getattr(self, name) for name in (fields or self.__slots__)}
+
+def postings_to_frame(postings: Iterable[JobPosting]):
+    """Build a DataFrame column by column from JobPosting records"""
+    import pandas as pd
+    postings = list(postings)
+    columns = {name: [getattr(p, name) for p in postings] for name in ('posting_id', 'url', 'bedrijf', 'solliciteren')}
+    if any(p.duplicate_of is not None for p in postings):
+        columns['duplicate_of'] = [p.duplicate_of or '' for p in postings]
+    return pd.DataFrame(columns)
+
+def structured_to_frame(jobs: Iterable[StructuredJob], fields: List[str]):
+    """Build a DataFrame column by column from StructuredJob records"""
+    import pandas as pd
+    jobs = list(jobs)
+    return pd.DataFrame({name: [getattr(job, name) for job in jobs] for name in fields}, columns=fields)
+
+def _synthetic_rows(n: int):
+    """Yield n postings shaped like real JobOnTop data, each with unique text"""
+    locations = ['Antwerpen', 'Brussel', 'Gent', 'Leuven', 'Mechelen', 'Schoten', 'Wijnegem', 'Berchem']
+    for i in range(n):
+        company = f"Brasserie {i % 5000}"
+        location = locations[i % len(locations)]
+        yield (
+            f"https://www.jobontop.be/vacatures/vacature-kelner-{4900000 + i}-13.html",
+            f"{company} is een gezellige zaak in {location}. Wij zoeken versterking voor ons team ({i}).",
+            f"{company}Dorpsstraat {i % 200} 2900 {location}M:info@brasserie{i % 5000}.be Of solliciteer via de button",
+            {'company_name': company, 'location': location, 'contact_person': None,
+             'email_addresses': f"info@brasserie{i % 5000}.be", 'phone_numbers': '',
+             'address': f"Dorpsstraat {i % 200} 2900 {location}", 'extractor_version': '2'},
+        )
+
+def measure_memory(n: int = 100_000) -> Dict[str, float]:
+    """Measure bytes per posting for the old dict rows versus the slotted records"""
+    results = {}
+
+    tracemalloc.start()
+    rows = []
+    for url, bedrijf, solliciteren, extracted in _synthetic_rows(n):
+        raw = {'url': url, 'bedrijf': bedrijf, 'solliciteren': solliciteren}
+        # The structured dict used to copy both texts and build new value strings
+        structured = {'url': url, 'original_bedrijf': bedrijf, 'original_solliciteren': solliciteren}
+        structured.update({key: (''.join(value) if isinstance(value, str) else value) for key, value in extracted.items()})
+        rows.append((raw, structured))
+    results['dict_bytes_per_record'] = tracemalloc.get_traced_memory()[0] / n
+    tracemalloc.stop()
+    del rows
+
+    tracemalloc.start()
+    records = []
+    for url, bedrijf, solliciteren, extracted in _synthetic_rows(n):
+        posting = JobPosting(url, bedrijf, solliciteren)
+        values = {key: (''.join(value) if isinstance(value, str) else value) for key, value in extracted.items()}
+        records.append((posting, StructuredJob(posting_id=posting.posting_id, url=url, **values)))
+    results['slotted_bytes_per_record'] = tracemalloc.get_traced_memory()[0] / n
+    tracemalloc.stop()
+    del records
+
+    results['reduction'] = results['dict_bytes_per_record'] / results['slotted_bytes_per_record']
+    return results
+
+def main(argv=None):
+    """Report per-record memory use for a synthetic run"""
+    parser = argparse.ArgumentParser(description="Measure per-record memory of the pipeline record types")
+    parser.add_argument('--records', type=int, default=100_000, help="Number of synthetic postings (default: 100000)")
+    args = parser.parse_args(argv)
+
+    results = measure_memory(args.records)
+    print(f"📊 {args.records} postings")
+    print(f"   dict rows:       {results['dict_bytes_per_record']:.0f} bytes/posting "
+          f"({results['dict_bytes_per_record'] * args.records / 2**20:.0f} MiB)")
+    print(f"   slotted records: {results['slotted_bytes_per_record']:.0f} bytes/posting "
+          f"({results['slotted_bytes_per_record'] * args.records / 2**20:.0f} MiB)")
+    print(f"   reduction:       {results['reduction']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Shared background worker for the scrape and extraction jobs started from the UIs
+One worker thread per process (get_worker), shared by every dashboard and
+session in it, runs the jobs in order, so the Streamlit session that asked
+for a crawl is not blocked by it and a second click, from any session or app,
+joins the job already queued or running instead of starting another. Each job
+publishes its progress (pages done, ETA, errors) and the postings scraped so
+far, which the dashboards poll; a finished job keeps only their count.
+"""
+
+import time
+import itertools
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+# Postings are written to the job store in batches while a scrape is running
+STORE_BATCH_SIZE = 25
+
+# Finished jobs kept for the progress panel; older ones are dropped
+MAX_FINISHED_JOBS = 20
+
+class Job:
+    """One scrape or extraction job and its progress, updated by the worker thread"""
+    def __init__(self, job_id: int, kind: str, options: Dict):
+        self.job_id = job_id
+        self.kind = kind
+        self.options = options
+        self.state = 'queued'
+        self.message = 'Waiting for the worker'
+        self.pages_done = 0
+        self.pages_total = None
+        self.errors = []
+        self.postings = []
+        self.posting_count = 0
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.state in ('queued', 'running')
+
+    def update(self, **fields):
+        with self.lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def page_done(self, posting=None, error: Optional[str] = None):
+        """Count one page (a scraped posting or an extracted row), keeping the posting as a partial result"""
+        with self.lock:
+            self.pages_done += 1
+            if posting is not None:
+                self.postings.append(posting)
+                self.posting_count += 1
+            if error:
+                self.errors.append(error)
+
+    def eta_seconds(self) -> Optional[float]:
+        """Seconds left at the pace so far, once the first page is done"""
+        with self.lock:
+            if not self.started_at or not self.pages_total or not self.pages_done:
+                return None
+            elapsed = time.time() - self.started_at
+            return elapsed / self.pages_done * (self.pages_total - self.pages_done)
+
+    def status(self) -> Dict:
+        """A consistent copy of the job's progress for the UI"""
+        eta = self.eta_seconds()
+        with self.lock:
+            return {
+                'job_id': self.job_id, 'kind': self.kind, 'state': self.state, 'message': self.message,
+                'pages_done': self.pages_done, 'pages_total': self.pages_total, 'eta_seconds': eta,
+                'errors': list(self.errors), 'postings': self.posting_count,
+                'started_at': self.started_at, 'finished_at': self.finished_at,
+            }
+
+    def partial_results(self, limit: Optional[int] = None) -> List:
+        """The postings scraped so far, newest last (none once the job has finished)"""
+        with self.lock:
+            return list(self.postings[-limit:] if limit else self.postings)
+
+def scrape_job(job: Job, extract: bool = True):
+    """Scrape every listed job into the store in batches, optionally extract, then publish a snapshot"""
+    from job_scraper import JobScraper
+    from job_store import JobStore
+    from snapshots import publish_snapshots
+
+    scraper = JobScraper()
+    job.update(message='Fetching the job list')
+    links = scraper.get_job_links()
+    if not links:
+        raise RuntimeError("No job links found")
+    job.update(pages_total=len(links), message=f'Scraping {len(links)} job pages')
+
+    with JobStore() as store:
+        run_id = store.start_run('scrape')
+        batch = []
+        try:
+            for posting in scraper.iter_job_details(links):
+                error = posting.bedrijf if posting.bedrijf.startswith('Error:') else None
+                job.page_done(posting, f"{posting.url}: {error}" if error else None)
+                batch.append(posting)
+                if len(batch) == STORE_BATCH_SIZE:
+                    store.upsert_postings(batch, run_id)
+                    batch = []
+            store.upsert_postings(batch, run_id)
+            store.finish_run(run_id, job.pages_done)
+        except BaseException:
+            store.finish_run(run_id, job.pages_done, status='failed')
+            raise
+
+        if extract:
+            from data_extractor import JobDataExtractor
+            job.update(message=f'Extracting structured data from {job.pages_done} jobs')
+            structured_df = JobDataExtractor().extract_structured_data(job.partial_results())
+            store.upsert_structured(structured_df, run_id)
+        job.update(message='Publishing a new snapshot')
+        publish_snapshots(store)
+
+def extract_job(job: Job):
+    """Extract structured fields for the current raw postings and publish a snapshot"""
+    from data_extractor import JobDataExtractor
+    from job_store import JobStore, store_exists
+    from snapshots import load_frame, publish_snapshots
+
+    raw_data = load_frame('raw', ['posting_id', 'url', 'bedrijf', 'solliciteren'])
+    if raw_data is None or raw_data.empty:
+        raise RuntimeError("No scraped postings to extract")
+    job.update(pages_total=len(raw_data), message=f'Extracting structured data from {len(raw_data)} jobs')
+
+    def counted(rows):
+        for _, row in rows.iterrows():
+            yield row
+            job.page_done()
+
+    structured_df = JobDataExtractor().extract_structured_data(counted(raw_data))
+    imported = not store_exists()
+    with JobStore() as store:
+        if imported:
+            # First run on the sample CSV: bring its postings into the store
+            store.upsert_postings(raw_data)
+        store.upsert_structured(structured_df)
+        job.update(message='Publishing a new snapshot')
+        publish_snapshots(store)
+
+JOB_RUNNERS = {'scrape': scrape_job, 'extract': extract_job}
+
+class ScrapeWorker:
+    """Runs scrape and extraction jobs one at a time on a background thread"""
+    def __init__(self, max_finished: int = MAX_FINISHED_JOBS):
+        self.jobs = []
+        self.job_ids = itertools.count(1)
+        self.max_finished = max_finished
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def submit(self, kind: str, **options) -> Job:
+        """Queue a job, or return the job of the same kind that is already queued or running"""
+        if kind not in JOB_RUNNERS:
+            raise ValueError(f"Unknown job kind {kind!r}")
+        with self.condition:
+            for job in self.jobs:
+                if job.kind == kind and job.active:
+                    return job
+            job = Job(next(self.job_ids), kind, options)
+            self.jobs.append(job)
+            self._prune()
+            self.queue.append(job)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='scrape-worker', daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        return job
+
+    def latest(self) -> Optional[Job]:
+        """The most recently submitted job"""
+        with self.condition:
+            return self.jobs[-1] if self.jobs else None
+
+    def busy(self) -> bool:
+        with self.condition:
+            return any(job.active for job in self.jobs)
+
+    def _prune(self):
+        # Called with the condition held; the latest job stays whatever its state
+        finished = [job for job in self.jobs[:-1] if not job.active]
+        for job in finished[:max(len(finished) - self.max_finished, 0)]:
+            self.jobs.remove(job)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.queue:
+                    self.condition.wait()
+                job = self.queue.popleft()
+            job.update(state='running', started_at=time.time())
+            try:
+                JOB_RUNNERS[job.kind](job, **job.options)
+                job.update(state='done', message='Finished')
+            except Exception as e:
+                with job.lock:
+                    job.errors.append(str(e))
+                job.update(state='failed', message=f'Failed: {e}')
+            finally:
+                # The postings are in the store now; keep only their count
+                job.update(finished_at=time.time(), postings=[])
+
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_worker() -> ScrapeWorker:
+    """The one worker of this process, shared by every dashboard and session in it"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = ScrapeWorker()
+        return _worker
+
+def _format_duration(seconds: float) -> str:
+    return f"{seconds:.0f}s" if seconds < 90 else f"{seconds / 60:.0f} min"
+
+def show_progress(worker: ScrapeWorker, refresh_seconds: float = 2.0):
+    """Streamlit panel with the latest job's progress and partial results, refreshed while it runs
+
+    When a job finishes the whole page reruns once, so it picks up the newly published snapshot.
+    """
+    import streamlit as st
+    from records import postings_to_frame
+
+    fragment = getattr(st, 'fragment', None) or st.experimental_fragment
+    # Only poll while a job is queued or running; a finished job triggers one full rerun, which stops it
+    refresh = refresh_seconds if worker.busy() else None
+    latest = worker.latest()
+    if latest is not None and 'handled_job' not in st.session_state:
+        # A session opened after a job finished has nothing to reload
+        st.session_state.handled_job = None if latest.active else latest.job_id
+
+    @fragment(run_every=refresh)
+    def panel():
+        job = worker.latest()
+        if job is None:
+            return
+        status = job.status()
+        if not job.active:
+            if status['state'] == 'done' and st.session_state.get('handled_job') != job.job_id:
+                st.session_state.handled_job = job.job_id
+                st.rerun()
+            if status['state'] == 'failed':
+                st.error(f"❌ {status['kind'].title()} job {status['job_id']} {status['message'].lower()}")
+            return
+
+        total = status['pages_total']
+        st.info(f"⏳ {status['kind'].title()} job {status['job_id']}: {status['message']}")
+        if total:
+            st.progress(min(status['pages_done'] / total, 1.0),
+                        text=f"{status['pages_done']}/{total} pages"
+                             + (f" · about {_format_duration(status['eta_seconds'])} left" if status['eta_seconds'] else ""))
+        if status['errors']:
+            st.warning(f"⚠️ {len(status['errors'])} errors so far, latest: {status['errors'][-1]}")
+        recent = job.partial_results(limit=10)
+        if recent:
+            st.caption(f"Latest of {status['postings']} postings scraped so far")
+            st.dataframe(postings_to_frame(recent)[['url', 'bedrijf']], use_container_width=True)
+
+    panel()
@@ -1,9 +1,11 @@
 import streamlit as st
-import pandas as pd
 import re
-from job_scraper import JobScraper
-from data_extractor import JobDataExtractor
-import time
+from snapshots import load_frame, read_manifest, data_key
+from search_index import filter_postings
+from pagination import show_page
+from scrape_worker import get_worker, show_progress
+from exports import available_formats, show_export
+from job_details import pick_job, posting_details, with_full_text
 import plotly.express as px
 import plotly.graph_objects as go
 
@@ -14,29 +16,26 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def load_data():
-    """Load the scraped job data from CSV"""
-    try:
-        return pd.read_csv('job_scraping_results.csv')
-    except FileNotFoundError:
+@st.cache_data(max_entries=2)
+def load_raw_frame(key, _manifest=None):
+    """The raw postings' previews, cached by data_key() so only a changed file is reloaded
+
+    The full text is looked up for the table page or posting on screen.
+    """
+    return load_frame('raw', ['posting_id', 'url', 'bedrijf_preview', 'solliciteren_preview'], manifest=_manifest)
+
+def load_data(manifest=None):
+    """Load the scraped job data from the job store snapshot, or the sample CSV"""
+    data = load_raw_frame(data_key('raw', manifest), manifest)
+    if data is None:
         st.error("No scraped data found. Please run the scraper first.")
         return None
+    return data
 
 def run_scraper():
-    """Run the web scraper and return the data"""
-    with st.spinner('Scraping job listings... This may take a while...'):
-        scraper = JobScraper()
-        job_data = scraper.scrape_all_jobs()
-        
-        if job_data:
-            # Save to CSV
-            df = pd.DataFrame(job_data)
-            df.to_csv('job_scraping_results.csv', index=False, encoding='utf-8')
-            st.success(f"Successfully scraped {len(job_data)} job listings!")
-            return df
-        else:
-            st.error("No job data was scraped.")
-            return None
+    """Start a scrape on the background worker"""
+    job = get_worker().submit('scrape', extract=False)
+    st.toast(f"🕷️ Scrape job {job.job_id} is running in the background")
 
 # Main UI
 st.title("🔍 JobOnTop.be Job Scraper")
@@ -46,9 +45,11 @@ st.markdown("---")
 st.sidebar.header("Controls")
 
 if st.sidebar.button("🚀 Run New Scraping", type="primary"):
-    data = run_scraper()
-else:
-    data = load_data()
+    run_scraper()
+
+show_progress(get_worker())
+manifest = read_manifest()
+data = load_data(manifest)
 
 if data is not None and not data.empty:
     # Display summary statistics
@@ -56,10 +57,10 @@ if data is not None and not data.empty:
     with col1:
         st.metric("Total Jobs", len(data))
     with col2:
-        bedrijf_filled = data['bedrijf'].str.len() > 0
+        bedrijf_filled = data['bedrijf_preview'].str.len() > 0
         st.metric("Jobs with Company Info", bedrijf_filled.sum())
     with col3:
-        solliciteren_filled = data['solliciteren'].str.len() > 0
+        solliciteren_filled = data['solliciteren_preview'].str.len() > 0
         st.metric("Jobs with Application Info", solliciteren_filled.sum())
     
     st.markdown("---")
@@ -76,17 +77,8 @@ if data is not None and not data.empty:
     # URL filter
     url_filter = st.sidebar.text_input("Filter by URL keyword")
     
-    # Apply filters
-    filtered_data = data.copy()
-    
-    if bedrijf_search:
-        filtered_data = filtered_data[filtered_data['bedrijf'].str.contains(bedrijf_search, case=False, na=False)]
-    
-    if solliciteren_search:
-        filtered_data = filtered_data[filtered_data['solliciteren'].str.contains(solliciteren_search, case=False, na=False)]
-    
-    if url_filter:
-        filtered_data = filtered_data[filtered_data['url'].str.contains(url_filter, case=False, na=False)]
+    # Apply filters through the full-text index
+    filtered_data = filter_postings(data, manifest, bedrijf=bedrijf_search, solliciteren=solliciteren_search, url=url_filter)
     
     # Display filtered results count
     if len(filtered_data) != len(data):
@@ -94,7 +86,7 @@ if data is not None and not data.empty:
     
     # Display options
     st.sidebar.subheader("📊 Display Options")
-    show_full_text = st.sidebar.checkbox("Show full text (may be slow for large datasets)")
+    show_full_text = st.sidebar.checkbox("Show full text")
     
     # Main content area
     tab1, tab2, tab3 = st.tabs(["📋 Table View", "📑 Detailed View", "📊 Export Data"])
@@ -102,29 +94,24 @@ if data is not None and not data.empty:
     with tab1:
         st.subheader("Job Listings Table")
         
+        # Only the current page is sent to the browser
         if not show_full_text:
-            # Show truncated version for better performance
-            display_data = filtered_data.copy()
-            display_data['bedrijf'] = display_data['bedrijf'].str[:200] + "..."
-            display_data['solliciteren'] = display_data['solliciteren'].str[:200] + "..."
-            st.dataframe(display_data, use_container_width=True)
+            show_page(filtered_data, "jobs", ['url', 'bedrijf_preview', 'solliciteren_preview'],
+                      column_config={"bedrijf_preview": "bedrijf", "solliciteren_preview": "solliciteren"})
         else:
-            st.dataframe(filtered_data, use_container_width=True)
+            show_page(filtered_data, "jobs", ['url', 'bedrijf', 'solliciteren'],
+                      prepare=lambda rows: with_full_text(rows, manifest))
     
     with tab2:
         st.subheader("Detailed Job View")
         
         if len(filtered_data) > 0:
-            # Job selector
-            job_urls = filtered_data['url'].tolist()
-            selected_job_idx = st.selectbox(
-                "Select a job to view details:",
-                range(len(job_urls)),
-                format_func=lambda x: f"Job {x+1}: {job_urls[x].split('/')[-1]}"
-            )
+            # Job selector, one page of the filtered jobs at a time
+            selected_row = pick_job(filtered_data, "details")
             
-            if selected_job_idx is not None:
-                selected_job = filtered_data.iloc[selected_job_idx]
+            if selected_row is not None:
+                # Full text of this posting only, looked up by posting_id
+                selected_job, _ = posting_details(selected_row, manifest)
                 
                 st.markdown(f"### Job Details")
                 st.markdown(f"**URL:** [{selected_job['url']}]({selected_job['url']})")
@@ -153,26 +140,22 @@ if data is not None and not data.empty:
         col1, col2 = st.columns(2)
         
         with col1:
-            if st.button("📥 Download Filtered Data as CSV"):
-                csv = filtered_data.to_csv(index=False)
-                st.download_button(
-                    label="💾 Download CSV File",
-                    data=csv,
-                    file_name=f"jobontop_filtered_data_{time.strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+            # Written chunk by chunk to a file that Streamlit serves from disk
+            show_export('raw', "export", ['posting_id', 'url', 'bedrijf', 'solliciteren'],
+                        None if len(filtered_data) == len(data) else {'url': filtered_data['url']},
+                        label="📥 Export Filtered Data", name="jobontop_filtered_data", manifest=manifest)
         
         with col2:
             st.markdown("**Export Options:**")
             st.write(f"- Total jobs to export: {len(filtered_data)}")
-            st.write("- Format: CSV")
+            st.write("- Formats: " + ", ".join(fmt.upper() for fmt in available_formats()))
             st.write("- Encoding: UTF-8")
 
 else:
     st.warning("No job data available. Click 'Run New Scraping' to start scraping job listings.")
     
     if st.button("🚀 Start Scraping", type="primary"):
-        data = run_scraper()
+        run_scraper()
 
 # Footer
 st.markdown("---")
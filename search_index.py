@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+SQLite FTS5 full-text index over the raw posting text
+Built next to every published snapshot version (data/search-N.db), so the
+dashboards' Company Info / Application Info / URL search boxes look words up
+in the index instead of scanning every row with str.contains. Accents are
+folded (é, ë and ç match e and c) so Dutch and French text is found however
+it is typed, and every word is matched as a prefix.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import argparse
+import tempfile
+from typing import Dict, List, Optional, Set
+
+SEARCH_NAME = 'search'
+SEARCH_COLUMNS = ['bedrijf', 'solliciteren', 'url']
+
+# Words are split on anything but letters and digits and accents are folded. The
+# index keeps no copy of the text and no word positions (only which column a word
+# is in), which is all prefix and column queries need and a fraction of the size.
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE postings_fts USING fts5(
+    {', '.join(SEARCH_COLUMNS)},
+    tokenize = 'unicode61 remove_diacritics 2',
+    content = '',
+    detail = 'column'
+);
+CREATE TABLE posting_ids (rowid INTEGER PRIMARY KEY, posting_id TEXT NOT NULL);
+"""
+
+# The words unicode61 indexes: runs of letters and digits (\w would also keep '_',
+# which the tokenizer splits on, turning one query word into an unsupported phrase)
+_WORD_PATTERN = re.compile(r'[^\W_]+')
+
+def build_search_index(df, path: str) -> str:
+    """Build the full-text index of a raw postings frame, replacing any old index atomically"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{SEARCH_NAME}_', suffix='.db')
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.executescript(FTS_SCHEMA)
+            texts = df[SEARCH_COLUMNS].astype(object).where(df[SEARCH_COLUMNS].notna(), None)
+            with conn:
+                conn.executemany("INSERT INTO posting_ids (rowid, posting_id) VALUES (?, ?)",
+                                 enumerate(df['posting_id'].astype(str)))
+                conn.executemany(f"INSERT INTO postings_fts (rowid, {', '.join(SEARCH_COLUMNS)}) VALUES (?, ?, ?, ?)",
+                                 ((rowid, *values) for rowid, values in enumerate(texts.itertuples(index=False, name=None))))
+                conn.execute("INSERT INTO postings_fts (postings_fts) VALUES ('optimize')")
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+def match_expression(column: str, text: str) -> Optional[str]:
+    """FTS5 query matching postings whose column has a word starting with each word of the text"""
+    words = _WORD_PATTERN.findall(text)
+    if not words:
+        return None
+    return ' AND '.join(f'{column} : "{word}"*' for word in words)
+
+def search_postings(path: str, **queries: str) -> Set[str]:
+    """posting_ids matching every non-empty column query, e.g. search_postings(path, bedrijf='kok gent')"""
+    expressions = [match_expression(column, text) for column, text in queries.items() if text]
+    expressions = [expression for expression in expressions if expression]
+    if not expressions:
+        raise ValueError("The search queries have no words to look up")
+    conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+    try:
+        return {row[0] for row in conn.execute(
+            "SELECT posting_id FROM posting_ids WHERE rowid IN (SELECT rowid FROM postings_fts WHERE postings_fts MATCH ?)",
+            (' AND '.join(expressions),)
+        )}
+    finally:
+        conn.close()
+
+def search_index_path(manifest: Optional[Dict] = None) -> Optional[str]:
+    """Path of the index published with the current snapshot version, if there is one"""
+    from snapshots import SNAPSHOT_DIR, read_manifest
+    manifest = manifest or read_manifest()
+    if not manifest or SEARCH_NAME not in manifest['files']:
+        return None
+    path = os.path.join(SNAPSHOT_DIR, manifest['files'][SEARCH_NAME]['path'])
+    return path if os.path.exists(path) else None
+
+def filter_postings(df, manifest: Optional[Dict] = None, **queries: str):
+    """Rows of a raw postings frame matching the column queries
+
+    Uses the published full-text index when the frame comes with posting_ids, and
+    falls back to a case-insensitive substring scan (e.g. for the sample CSV, or
+    when the index cannot answer the query) otherwise. A text column the frame
+    does not hold (the dashboards load only its preview) is scanned in the source
+    a chunk at a time.
+    """
+    queries = {column: text.strip() for column, text in queries.items() if text and text.strip()}
+    if not queries:
+        return df
+    path = search_index_path(manifest) if 'posting_id' in df.columns else None
+    if path and all(_WORD_PATTERN.search(text) for text in queries.values()):
+        try:
+            return df[df['posting_id'].astype(str).isin(search_postings(path, **queries))]
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Search index query failed ({e}), scanning the rows instead")
+    for column, text in queries.items():
+        if column in df.columns:
+            df = df[df[column].str.contains(text, case=False, na=False, regex=False)]
+        else:
+            df = df[df['posting_id'].astype(str).isin(_scan_source(column, text, manifest))]
+    return df
+
+def _scan_source(column: str, text: str, manifest: Optional[Dict] = None) -> Set[str]:
+    """posting_ids whose column contains the text, scanning the snapshot or store a chunk at a time"""
+    from exports import iter_chunks
+    found = set()
+    for chunk in iter_chunks('raw', ['posting_id', column], manifest=manifest):
+        matches = chunk[column].str.contains(text, case=False, na=False, regex=False)
+        found.update(chunk.loc[matches, 'posting_id'].astype(str))
+    return found
+
+def benchmark(n: int = 300_000) -> Dict[str, float]:
+    """Compare a str.contains scan with an index lookup for one search box on n synthetic postings"""
+    import pandas as pd
+    from records import _synthetic_rows
+
+    df = pd.DataFrame([{'posting_id': str(4900000 + i), 'url': url, 'bedrijf': bedrijf, 'solliciteren': solliciteren}
+                       for i, (url, bedrijf, solliciteren, _) in enumerate(_synthetic_rows(n))])
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f'{SEARCH_NAME}.db')
+        start = time.perf_counter()
+        build_search_index(df, path)
+        results['build_seconds'] = time.perf_counter() - start
+        results['index_mb'] = os.path.getsize(path) / 2**20
+
+        start = time.perf_counter()
+        scanned = df[df['bedrijf'].str.contains('Brasserie 4242 ', case=False, na=False)]
+        results['scan_ms'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        found = df[df['posting_id'].isin(search_postings(path, bedrijf='Brasserie 4242'))]
+        results['index_ms'] = (time.perf_counter() - start) * 1000
+        results['matches'] = len(found)
+        results['scan_matches'] = len(scanned)
+    return results
+
+def main(argv: Optional[List[str]] = None):
+    """Search the published index, or benchmark it on synthetic postings"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('query', nargs='?', default=None, help="Words to look up in the company info text")
+    parser.add_argument('--column', default='bedrijf', choices=SEARCH_COLUMNS, help="Column to search (default: bedrijf)")
+    parser.add_argument('--benchmark', type=int, metavar='N', default=None,
+                        help="Time a scan against an index lookup for N synthetic postings")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        results = benchmark(args.benchmark)
+        print(f"🔎 {args.benchmark} postings: index built in {results['build_seconds']:.1f}s ({results['index_mb']:.0f} MiB)")
+        print(f"   str.contains scan: {results['scan_ms']:.0f} ms, index lookup: {results['index_ms']:.1f} ms "
+              f"({results['matches']} matches)")
+        return
+
+    path = search_index_path()
+    if not path:
+        print("❌ No search index published yet. Run 'python jot.py publish' first")
+        return
+    if not args.query:
+        parser.error("give a query or --benchmark")
+    start = time.perf_counter()
+    ids = search_postings(path, **{args.column: args.query})
+    print(f"🔎 {len(ids)} postings match in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
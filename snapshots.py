@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Columnar Parquet snapshots of the job store for the dashboards
+After every scrape or extraction the current postings are published to
+data/ as a new version of job_scraping_results.parquet and
+job_data_structured.parquet with explicit dtypes (categorical location,
+Arrow-backed strings, zstd compression). data/latest.json names the current
+version with its row counts and checksums, so readers find the latest data
+with one small read and can cache by version. A full-text index of the raw
+text (search-N.db, see search_index.py) and the analytics aggregates
+(aggregates-N.json, see aggregates.py) are published with each version.
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from job_store import (DEFAULT_DB_PATH, PREVIEW_COLUMNS, PREVIEW_LENGTH, JobStore, store_exists, load_postings,
+                       load_structured, utc_now)
+from search_index import SEARCH_NAME, build_search_index
+from aggregates import AGGREGATES_NAME, compute_aggregates, write_aggregates
+
+SNAPSHOT_DIR = 'data'
+MANIFEST_NAME = 'latest.json'
+SNAPSHOT_NAMES = {'raw': 'job_scraping_results', 'structured': 'job_data_structured'}
+
+# CSV files the loaders fall back to when there is neither a snapshot nor a store
+RAW_CSV_PATH = 'job_scraping_results.csv'
+STRUCTURED_CSV_PATH = 'job_data_structured.csv'
+
+# Low-cardinality columns stored as dictionary-encoded categoricals
+CATEGORY_COLUMNS = {'location', 'email_domain', 'extractor_version'}
+
+# Truncated copies of the long texts for table views (PREVIEW_COLUMNS, cut to
+# PREVIEW_LENGTH characters) are stored as <column>_preview
+
+def parquet_available() -> bool:
+    """Whether pyarrow is installed so Parquet snapshots can be read and written"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def with_snapshot_dtypes(df):
+    """Return a copy of a frame with categorical and Arrow-backed string columns"""
+    df = df.copy()
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype('category')
+        elif df[column].dtype == object:
+            df[column] = df[column].astype('string[pyarrow]')
+    return df
+
+def with_preview_columns(df):
+    """Add the <column>_preview columns that a frame is missing: the text cut to PREVIEW_LENGTH characters"""
+    missing = [column for column in PREVIEW_COLUMNS if column in df.columns and f"{column}_preview" not in df.columns]
+    if not missing:
+        return df
+    df = df.copy()
+    for column in missing:
+        text = df[column].fillna('').astype(str)
+        preview = text.str.slice(0, PREVIEW_LENGTH)
+        df[f"{column}_preview"] = preview.where(text.str.len() <= PREVIEW_LENGTH, preview + '...')
+    return df
+
+def _write_atomic(path: str, write, mode: str = 'wb', **open_args) -> str:
+    """Write a file through a temporary file in the same directory and rename it into place"""
+    directory = os.path.dirname(os.path.abspath(path))
+    name, suffix = os.path.splitext(os.path.basename(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}_', suffix=suffix)
+    try:
+        with os.fdopen(fd, mode, **open_args) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+def write_csv_atomic(df, path: str) -> str:
+    """Write a frame as CSV so readers never see a half-written file"""
+    return _write_atomic(path, lambda f: df.to_csv(f, index=False), 'w', encoding='utf-8', newline='')
+
+def write_snapshot(df, path: str) -> str:
+    """Write a frame as a compressed Parquet snapshot, replacing the old one atomically"""
+    return _write_atomic(path, lambda f: with_snapshot_dtypes(df).to_parquet(
+        f, engine='pyarrow', compression='zstd', index=False))
+
+def file_checksum(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def read_snapshot(path: str, columns: Optional[List[str]] = None):
+    """Read a Parquet snapshot, loading only the requested columns that it has"""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    if columns is not None:
+        available = set(pq.read_schema(path).names)
+        columns = [column for column in columns if column in available]
+    table = pq.read_table(path, columns=columns)
+    # Keep strings in Arrow memory instead of converting them to Python objects
+    string_types = (pa.string(), pa.large_string())
+    return table.to_pandas(ignore_metadata=True,
+                           types_mapper=lambda arrow_type: pd.StringDtype('pyarrow') if arrow_type in string_types else None)
+
+def read_manifest(directory: str = SNAPSHOT_DIR) -> Optional[Dict]:
+    """Return the manifest of the current published snapshots, or None if nothing was published"""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def data_version(directory: str = SNAPSHOT_DIR) -> Optional[int]:
+    """Version number of the current published snapshots, for use as a cache key"""
+    manifest = read_manifest(directory)
+    return manifest['version'] if manifest else None
+
+def file_signature(*paths: str) -> Tuple:
+    """(path, mtime, size) of each file that exists, a cache key that changes whenever one is rewritten"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+def data_key(kind: str = 'raw', manifest: Optional[Dict] = None, db_path: str = DEFAULT_DB_PATH) -> Tuple:
+    """Cache key for the data load_frame would read for a kind (raw, structured, or a published extra)
+
+    For a published snapshot it is the checksum of that kind's file, so a new
+    version only invalidates what actually changed in it. For the store and the
+    CSV files it is their mtime and size.
+    """
+    manifest = manifest or read_manifest()
+    if manifest and parquet_available() and kind in manifest['files']:
+        return ('snapshot', kind, manifest['files'][kind]['sha256'])
+    if store_exists(db_path):
+        return ('store',) + file_signature(db_path, f"{db_path}-wal")
+    return ('csv',) + file_signature(RAW_CSV_PATH if kind == 'raw' else STRUCTURED_CSV_PATH)
+
+def snapshot_path(manifest: Dict, kind: str, directory: str = SNAPSHOT_DIR) -> str:
+    """Path of the raw or structured snapshot named by a manifest"""
+    return os.path.join(directory, manifest['files'][kind]['path'])
+
+def publish_snapshots(store: JobStore, directory: str = SNAPSHOT_DIR) -> Optional[Dict]:
+    """Publish the store's current postings and structured fields as a new snapshot version
+
+    The snapshot files get new versioned names and the manifest is swapped in
+    last, so a reader sees either the old version or the new one in full. The
+    files of the version before the previous one are removed.
+    """
+    if not parquet_available():
+        print("⚠️  pyarrow is not installed, skipping Parquet snapshots")
+        return None
+    os.makedirs(directory, exist_ok=True)
+    previous = read_manifest(directory)
+    version = previous['version'] + 1 if previous else 1
+
+    frames = {'raw': with_preview_columns(store.postings_frame(current_only=True)),
+              'structured': store.structured_frame(current_only=True)}
+    files = {}
+    for kind, df in frames.items():
+        name = f"{SNAPSHOT_NAMES[kind]}-{version}.parquet"
+        path = write_snapshot(df, os.path.join(directory, name))
+        files[kind] = {'path': name, 'rows': len(df), 'sha256': file_checksum(path)}
+    name = f"{SEARCH_NAME}-{version}.db"
+    path = build_search_index(frames['raw'], os.path.join(directory, name))
+    files[SEARCH_NAME] = {'path': name, 'rows': len(frames['raw']), 'sha256': file_checksum(path)}
+    name = f"{AGGREGATES_NAME}-{version}.json"
+    path = write_aggregates(compute_aggregates(frames['structured']), os.path.join(directory, name))
+    files[AGGREGATES_NAME] = {'path': name, 'rows': len(frames['structured']), 'sha256': file_checksum(path)}
+
+    manifest = {
+        'version': version,
+        'published_at': utc_now(),
+        'source': os.path.abspath(store.path),
+        'files': files,
+        'previous': previous['files'] if previous else {},
+    }
+    _write_atomic(os.path.join(directory, MANIFEST_NAME),
+                  lambda f: json.dump(manifest, f, indent=2), 'w', encoding='utf-8')
+
+    # Readers may still be loading the previous version, so only drop the one before it
+    for entry in (previous or {}).get('previous', {}).values():
+        stale = os.path.join(directory, entry['path'])
+        if entry['path'] not in (f['path'] for f in files.values()) and os.path.exists(stale):
+            os.remove(stale)
+
+    print(f"🗜️  Published snapshot version {version}: "
+          f"{files['raw']['rows']} postings, {files['structured']['rows']} extracted ({directory}/{MANIFEST_NAME})")
+    return manifest
+
+def verify_snapshots(directory: str = SNAPSHOT_DIR) -> bool:
+    """Check the current snapshot files against the checksums in the manifest"""
+    manifest = read_manifest(directory)
+    if not manifest:
+        return False
+    return all(os.path.exists(snapshot_path(manifest, kind, directory)) and
+               file_checksum(snapshot_path(manifest, kind, directory)) == entry['sha256']
+               for kind, entry in manifest['files'].items())
+
+def snapshot_stale(db_path: str = DEFAULT_DB_PATH, directory: str = SNAPSHOT_DIR) -> Optional[str]:
+    """Why the published snapshot does not match the store, or None if it does (or there is no store)
+
+    Checksums every published file, which also leaves them in the OS page cache.
+    """
+    if not store_exists(db_path):
+        return None
+    manifest = read_manifest(directory)
+    if not manifest:
+        return "nothing has been published yet"
+    missing = [name for name in (SEARCH_NAME, AGGREGATES_NAME) if name not in manifest['files']]
+    if missing:
+        return f"version {manifest['version']} has no {' or '.join(missing)} file"
+    if not verify_snapshots(directory):
+        return f"version {manifest['version']} is missing files or they are corrupt"
+    store_mtime = max(os.path.getmtime(path) for path in (db_path, f"{db_path}-wal") if os.path.exists(path))
+    if store_mtime > os.path.getmtime(os.path.join(directory, MANIFEST_NAME)):
+        return f"the store changed after version {manifest['version']} was published"
+    return None
+
+def load_frame(kind: str = 'raw', columns: Optional[List[str]] = None, db_path: str = DEFAULT_DB_PATH,
+               manifest: Optional[Dict] = None):
+    """Load raw or structured postings with only the given columns from the fastest available source
+
+    Reads the published snapshot named by the manifest, else the job store, else the CSV file.
+    Returns None when there is no data at all.
+    """
+    import pandas as pd
+    manifest = manifest or read_manifest()
+    if manifest and parquet_available():
+        return read_snapshot(snapshot_path(manifest, kind), columns)
+    if store_exists(db_path):
+        if kind == 'raw':
+            return load_postings(db_path, columns)
+        return load_structured(db_path, columns)
+    csv_path = RAW_CSV_PATH if kind == 'raw' else STRUCTURED_CSV_PATH
+    if not os.path.exists(csv_path):
+        return None
+    return read_csv_view(csv_path, columns)
+
+def read_csv_view(path: str, columns: Optional[List[str]] = None):
+    """Read the given columns of a CSV file, cutting any requested previews from the text
+
+    CSV rows have no posting_id to look their text up by later, so the text the
+    previews are cut from is kept as well.
+    """
+    import pandas as pd
+    if columns:
+        texts = [column for column in PREVIEW_COLUMNS if f"{column}_preview" in columns]
+        columns = list(dict.fromkeys(columns + texts))
+    df = pd.read_csv(path, usecols=(lambda column: column in columns) if columns else None)
+    return with_preview_columns(df)
+
+def benchmark(n: int = 100_000, directory: Optional[str] = None) -> Dict[str, float]:
+    """Compare loading a full structured CSV with a projected Parquet read for a chart view"""
+    import pandas as pd
+    from records import _synthetic_rows
+
+    rows = []
+    for url, bedrijf, solliciteren, extracted in _synthetic_rows(n):
+        # Structured CSVs carried copies of the raw text before the job store existed
+        rows.append(dict(extracted, url=url, original_bedrijf=bedrijf, original_solliciteren=solliciteren))
+    df = pd.DataFrame(rows)
+    del rows
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        csv_path = os.path.join(tmp, 'structured.csv')
+        parquet_path = os.path.join(tmp, 'structured.parquet')
+        df.to_csv(csv_path, index=False)
+        write_snapshot(df, parquet_path)
+        results['csv_mb'] = os.path.getsize(csv_path) / 2**20
+        results['parquet_mb'] = os.path.getsize(parquet_path) / 2**20
+
+        start = time.perf_counter()
+        full = pd.read_csv(csv_path)
+        results['csv_seconds'] = time.perf_counter() - start
+        results['csv_memory_mb'] = full.memory_usage(deep=True).sum() / 2**20
+        del full
+
+        start = time.perf_counter()
+        projected = read_snapshot(parquet_path, ['location'])
+        results['parquet_seconds'] = time.perf_counter() - start
+        results['parquet_memory_mb'] = projected.memory_usage(deep=True).sum() / 2**20
+        del projected
+
+    results['speedup'] = results['csv_seconds'] / results['parquet_seconds']
+    results['memory_reduction'] = results['csv_memory_mb'] / results['parquet_memory_mb']
+    return results
+
+def main(argv=None):
+    """Publish or verify snapshots of the job store, or benchmark them on synthetic data"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help=f"Job store to export (default: {DEFAULT_DB_PATH})")
+    parser.add_argument('--verify', action='store_true', help="Check the published files against the manifest checksums")
+    parser.add_argument('--benchmark', type=int, metavar='N', default=None,
+                        help="Time CSV versus Parquet loading for N synthetic postings instead of exporting")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        results = benchmark(args.benchmark)
+        print(f"📊 {args.benchmark} postings, location chart view")
+        print(f"   CSV (all columns):     {results['csv_seconds']:.2f}s, {results['csv_memory_mb']:.1f} MiB in memory, "
+              f"{results['csv_mb']:.1f} MiB on disk")
+        print(f"   Parquet (location):    {results['parquet_seconds']:.2f}s, {results['parquet_memory_mb']:.1f} MiB in memory, "
+              f"{results['parquet_mb']:.1f} MiB on disk")
+        print(f"   speedup: {results['speedup']:.1f}x, memory reduction: {results['memory_reduction']:.1f}x")
+        return
+
+    if args.verify:
+        ok = verify_snapshots()
+        print(f"{'✅' if ok else '❌'} Snapshot version {data_version()}: {'checksums match' if ok else 'missing or corrupt'}")
+        return
+
+    if not store_exists(args.db):
+        print(f"❌ No job store at {args.db}. Run 'python deploy.py' first")
+        return
+    with JobStore(args.db, readonly=True) as store:
+        publish_snapshots(store)
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,19 @@ import glob
 import time
 import os
 from datetime import datetime
+from job_store import DEFAULT_DB_PATH, store_exists, load_postings, load_structured
+from snapshots import read_manifest, snapshot_path, read_snapshot, read_csv_view, parquet_available, file_signature, PREVIEW_COLUMNS
+from search_index import filter_postings
+from pagination import show_page
+from filters import FilterEngine
+from job_details import pick_job, posting_details, with_full_text
+from exports import show_export
+from aggregates import compute_aggregates, read_aggregates, coverage_rows
+
+# Columns the views below use; everything else stays on disk
+# Only the previews: the full text is looked up for the table page or posting on screen
+RAW_VIEW_COLUMNS = ['posting_id', 'url'] + [f"{column}_preview" for column in PREVIEW_COLUMNS]
+STRUCTURED_VIEW_COLUMNS = ['url', 'company_name', 'location', 'contact_person', 'email_addresses', 'phone_numbers', 'address']
 
 # Configure Streamlit page
 st.set_page_config(
@@ -44,9 +57,16 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
 def find_latest_files():
-    """Find the most recent scraped and structured data files"""
+    """Resolve the current data from the snapshot manifest, the job store, or the most recent CSV files"""
+    manifest = read_manifest()
+    if manifest and parquet_available():
+        # Versioned file names, so the cached loads below are keyed by version
+        return snapshot_path(manifest, "raw"), snapshot_path(manifest, "structured")
+    
+    if store_exists(DEFAULT_DB_PATH):
+        return DEFAULT_DB_PATH, DEFAULT_DB_PATH
+    
     raw_files = glob.glob("job_scraping_results_*.csv")
     structured_files = glob.glob("job_data_structured_*.csv")
     
@@ -55,21 +75,49 @@ def find_latest_files():
     
     return latest_raw, latest_structured
 
-@st.cache_data
-def load_data_safe(file_path):
-    """Safely load CSV data with error handling"""
+def source_signature(file_path):
+    """Cache key for a data file: its mtime and size (and the store's write-ahead log), so a rewrite reloads it"""
+    return file_signature(file_path, f"{file_path}-wal") if file_path else ()
+
+@st.cache_data(max_entries=4)
+def load_data_safe(file_path, kind="raw", signature=()):
+    """Safely load the columns the views need from a snapshot, the job store or a CSV file"""
+    columns = RAW_VIEW_COLUMNS if kind == "raw" else STRUCTURED_VIEW_COLUMNS
     try:
-        if file_path and os.path.exists(file_path):
-            df = pd.read_csv(file_path)
-            return df
+        if file_path and file_path.endswith(".parquet"):
+            df = read_snapshot(file_path, columns)
+        elif file_path == DEFAULT_DB_PATH and store_exists(file_path):
+            df = load_postings(file_path, columns) if kind == "raw" else load_structured(file_path, columns)
+        elif file_path and os.path.exists(file_path):
+            # The CSV has no previews; they are cut from its text once here, not on every rerun
+            df = read_csv_view(file_path, columns)
         else:
             return None
+        return df
     except Exception as e:
         st.error(f"Error loading {file_path}: {str(e)}")
         return None
 
+@st.cache_data(max_entries=2)
+def load_aggregates_safe(file_path, signature=()):
+    """Analytics aggregates published with the snapshot, or computed once from the structured data"""
+    aggregates = read_aggregates() if file_path and file_path.endswith(".parquet") else None
+    if aggregates is None:
+        df = load_data_safe(file_path, "structured", signature)
+        aggregates = compute_aggregates(df) if df is not None else None
+    return aggregates
+
+@st.cache_resource(max_entries=2)
+def filter_engine(file_path, signature, _df):
+    """Filter engine of a structured data file version, shared by every session"""
+    return FilterEngine(_df)
+
+def export_source(file_path):
+    """Where exports read from: the snapshot or store the dashboard shows, or the CSV file it found"""
+    return {'csv_path': file_path} if file_path and file_path.endswith('.csv') else {}
+
 def create_download_link(df, filename, label):
-    """Create a download button for dataframe"""
+    """Create a download button for a small dataframe such as the summary"""
     csv = df.to_csv(index=False)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename_with_timestamp = f"{filename}_{timestamp}.csv"
@@ -81,64 +129,64 @@ def create_download_link(df, filename, label):
         mime="text/csv"
     )
 
-def display_metrics(df_structured):
-    """Display key metrics from structured data"""
-    if df_structured is None or df_structured.empty:
+def display_metrics(aggregates):
+    """Display key metrics from the structured data aggregates"""
+    if not aggregates or not aggregates['total']:
         st.warning("No structured data available")
         return
     
     col1, col2, col3, col4 = st.columns(4)
+    total_jobs = aggregates['total']
+    coverage = aggregates['coverage']
     
     with col1:
-        total_jobs = len(df_structured)
         st.metric("Total Jobs", total_jobs)
     
     with col2:
-        companies_found = df_structured['company_name'].notna().sum()
-        success_rate = f"{(companies_found/total_jobs*100):.1f}%" if total_jobs > 0 else "0%"
+        companies_found = coverage['company_name']
+        success_rate = f"{(companies_found/total_jobs*100):.1f}%"
         st.metric("Companies Found", f"{companies_found}", delta=success_rate)
     
     with col3:
-        emails_found = (df_structured['email_addresses'].str.len() > 0).sum()
-        email_rate = f"{(emails_found/total_jobs*100):.1f}%" if total_jobs > 0 else "0%"
+        emails_found = coverage['email_addresses']
+        email_rate = f"{(emails_found/total_jobs*100):.1f}%"
         st.metric("Emails Found", f"{emails_found}", delta=email_rate)
     
     with col4:
-        phones_found = (df_structured['phone_numbers'].str.len() > 0).sum()
-        phone_rate = f"{(phones_found/total_jobs*100):.1f}%" if total_jobs > 0 else "0%"
+        phones_found = coverage['phone_numbers']
+        phone_rate = f"{(phones_found/total_jobs*100):.1f}%"
         st.metric("Phones Found", f"{phones_found}", delta=phone_rate)
 
-def create_location_chart(df_structured):
+def create_location_chart(aggregates):
     """Create location distribution chart"""
-    if df_structured is None or df_structured.empty:
+    if not aggregates or not aggregates['locations']['top']:
         return None
     
-    location_counts = df_structured['location'].value_counts().head(10)
-    if location_counts.empty:
-        return None
+    locations, counts = zip(*aggregates['locations']['top'])
     
     fig = px.bar(
-        x=location_counts.values,
-        y=location_counts.index,
+        x=counts,
+        y=locations,
         orientation='h',
         title="🌍 Top 10 Job Locations",
         labels={'x': 'Number of Jobs', 'y': 'Location'},
-        color=location_counts.values,
+        color=counts,
         color_continuous_scale="viridis"
     )
     fig.update_layout(height=400, showlegend=False)
     return fig
 
-def create_contact_info_chart(df_structured):
+def create_contact_info_chart(aggregates):
     """Create contact information availability chart"""
-    if df_structured is None or df_structured.empty:
+    if not aggregates or not aggregates['total']:
         return None
     
+    coverage = aggregates['coverage']
     contact_data = {
-        'Email': (df_structured['email_addresses'].str.len() > 0).sum(),
-        'Phone': (df_structured['phone_numbers'].str.len() > 0).sum(),
-        'Address': df_structured['address'].notna().sum(),
-        'Contact Person': df_structured['contact_person'].notna().sum()
+        'Email': coverage['email_addresses'],
+        'Phone': coverage['phone_numbers'],
+        'Address': coverage['address'],
+        'Contact Person': coverage['contact_person']
     }
     
     fig = px.bar(
@@ -178,14 +226,14 @@ def main():
     if latest_structured:
         st.sidebar.success(f"✅ Structured data: {latest_structured}")
     
-    # Refresh button
+    # Refresh button; the loads are keyed by file signature, so a rerun picks up rewritten files
     if st.sidebar.button("🔄 Refresh Data", type="primary"):
-        st.cache_data.clear()
         st.rerun()
     
     # Load data
-    df_raw = load_data_safe(latest_raw)
-    df_structured = load_data_safe(latest_structured)
+    raw_signature, structured_signature = source_signature(latest_raw), source_signature(latest_structured)
+    df_raw = load_data_safe(latest_raw, "raw", raw_signature)
+    df_structured = load_data_safe(latest_structured, "structured", structured_signature)
     
     # Main tabs
     # Initialize tab variables to None
@@ -218,21 +266,25 @@ def main():
         with analytics_tab:
             st.header("📊 Job Market Analytics")
             
-            # Metrics
-            display_metrics(df_structured) # df_structured is guaranteed to be non-empty here
+            # Metrics and charts come from the aggregates published with the snapshot
+            aggregates = load_aggregates_safe(latest_structured, structured_signature)
+            display_metrics(aggregates)
             
             # Charts
             col1, col2 = st.columns(2)
             
             with col1:
-                location_fig = create_location_chart(df_structured)
+                location_fig = create_location_chart(aggregates)
                 if location_fig:
                     st.plotly_chart(location_fig, use_container_width=True)
+                    if aggregates['locations']['other']:
+                        st.caption(f"+ {aggregates['locations']['other']} jobs in "
+                                   f"{aggregates['locations']['distinct'] - len(aggregates['locations']['top'])} other locations")
                 else:
                     st.info("No location data available for visualization")
             
             with col2:
-                contact_fig = create_contact_info_chart(df_structured)
+                contact_fig = create_contact_info_chart(aggregates)
                 if contact_fig:
                     st.plotly_chart(contact_fig, use_container_width=True)
                 else:
@@ -248,12 +300,12 @@ def main():
             st.subheader("🔍 Filters")
             col1, col2, col3 = st.columns(3)
             
+            engine = filter_engine(latest_structured, structured_signature, df_structured)
             with col1:
                 company_filter = st.text_input("🏢 Company Name")
 
             with col2:
-                location_options = ["All"] + sorted(df_structured['location'].dropna().unique().tolist())
-                location_filter = st.selectbox("📍 Location", location_options)
+                location_filter = st.selectbox("📍 Location", ["All"] + engine.locations)
 
             with col3:
                 st.write("**Data Availability:**")
@@ -261,25 +313,9 @@ def main():
                 has_phone = st.checkbox("Has Phone")
                 has_contact = st.checkbox("Has Contact Person")
             
-            # Apply filters
-            filtered_df = df_structured.copy()
-            
-            if company_filter:
-                filtered_df = filtered_df[
-                    filtered_df['company_name'].str.contains(company_filter, case=False, na=False)
-                ]
-            
-            if location_filter != "All":
-                filtered_df = filtered_df[filtered_df['location'] == location_filter]
-            
-            if has_email:
-                filtered_df = filtered_df[filtered_df['email_addresses'].str.len() > 0]
-            
-            if has_phone:
-                filtered_df = filtered_df[filtered_df['phone_numbers'].str.len() > 0]
-            
-            if has_contact:
-                filtered_df = filtered_df[filtered_df['contact_person'].notna()]
+            # Apply filters as one precomputed mask
+            flags = [flag for flag, checked in (('email', has_email), ('phone', has_phone), ('contact', has_contact)) if checked]
+            filtered_df = engine.filter(company_filter, [] if location_filter == "All" else [location_filter], flags)
 
             # Display results
             st.info(f"📋 Showing {len(filtered_df)} of {len(df_structured)} jobs")
@@ -288,9 +324,8 @@ def main():
             display_columns = ['company_name', 'location', 'contact_person', 'email_addresses', 'phone_numbers', 'address']
 
             if not filtered_df.empty:
-                st.dataframe(
-                    filtered_df[display_columns],
-                    use_container_width=True,
+                show_page(
+                    filtered_df, "structured", display_columns,
                     column_config={
                         "company_name": st.column_config.TextColumn("Company", width="medium"),
                         "location": st.column_config.TextColumn("Location", width="small"),
@@ -318,18 +353,8 @@ def main():
                 with col2:
                     solliciteren_search = st.text_input("Search in Application Info (Solliciteren)")
                 
-                # Apply filters
-                filtered_raw = df_raw.copy()
-                
-                if bedrijf_search:
-                    filtered_raw = filtered_raw[
-                        filtered_raw['bedrijf'].str.contains(bedrijf_search, case=False, na=False)
-                    ]
-                
-                if solliciteren_search:
-                    filtered_raw = filtered_raw[
-                        filtered_raw['solliciteren'].str.contains(solliciteren_search, case=False, na=False)
-                    ]
+                # Apply filters through the full-text index
+                filtered_raw = filter_postings(df_raw, bedrijf=bedrijf_search, solliciteren=solliciteren_search)
                 
                 # Display options
                 show_full_text = st.checkbox("Show full text content")
@@ -338,15 +363,13 @@ def main():
                 if len(filtered_raw) != len(df_raw):
                     st.info(f"📋 Showing {len(filtered_raw)} of {len(df_raw)} jobs (filtered)")
 
+                # Only the current page is sent to the browser
                 if not show_full_text:
-                    # Truncated view
-                    display_df = filtered_raw.copy()
-                    display_df['bedrijf'] = display_df['bedrijf'].str[:200] + "..."
-                    display_df['solliciteren'] = display_df['solliciteren'].str[:200] + "..."
-                    st.dataframe(display_df, use_container_width=True)
+                    show_page(filtered_raw, "raw", ['posting_id', 'url', 'bedrijf_preview', 'solliciteren_preview'],
+                              column_config={"bedrijf_preview": "bedrijf", "solliciteren_preview": "solliciteren"})
                 else:
-                    # Full view
-                    st.dataframe(filtered_raw, use_container_width=True)
+                    show_page(filtered_raw, "raw", ['posting_id', 'url', 'bedrijf', 'solliciteren'],
+                              prepare=with_full_text)
             else:
                 st.warning("No raw data available")
 
@@ -356,41 +379,34 @@ def main():
             st.header("🔍 Detailed Job View")
 
             if df_raw is not None and not df_raw.empty:
-                # Job selector
-                job_urls = df_raw['url'].tolist()
-                selected_idx = st.selectbox(
-                    "Select a job to view details:",
-                    range(len(job_urls)),
-                    format_func=lambda x: f"Job {x+1}: {job_urls[x].split('/')[-1]}"
-                )
+                # Job selector: search the company info, then pick from one page of matches
+                job_search = st.text_input("🔍 Search jobs (company info)", key="details_search")
+                selected_row = pick_job(filter_postings(df_raw, bedrijf=job_search), "details")
 
-                if selected_idx is not None:
-                    selected_job = df_raw.iloc[selected_idx]
+                if selected_row is not None:
+                    # Full text and extracted fields of this posting only, looked up by posting_id
+                    selected_job, job_info = posting_details(selected_row, structured=df_structured)
 
                     # Job header
                     st.markdown(f"### Job Details")
                     st.markdown(f"**🔗 URL:** [{selected_job['url']}]({selected_job['url']})")
 
                     # Show AI-extracted info if available
-                    if df_structured is not None and not df_structured.empty: # Check df_structured here
-                        structured_job_series = df_structured[df_structured['url'] == selected_job['url']]
-                        if not structured_job_series.empty:
-                            job_info = structured_job_series.iloc[0]
+                    if job_info is not None:
+                        st.markdown("#### 🤖 AI-Extracted Information")
+                        col1, col2 = st.columns(2)
 
-                            st.markdown("#### 🤖 AI-Extracted Information")
-                            col1, col2 = st.columns(2)
+                        with col1:
+                            st.write(f"**🏢 Company:** {job_info.get('company_name', 'N/A')}")
+                            st.write(f"**📍 Location:** {job_info.get('location', 'N/A')}")
+                            st.write(f"**👤 Contact:** {job_info.get('contact_person', 'N/A')}")
 
-                            with col1:
-                                st.write(f"**🏢 Company:** {job_info.get('company_name', 'N/A')}")
-                                st.write(f"**📍 Location:** {job_info.get('location', 'N/A')}")
-                                st.write(f"**👤 Contact:** {job_info.get('contact_person', 'N/A')}")
+                        with col2:
+                            st.write(f"**📧 Email:** {job_info.get('email_addresses', 'N/A')}")
+                            st.write(f"**📞 Phone:** {job_info.get('phone_numbers', 'N/A')}")
+                            st.write(f"**🏠 Address:** {job_info.get('address', 'N/A')}")
 
-                            with col2:
-                                st.write(f"**📧 Email:** {job_info.get('email_addresses', 'N/A')}")
-                                st.write(f"**📞 Phone:** {job_info.get('phone_numbers', 'N/A')}")
-                                st.write(f"**🏠 Address:** {job_info.get('address', 'N/A')}")
-
-                            st.markdown("---")
+                        st.markdown("---")
 
                     # Original scraped content
                     col1, col2 = st.columns(2)
@@ -421,7 +437,9 @@ def main():
             with col1:
                 st.subheader("Raw Data Export")
                 if df_raw is not None and not df_raw.empty:
-                    create_download_link(df_raw, "jobontop_raw_data", "📥 Download Raw Data CSV")
+                    # Written chunk by chunk to a file that Streamlit serves from disk
+                    show_export('raw', "export_raw", ['posting_id', 'url', 'bedrijf', 'solliciteren'],
+                                label="📥 Export Raw Data", **export_source(latest_raw))
                     st.write(f"📊 Total jobs: {len(df_raw)}")
                 else:
                     st.warning("No raw data available for export")
@@ -430,30 +448,18 @@ def main():
                 # Check df_structured specifically for this section
                 if df_structured is not None and not df_structured.empty:
                     st.subheader("Structured Data Export")
-                    create_download_link(df_structured, "jobontop_structured_data", "📥 Download Structured Data CSV")
+                    show_export('structured', "export_structured", ['posting_id'] + STRUCTURED_VIEW_COLUMNS,
+                                label="📥 Export Structured Data", **export_source(latest_structured))
                     st.write(f"📊 Total jobs: {len(df_structured)}")
                 else:
                     st.info("No structured data available for export (run AI extraction if needed)")
-            else:
-                st.info("Run AI extraction to enable structured data export")
         
         # Additional export options
         st.markdown("---")
         st.subheader("📊 Export Summary")
         
         if df_structured is not None and not df_structured.empty:
-            summary_data = {
-                "Metric": ["Total Jobs", "Companies Found", "Locations Found", "Emails Found", "Phones Found", "Addresses Found"],
-                "Count": [
-                    len(df_structured),
-                    df_structured['company_name'].notna().sum(),
-                    df_structured['location'].notna().sum(),
-                    (df_structured['email_addresses'].str.len() > 0).sum(),
-                    (df_structured['phone_numbers'].str.len() > 0).sum(),
-                    df_structured['address'].notna().sum()
-                ]
-            }
-            summary_df = pd.DataFrame(summary_data)
+            summary_df = pd.DataFrame(coverage_rows(load_aggregates_safe(latest_structured, structured_signature)), columns=["Metric", "Count"])
             create_download_link(summary_df, "jobontop_summary", "📊 Download Summary Report")
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jot
+
+class StartupTest(unittest.TestCase):
+    """The CLI's cold start stays within its import budget"""
+
+    def test_help_loads_no_heavy_modules(self):
+        _, heavy = jot.measure_startup(('--help',), repeat=1)
+        self.assertEqual(heavy, [])
+
+    def test_help_within_import_budget(self):
+        milliseconds, _ = jot.measure_startup(('--help',))
+        self.assertLessEqual(milliseconds, jot.IMPORT_BUDGET_MS)
+
+    def test_subcommand_help_loads_no_heavy_modules(self):
+        for command in ('run', 'changes', 'bench-ui'):
+            with self.subTest(command=command):
+                _, heavy = jot.measure_startup((command, '--help'), repeat=1)
+                self.assertEqual(heavy, [])
+
+if __name__ == '__main__':
+    unittest.main()